@@ -0,0 +1,61 @@
+from __future__ import annotations
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from travel_planner.models import (  # noqa: E402
+    AppState,
+    ActivityItem,
+    BudgetItem,
+    PackingItem,
+    new_trip,
+)
+
+CATEGORIES = ["Transport", "Hotel", "Food", "Tickets", "Other"]
+PLACES = ["Carry-on", "Checked"]
+
+
+def make_trip(items: int, index: int = 0):
+    start = date(2025, 1, 1) + timedelta(days=index % 300)
+    t = new_trip(f"Trip {index}", f"City {index}", start, start + timedelta(days=6))
+    for i in range(items):
+        t.activities.append(
+            ActivityItem(
+                id=str(uuid4()),
+                day=start + timedelta(days=i % 7),
+                time=f"{8 + i % 12:02d}:{(i * 7) % 60:02d}",
+                title=f"Activity {i}",
+                location=f"Place {i % 50}",
+                notes="",
+            )
+        )
+        t.budget_items.append(
+            BudgetItem(
+                id=str(uuid4()),
+                category=CATEGORIES[i % len(CATEGORIES)],
+                description=f"Expense {i}",
+                cost=float(i % 500) + 0.5,
+                paid=bool(i % 3 == 0),
+            )
+        )
+        t.packing_items.append(
+            PackingItem(
+                id=str(uuid4()),
+                item_name=f"Item {i}",
+                category=CATEGORIES[i % len(CATEGORIES)],
+                quantity=1 + i % 3,
+                place=PLACES[i % 2],
+                packed=bool(i % 2),
+            )
+        )
+    return t
+
+
+def make_state(trips: int, items_per_trip: int) -> AppState:
+    state = AppState()
+    for i in range(trips):
+        state.add_trip(make_trip(items_per_trip, i))
+    return state
@@ -0,0 +1,62 @@
+"""Sorting activities: tuple key parsed from the time string on every sort
+(previous activity_sort_key) vs the int sort_key cached on ActivityItem.
+
+Also reports ActivityItem.from_dict time, which now includes the parse.
+
+Run from the repository root:  python benchmarks/bench_activity_sort.py
+"""
+from __future__ import annotations
+import argparse
+import gc
+import time
+from operator import attrgetter
+
+from _data import make_state
+from travel_planner.models import ActivityItem
+
+
+def legacy_sort_key(act):
+    try:
+        parts = act.time.strip().split(":")
+        h = int(parts[0])
+        m = int(parts[1]) if len(parts) > 1 else 0
+    except Exception:
+        h, m = 99, 99
+    return (act.day.toordinal(), h, m)
+
+
+def best_ms(fn, repeat: int) -> float:
+    # Без GC: иначе время from_dict зависит от размера уже созданной кучи.
+    best = float("inf")
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+    finally:
+        gc.enable()
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'acts':>8} {'legacy sort ms':>15} {'cached sort ms':>15} {'from_dict ms':>13}")
+    for n in args.sizes:
+        acts = list(make_state(1, n).trips[0].activities)
+        raw = [a.to_dict() for a in acts]
+
+        legacy = best_ms(lambda: sorted(acts, key=legacy_sort_key), args.repeat)
+        cached = best_ms(lambda: sorted(acts, key=attrgetter("sort_key")), args.repeat)
+        load = best_ms(lambda: [ActivityItem.from_dict(d) for d in raw], args.repeat)
+        assert sorted(acts, key=legacy_sort_key) == sorted(acts, key=attrgetter("sort_key"))
+        print(f"{n:>8} {legacy:>15.2f} {cached:>15.2f} {load:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
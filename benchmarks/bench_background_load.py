@@ -0,0 +1,74 @@
+"""Time-to-window vs data size: load_state() before creating the window
+(previous main.py) vs an empty window that loads in the background
+(MainWindow.load_in_background, as main.py does now).
+
+For each file size reports when the first window was painted and when the
+data was fully in place. Each run is a fresh interpreter.
+
+Run from the repository root:  python benchmarks/bench_background_load.py
+"""
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _data import make_state
+from travel_planner.storage import save_state
+
+MODES = ["blocking", "background"]
+
+
+def run(mode: str, path: Path) -> None:
+    from PyQt6.QtWidgets import QApplication
+    from travel_planner.main_window import MainWindow
+    from travel_planner.models import AppState
+    from travel_planner.storage import load_state
+
+    app = QApplication([])
+    t0 = time.perf_counter()
+    if mode == "blocking":
+        window = MainWindow(load_state(path, lazy=True), path)
+    else:
+        window = MainWindow(AppState(), path)
+        window.load_in_background(lazy=True)
+    window.show()
+    app.processEvents()
+    window_ms = (time.perf_counter() - t0) * 1000
+    while window.is_loading():
+        app.processEvents()
+        time.sleep(0.001)
+    loaded_ms = (time.perf_counter() - t0) * 1000
+    print(f"{path.stat().st_size / 2**20:>8.1f} {mode:>11} {window_ms:>10.0f} {loaded_ms:>10.0f}", flush=True)
+    window.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trips", type=int, nargs="+", default=[10, 100, 400])
+    parser.add_argument("--items", type=int, default=300, help="items of each kind per trip")
+    parser.add_argument("--run", choices=MODES)
+    parser.add_argument("--path", type=Path)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run, args.path)
+        return
+
+    print(f"{'file MB':>8} {'mode':>11} {'window ms':>10} {'loaded ms':>10}", flush=True)
+    for trips in args.trips:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "travel_data.json"
+            save_state(make_state(trips, args.items), path, backups=0, snapshot=False)
+            for mode in MODES:
+                subprocess.run([sys.executable, __file__, "--run", mode, "--path", str(path)],
+                               check=True, stderr=subprocess.DEVNULL)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Batch engine (travel_planner.batch.run_batch) over a corpus of per-user
+travel_data.json files: totals (load), integrity checks (load + validate)
+and migration (load + save) with 1, 2, 4, ... worker processes.
+
+Reports wall time, files/s, and speed-up and parallel efficiency relative
+to the serial run. Pool start-up (spawn) is included. Scaling is bounded by
+the number of CPU cores and by disk throughput for the save task.
+
+Run from the repository root:  python benchmarks/bench_batch.py
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from _data import make_state
+from travel_planner.batch import compact_file, file_problems, file_stats, run_batch
+from travel_planner.storage import iter_state_chunks
+
+TASKS = {
+    "stats": (file_stats, ()),
+    "validate": (file_problems, ()),
+    "migrate": (compact_file, (0, False)),
+}
+
+
+def default_workers() -> list:
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max(cores, 2):
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+def make_corpus(root: Path, files: int, trips: int, items: int) -> list:
+    # Один и тот же документ во всех файлах: быстрее, чем save_state() с fsync на файл.
+    payload = b"".join(iter_state_chunks(make_state(trips, items)))
+    paths = []
+    for i in range(files):
+        p = root / f"{i // 1000:03d}" / f"user{i:05d}" / "travel_data.json"
+        p.parent.mkdir(parents=True)
+        p.write_bytes(payload)
+        paths.append(p)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--trips", type=int, default=3)
+    parser.add_argument("--items", type=int, default=20, help="items of each kind per trip")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    parser.add_argument("--tasks", nargs="+", choices=sorted(TASKS), default=list(TASKS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_corpus(Path(tmp), args.files, args.trips, args.items)
+        mb = sum(p.stat().st_size for p in paths) / 2**20
+        for p in paths:
+            p.read_bytes()
+        print(f"{args.files} files, {mb:.0f} MB, {os.cpu_count()} CPU cores", flush=True)
+        print(f"{'task':>9} {'workers':>8} {'chunk':>6} {'ms':>8} {'files/s':>9} {'speed-up':>9} {'efficiency':>11}",
+              flush=True)
+        for name in args.tasks:
+            task, task_args = TASKS[name]
+            serial_ms = None
+            for workers in args.workers:
+                report = run_batch(task, paths, *task_args, workers=workers)
+                assert not report.errors, report.errors[:3]
+                ms = report.seconds * 1000
+                serial_ms = serial_ms or ms
+                speedup = serial_ms / ms
+                print(f"{name:>9} {report.workers:>8} {report.chunk_size:>6} {ms:>8.0f}"
+                      f" {report.files_per_second():>9.0f} {speedup:>8.2f}x {speedup / report.workers:>10.0%}",
+                      flush=True)
+
+
+if __name__ == "__main__":
+    main()
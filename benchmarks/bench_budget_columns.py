@@ -0,0 +1,84 @@
+"""Budget of one trip with 100k+ imported lines: BudgetItemList of
+BudgetItem objects vs the columnar BudgetColumns.
+
+Reports build time from parsed rows, memory held (tracemalloc) and the
+time to compute totals from scratch (total, paid, per-category sums). The
+columnar totals are timed with numpy when it is installed and with the
+stdlib fallback.
+
+Run from the repository root:  python benchmarks/bench_budget_columns.py
+"""
+from __future__ import annotations
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from _data import CATEGORIES
+from travel_planner import budget_columns
+from travel_planner.budget_columns import BudgetColumns
+from travel_planner.models import BudgetItem, BudgetItemList, BudgetTotals
+
+
+def make_rows(n: int):
+    return [
+        {"id": f"{i:032x}", "category": CATEGORIES[i % len(CATEGORIES)], "description": f"Import line {i}",
+         "cost": float(i % 900) + 0.25, "paid": i % 3 == 0}
+        for i in range(n)
+    ]
+
+
+def measure(build: Callable[[], object]) -> Tuple[object, float, int]:
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, elapsed * 1000, held
+
+
+def best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    installed_numpy = budget_columns.numpy
+    print(f"{'lines':>8} {'variant':>14} {'build ms':>9} {'held MB':>8} {'totals ms':>10}")
+    for n in args.sizes:
+        rows = make_rows(n)
+
+        items, build, held = measure(lambda: BudgetItemList(BudgetItem.from_dict(r) for r in rows))
+        totals = best_ms(lambda: BudgetTotals.from_items(items), args.repeat)
+        print(f"{n:>8} {'objects':>14} {build:>9.1f} {held / 2**20:>8.1f} {totals:>10.2f}")
+        expected = BudgetTotals.from_items(items)
+        del items
+
+        columns, build, held = measure(lambda: BudgetColumns.from_rows(rows))
+        variants = [("columns/stdlib", None)]
+        if installed_numpy is not None:
+            variants.insert(0, ("columns/numpy", installed_numpy))
+        for name, numpy in variants:
+            budget_columns.numpy = numpy
+            totals = best_ms(columns._compute_totals, args.repeat)
+            assert columns._compute_totals().matches(expected)
+            print(f"{n:>8} {name:>14} {build:>9.1f} {held / 2**20:>8.1f} {totals:>10.2f}")
+        budget_columns.numpy = installed_numpy
+        del columns
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""BudgetPage refresh and single-cell edit latency: the previous
+QTableWidget rebuild vs the QAbstractTableModel-backed view.
+
+Run from the repository root:  python benchmarks/bench_budget_table.py
+"""
+from __future__ import annotations
+import argparse
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _data import make_state
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+from travel_planner.item_models import BudgetTableModel
+from travel_planner.pages.budget_page import BudgetPage
+
+
+def legacy_fill(table: QTableWidget, trip) -> None:
+    # Повторяет прежний BudgetPage.refresh: 4 QTableWidgetItem на строку.
+    table.clearContents()
+    table.setRowCount(len(trip.budget_items))
+    for row, bi in enumerate(trip.budget_items):
+        it_cat = QTableWidgetItem(bi.category)
+        it_desc = QTableWidgetItem(bi.description)
+        it_cost = QTableWidgetItem(f"{bi.cost:.2f}")
+        it_cost.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        it_paid = QTableWidgetItem("Paid" if bi.paid else "")
+        it_paid.setFlags(it_paid.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        it_paid.setCheckState(Qt.CheckState.Checked if bi.paid else Qt.CheckState.Unchecked)
+        table.setItem(row, 0, it_cat)
+        table.setItem(row, 1, it_desc)
+        table.setItem(row, 2, it_cost)
+        table.setItem(row, 3, it_paid)
+
+
+def timed(app: QApplication, fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    app.processEvents()
+    return (time.perf_counter() - t0) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    state = make_state(1, args.rows)
+    trip = state.trips[0]
+
+    legacy = QTableWidget(0, 4)
+    legacy.resize(900, 600)
+    legacy.show()
+    legacy_refresh = timed(app, lambda: legacy_fill(legacy, trip))
+
+    def legacy_edit():
+        trip.update_budget_item(trip.budget_items[5].id, paid=True)
+        # Раньше любое изменение приводило к refresh_all_pages -> полная перестройка.
+        legacy_fill(legacy, trip)
+
+    legacy_edit_ms = timed(app, legacy_edit)
+    legacy.close()
+
+    page = BudgetPage(state)
+    page.resize(900, 600)
+    page.show()
+    app.processEvents()
+    state.set_active_trip(None)
+    page.refresh()
+    state.set_active_trip(trip.id)
+    model_refresh = timed(app, page.refresh)
+
+    def model_edit():
+        page.model.setData(page.model.index(6, BudgetTableModel.COL_PAID), Qt.CheckState.Checked,
+                           Qt.ItemDataRole.CheckStateRole)
+        page.refresh()
+
+    model_edit_ms = timed(app, model_edit)
+    page.close()
+
+    print(f"{args.rows} rows")
+    print(f"{'view':>14} {'refresh ms':>11} {'edit ms':>9}")
+    print(f"{'QTableWidget':>14} {legacy_refresh:>11.1f} {legacy_edit_ms:>9.1f}")
+    print(f"{'model/view':>14} {model_refresh:>11.1f} {model_edit_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Headless CLI (python -m travel_planner): interpreter start-up to exit for
+a one-file command, and throughput of the batch commands over a directory
+of per-user travel_data.json files, with and without the binary snapshot
+the app writes next to each file.
+
+Each command runs as a separate `python -m travel_planner` process, as a
+back-office job would run it.
+
+Run from the repository root:  python benchmarks/bench_cli.py
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _data import make_state
+from travel_planner.storage import save_state
+
+ROOT = Path(__file__).resolve().parents[1]
+STARTUP_RUNS = 15
+COMMANDS = ["list", "stats", "validate", "compact"]
+
+
+def cli(*argv) -> float:
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "travel_planner", *map(str, argv)],
+                   check=False, stdout=subprocess.DEVNULL, env=env)
+    return (time.perf_counter() - t0) * 1000
+
+
+def bare_python() -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return (time.perf_counter() - t0) * 1000
+
+
+def make_tree(root: Path, files: int, trips: int, items: int, snapshot: bool) -> int:
+    state = make_state(trips, items)
+    total = 0
+    for i in range(files):
+        path = root / f"user{i:05d}" / "travel_data.json"
+        path.parent.mkdir(parents=True)
+        save_state(state, path, backups=0, snapshot=snapshot)
+        total += path.stat().st_size
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--trips", type=int, default=3)
+    parser.add_argument("--items", type=int, default=20, help="items of each kind per trip")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        one = Path(tmp) / "one.json"
+        save_state(make_state(args.trips, args.items), one, backups=0)
+        python_ms = statistics.median(bare_python() for _ in range(STARTUP_RUNS))
+        help_ms = statistics.median(cli("--help") for _ in range(STARTUP_RUNS))
+        list_ms = statistics.median(cli("list", one) for _ in range(STARTUP_RUNS))
+        print(f"start-up (median of {STARTUP_RUNS}): python -c pass {python_ms:.0f} ms,"
+              f" --help {help_ms:.0f} ms, list one file {list_ms:.0f} ms", flush=True)
+
+    print(f"\n{args.files} files, {args.trips} trips x {args.items} items each", flush=True)
+    print(f"{'files':>14} {'command':>9} {'ms':>8} {'files/s':>9} {'MB/s':>7}", flush=True)
+    for snapshot in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            size = make_tree(root, args.files, args.trips, args.items, snapshot)
+            label = "json+snapshot" if snapshot else "json"
+            for command in COMMANDS:
+                extra = ["--backups", "0"] if command == "compact" else []
+                if command == "compact" and not snapshot:
+                    extra.append("--no-snapshot")
+                ms = cli(command, root, *extra)
+                print(f"{label:>14} {command:>9} {ms:>8.0f} {args.files / ms * 1000:>9.0f}"
+                      f" {size / 2**20 / ms * 1000:>7.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Load/save throughput of the JSON state file at ~1MB, ~10MB and ~100MB:
+previous path (to_dict() tree + json.dumps(indent=4), json.load) vs the
+codec layer with stdlib json and, when installed, orjson (compact,
+streamed per trip).
+
+Sizes are approximate targets for the compact file. Each size runs in a
+fresh interpreter.
+
+Run from the repository root:  python benchmarks/bench_codec.py
+"""
+from __future__ import annotations
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _data import make_state
+from travel_planner.codec import CODECS
+from travel_planner.models import AppState
+from travel_planner.storage import atomic_write_bytes, load_state, save_state
+
+TRIPS = 20
+# Примерный размер компактного JSON на один индекс элемента (три элемента разных видов).
+BYTES_PER_ITEM = 560
+
+
+def legacy_save(state: AppState, path: Path) -> None:
+    text = json.dumps(state.to_dict(), ensure_ascii=False, indent=4)
+    atomic_write_bytes(path, text.encode("utf-8"), backups=0)
+
+
+def legacy_load(path: Path) -> AppState:
+    with path.open("r", encoding="utf-8") as f:
+        return AppState.from_dict(json.load(f))
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def run(target_mb: float) -> None:
+    items = max(1, int(target_mb * 2**20 / BYTES_PER_ITEM / TRIPS))
+    state = make_state(TRIPS, items)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "travel_data.json"
+        variants = [("legacy", None)] + [(name, codec) for name, codec in sorted(CODECS.items())]
+        for name, codec in variants:
+            if codec is None:
+                save_s = timed(lambda: legacy_save(state, path))
+                size = path.stat().st_size
+                load_s = timed(lambda: legacy_load(path))
+            else:
+                save_s = timed(lambda: save_state(state, path, backups=0, codec=codec))
+                size = path.stat().st_size
+                load_s = timed(lambda: load_state(path, backups=0, codec=codec))
+            mb = size / 2**20
+            print(f"{target_mb:>7.0f} {name:>8} {mb:>9.1f} {save_s * 1000:>9.0f} {mb / save_s:>9.1f} "
+                  f"{load_s * 1000:>9.0f} {mb / load_s:>9.1f}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10, 100], help="target MB")
+    parser.add_argument("--run", type=float)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run)
+        return
+
+    print(f"{'target':>7} {'codec':>8} {'file MB':>9} {'save ms':>9} {'save MB/s':>9} "
+          f"{'load ms':>9} {'load MB/s':>9}", flush=True)
+    for size in args.sizes:
+        subprocess.run([sys.executable, __file__, "--run", str(size)], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""ItineraryPage refresh time and memory per activity: one QFrame per
+activity (previous implementation) vs the QListView + delegate.
+
+Each variant runs in a fresh interpreter; memory is the RSS growth
+measured from /proc/self/statm (Linux).
+
+Run from the repository root:  python benchmarks/bench_itinerary.py
+"""
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _data import make_state
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def legacy_build(layout, trip) -> None:
+    # Прежний ItineraryPage.refresh: QFrame на день и QFrame + 3 QLabel на активность.
+    from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QVBoxLayout
+    from travel_planner.utils import activity_sort_key, human_date
+
+    while layout.count():
+        item = layout.takeAt(0)
+        if item and item.widget():
+            item.widget().setParent(None)
+
+    day_map: Dict[object, List] = {}
+    for act in trip.activities:
+        day_map.setdefault(act.day, []).append(act)
+    for d in sorted(day_map):
+        day_card = QFrame()
+        dc_layout = QVBoxLayout(day_card)
+        dc_layout.addWidget(QLabel(human_date(d)))
+        for a in sorted(day_map[d], key=activity_sort_key):
+            frame = QFrame()
+            fl = QVBoxLayout(frame)
+            top = QHBoxLayout()
+            top.addWidget(QLabel(a.time))
+            title = QLabel(a.title)
+            title.setWordWrap(True)
+            top.addWidget(title, 1)
+            fl.addLayout(top)
+            meta = QLabel(" · ".join(x for x in (a.location, a.notes) if x))
+            meta.setWordWrap(True)
+            fl.addWidget(meta)
+            dc_layout.addWidget(frame)
+        layout.addWidget(day_card)
+    layout.addStretch(1)
+
+
+def run(variant: str, n: int) -> None:
+    from PyQt6.QtWidgets import QApplication, QScrollArea, QVBoxLayout, QWidget
+    from travel_planner.pages.itinerary_page import ItineraryPage
+
+    app = QApplication([])
+    state = make_state(1, n)
+    trip = state.trips[0]
+    before = rss_bytes()
+
+    t0 = time.perf_counter()
+    if variant == "widgets":
+        area = QScrollArea()
+        area.setWidgetResizable(True)
+        content = QWidget()
+        area.setWidget(content)
+        legacy_build(QVBoxLayout(content), trip)
+        area.resize(800, 700)
+        area.show()
+    else:
+        page = ItineraryPage(state)
+        page.resize(800, 700)
+        page.show()
+    app.processEvents()
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    per_activity = (rss_bytes() - before) / n
+    print(f"{variant:>9} {n:>8} {elapsed:>10.1f} {per_activity:>14.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000])
+    parser.add_argument("--run", choices=["widgets", "delegate"])
+    parser.add_argument("--n", type=int)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run, args.n)
+        return
+
+    print(f"{'variant':>9} {'acts':>8} {'refresh ms':>10} {'bytes/activity':>14}", flush=True)
+    for n in args.sizes:
+        for variant in ("widgets", "delegate"):
+            subprocess.run([sys.executable, __file__, "--run", variant, "--n", str(n)],
+                           check=True, stderr=subprocess.DEVNULL)
+
+
+if __name__ == "__main__":
+    main()
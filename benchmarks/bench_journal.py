@@ -0,0 +1,52 @@
+"""Latency of persisting a single packed-flag flip: full save_state vs journal append.
+
+Run from the repository root:  python benchmarks/bench_journal.py
+"""
+from __future__ import annotations
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from _data import make_state
+
+from travel_planner.journal import JournalStore
+from travel_planner.storage import save_state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 10_000, 50_000])
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'save_state ms':>14} {'journal ms':>11} {'replay ms':>10}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            p = Path(tmp) / "travel_data.json"
+            state = make_state(1, n)
+            trip = state.trips[0]
+
+            t0 = time.perf_counter()
+            save_state(state, p)
+            full_ms = (time.perf_counter() - t0) * 1000
+
+            store = JournalStore(p, compact_every=10 ** 9)
+            store.compact(state)
+            t0 = time.perf_counter()
+            for i in range(args.edits):
+                item = trip.packing_items[i % n]
+                item.packed = not item.packed
+                store.put_item(trip.id, item)
+            journal_ms = (time.perf_counter() - t0) * 1000 / args.edits
+            store.close()
+
+            t0 = time.perf_counter()
+            JournalStore(p).load()
+            replay_ms = (time.perf_counter() - t0) * 1000
+
+            print(f"{n:>8} {full_ms:>14.2f} {journal_ms:>11.4f} {replay_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
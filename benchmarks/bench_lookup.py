@@ -0,0 +1,79 @@
+"""Id lookups, cell edits and removals on a trip with many items:
+linear scans (previous code) vs the IndexedList id index.
+
+Run from the repository root:  python benchmarks/bench_lookup.py
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+
+from _data import make_state
+
+
+def timed(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1e6 / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    state = make_state(200, 0)
+    big = make_state(1, args.items).trips[0]
+    state.add_trip(big)
+    trip_ids = [t.id for t in state.trips]
+    item_ids = [b.id for b in big.budget_items]
+    rng = random.Random(1)
+    picks = [rng.choice(item_ids) for _ in range(args.ops)]
+
+    def scan_trip():
+        for tid in trip_ids:
+            next(t for t in state.trips if t.id == tid)
+
+    def index_trip():
+        for tid in trip_ids:
+            state.get_trip_by_id(tid)
+
+    def scan_edit():
+        for bid in picks:
+            next(x for x in big.budget_items if x.id == bid).paid = True
+
+    def index_edit():
+        for bid in picks:
+            big.budget_items.get(bid).paid = True
+
+    print(f"trip lookup, {len(trip_ids)} trips: "
+          f"scan {timed(scan_trip, len(trip_ids)):.2f} us  index {timed(index_trip, len(trip_ids)):.2f} us")
+    print(f"item edit, {args.items} items:    "
+          f"scan {timed(scan_edit, args.ops):.2f} us  index {timed(index_edit, args.ops):.2f} us")
+
+    removals = picks[: args.ops // 2]
+    items = list(big.budget_items)
+
+    def scan_remove():
+        nonlocal items
+        for bid in removals:
+            items = [x for x in items if x.id != bid]
+
+    def index_remove():
+        for bid in removals:
+            big.budget_items.remove_id(bid)
+
+    def row_remove():
+        # Так удаляют страницы: строка выделенного элемента известна.
+        for _ in removals:
+            row = len(big.budget_items) // 2
+            big.budget_items.remove_id(big.budget_items[row].id, row)
+
+    n = len(removals)
+    print(f"item remove, {args.items} items:  rebuild {timed(scan_remove, n):.2f} us  "
+          f"index {timed(index_remove, n):.2f} us  index+row {timed(row_remove, n):.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Memory held by a loaded state: item classes with a per-instance __dict__
+and no string interning (previous models) vs the slotted models.
+
+Each variant runs in a fresh interpreter: the JSON text is parsed and
+turned into models under tracemalloc, the parsed dicts are dropped, and
+the memory still held by the state is reported.
+
+Run from the repository root:  python benchmarks/bench_memory.py
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict
+
+from _data import make_state
+from travel_planner.models import AppState, Trip
+
+
+@dataclass
+class LegacyActivityItem:
+    id: str
+    day: date
+    time: str
+    title: str
+    location: str
+    notes: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LegacyActivityItem":
+        return cls(
+            id=data["id"],
+            day=date.fromisoformat(data["day"]),
+            time=data.get("time", ""),
+            title=data.get("title", ""),
+            location=data.get("location", ""),
+            notes=data.get("notes", ""),
+        )
+
+
+@dataclass
+class LegacyBudgetItem:
+    id: str
+    category: str
+    description: str
+    cost: float
+    paid: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LegacyBudgetItem":
+        return cls(
+            id=data["id"],
+            category=data.get("category", ""),
+            description=data.get("description", ""),
+            cost=float(data.get("cost", 0.0)),
+            paid=bool(data.get("paid", False)),
+        )
+
+
+@dataclass
+class LegacyPackingItem:
+    id: str
+    item_name: str
+    category: str
+    quantity: int = 1
+    place: str = "Carry-on"
+    packed: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LegacyPackingItem":
+        return cls(
+            id=data["id"],
+            item_name=data.get("item_name", ""),
+            category=data.get("category", ""),
+            quantity=int(data.get("quantity", 1)),
+            place=data.get("place", "Carry-on"),
+            packed=bool(data.get("packed", False)),
+        )
+
+
+def legacy_state(data: Dict[str, Any]) -> AppState:
+    # Те же контейнеры и индексы, что у текущего Trip, меняются только классы элементов.
+    trips = []
+    for t in data["trips"]:
+        trips.append(Trip(
+            id=t["id"],
+            title=t["title"],
+            destination=t["destination"],
+            start_date=date.fromisoformat(t["start_date"]),
+            end_date=date.fromisoformat(t["end_date"]),
+            accommodation=t["accommodation"],
+            notes=t["notes"],
+            activities=[LegacyActivityItem.from_dict(x) for x in t["activities"]],
+            budget_items=[LegacyBudgetItem.from_dict(x) for x in t["budget_items"]],
+            packing_items=[LegacyPackingItem.from_dict(x) for x in t["packing_items"]],
+        ))
+    return AppState(trips=trips, active_trip_id=data["active_trip_id"], theme=data["theme"])
+
+
+def run(variant: str, trips: int, items: int) -> None:
+    text = json.dumps(make_state(trips, items).to_dict())
+    gc.collect()
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    data = json.loads(text)
+    state = legacy_state(data) if variant == "dict" else AppState.from_dict(data)
+    elapsed = time.perf_counter() - t0
+    del data
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total_items = trips * items * 3
+    assert sum(len(t.activities) + len(t.budget_items) + len(t.packing_items) for t in state.trips) == total_items
+    print(f"{variant:>8} {total_items:>9} {current / 2**20:>10.1f} {current / total_items:>10.0f} "
+          f"{peak / 2**20:>9.1f} {elapsed:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trips", type=int, default=100)
+    parser.add_argument("--items", type=int, default=1_000, help="items of each kind per trip")
+    parser.add_argument("--run", choices=["dict", "slots"])
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run, args.trips, args.items)
+        return
+
+    print(f"{'variant':>8} {'items':>9} {'held MB':>10} {'B/item':>10} {'peak MB':>9} {'load s':>8}", flush=True)
+    for variant in ("dict", "slots"):
+        subprocess.run([sys.executable, __file__, "--run", variant,
+                        "--trips", str(args.trips), "--items", str(args.items)], check=True)
+
+
+if __name__ == "__main__":
+    main()
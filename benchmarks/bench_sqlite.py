@@ -0,0 +1,52 @@
+"""Load, full save and single-item update latency: JSON file vs SQLite backend.
+
+Run from the repository root:  python benchmarks/bench_sqlite.py
+"""
+from __future__ import annotations
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from _data import make_state
+
+from travel_planner.sqlite_storage import SqliteStore
+from travel_planner.storage import load_state, save_state
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'backend':>8} {'load ms':>10} {'save ms':>10} {'update ms':>10}")
+    for n in args.sizes:
+        state = make_state(1, n)
+        trip = state.trips[0]
+        item = trip.budget_items[n // 2]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = Path(tmp) / "travel_data.json"
+            save_ms = timed(lambda: save_state(state, json_path))
+            load_ms = timed(lambda: load_state(json_path))
+            item.paid = not item.paid
+            # JSON не умеет частичных обновлений - это снова полная запись.
+            update_ms = timed(lambda: save_state(state, json_path))
+            print(f"{n:>8} {'json':>8} {load_ms:>10.2f} {save_ms:>10.2f} {update_ms:>10.2f}")
+
+            store = SqliteStore(Path(tmp) / "travel_data.db")
+            save_ms = timed(lambda: store.save(state))
+            load_ms = timed(store.load)
+            item.paid = not item.paid
+            update_ms = timed(lambda: store.upsert_item(trip.id, item))
+            print(f"{n:>8} {'sqlite':>8} {load_ms:>10.2f} {save_ms:>10.2f} {update_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Time-to-first-window with eager vs lazy per-trip loading from JSON,
+and from the binary snapshot written next to it. Also reports the import
+time of the main window module (pages and dialogs are imported lazily).
+For a real launch use: python main.py --startup-timings
+
+Each mode runs in a fresh interpreter so GC state from one run does not
+leak into the other.
+
+Run from the repository root:  python benchmarks/bench_startup.py
+"""
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _data import make_state
+
+from travel_planner.storage import load_state, save_state
+
+
+MODES = ["json/eager", "json/lazy", "snapshot/eager", "snapshot/lazy"]
+
+
+def run_startup(path: Path, mode: str) -> None:
+    from PyQt6.QtWidgets import QApplication
+
+    t_import = time.perf_counter()
+    from travel_planner.main_window import MainWindow
+    import_ms = (time.perf_counter() - t_import) * 1000
+
+    app = QApplication([])
+    t0 = time.perf_counter()
+    state = load_state(path, lazy=mode.endswith("/lazy"))
+    t1 = time.perf_counter()
+    window = MainWindow(state, path)
+    window.show()
+    app.processEvents()
+    t2 = time.perf_counter()
+    print(f"{mode:>14} {import_ms:>10.1f} {(t1 - t0) * 1000:>10.1f} {(t2 - t0) * 1000:>16.1f}", flush=True)
+    window.autosave.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trips", type=int, default=500)
+    parser.add_argument("--items", type=int, default=100, help="items of each kind per trip")
+    parser.add_argument("--run", choices=MODES)
+    parser.add_argument("--path", type=Path)
+    args = parser.parse_args()
+
+    if args.run:
+        run_startup(args.path, args.run)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "travel_data.json"
+        state = make_state(args.trips, args.items)
+        save_state(state, path, backups=0, snapshot=False)
+        size_mb = path.stat().st_size / 1e6
+        print(f"{args.trips} trips x {args.items} items/kind, {size_mb:.1f} MB")
+        print(f"{'mode':>14} {'import ms':>10} {'load ms':>10} {'first window ms':>16}", flush=True)
+        for mode in MODES:
+            if mode == "snapshot/eager":
+                save_state(state, path, backups=0)
+            subprocess.run(
+                [sys.executable, __file__, "--run", mode, "--path", str(path)],
+                check=True,
+                stderr=subprocess.DEVNULL,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare the legacy in-place JSON write with the atomic, fsynced save_state.
+
+"capture ms" is the part of an autosave that runs on the GUI thread
+(state_snapshot); encoding and writing happen in the autosave worker.
+
+Run from the repository root:  python benchmarks/bench_storage.py
+"""
+from __future__ import annotations
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from _data import make_state
+
+from travel_planner.storage import save_state, load_state, state_snapshot
+
+
+def legacy_save(state, p: Path) -> None:
+    with p.open("w", encoding="utf-8") as f:
+        json.dump(state.to_dict(), f, ensure_ascii=False, indent=4)
+
+
+def bench(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        p = Path(tmp) / "travel_data.json"
+        print(f"{'items':>8} {'legacy ms':>10} {'atomic ms':>10} {'no-backup ms':>13} {'load ms':>8} {'capture ms':>11}")
+        for n in args.sizes:
+            state = make_state(1, n)
+            legacy = bench(lambda: legacy_save(state, p), args.repeat)
+            atomic = bench(lambda: save_state(state, p), args.repeat)
+            plain = bench(lambda: save_state(state, p, backups=0), args.repeat)
+            load = bench(lambda: load_state(p), args.repeat)
+            capture = bench(lambda: state_snapshot(state, p), args.repeat)
+            print(f"{n:>8} {legacy:>10.2f} {atomic:>10.2f} {plain:>13.2f} {load:>8.2f} {capture:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
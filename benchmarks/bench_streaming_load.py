@@ -0,0 +1,84 @@
+"""Loading a ~200MB travel_data.json: load_state() (whole document parsed
+into dicts, then models) vs iter_trips() (one trip at a time).
+
+Reports time to the first Trip, total load time, and the process RSS:
+peak during the load and what is still held once the state is built. Each
+variant runs in a fresh interpreter on the same file.
+
+Run from the repository root:  python benchmarks/bench_streaming_load.py
+"""
+from __future__ import annotations
+import argparse
+import gc
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _data import make_state
+from travel_planner.codec import CODECS
+from travel_planner.models import AppState
+from travel_planner.storage import iter_trips, load_state, save_state
+
+VARIANTS = ["load_state/json", "load_state/orjson", "iter_trips"]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(variant: str, path: Path) -> None:
+    gc.collect()
+    before = rss_mb()
+    t0 = time.perf_counter()
+    if variant == "iter_trips":
+        meta = {}
+        trips = iter_trips(path, meta)
+        first = [next(trips)]
+        first_s = time.perf_counter() - t0
+        state = AppState(trips=first + list(trips), active_trip_id=meta.get("active_trip_id"),
+                         theme=meta.get("theme", "dark"))
+    else:
+        state = load_state(path, backups=0, codec=CODECS[variant.split("/")[1]])
+        first_s = time.perf_counter() - t0
+    total_s = time.perf_counter() - t0
+    gc.collect()
+    trips = len(state.trips)
+    print(f"{variant:>18} {trips:>6} {first_s * 1000:>10.0f} {total_s:>8.2f} "
+          f"{peak_rss_mb() - before:>12.0f} {rss_mb() - before:>11.0f}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trips", type=int, default=400)
+    parser.add_argument("--items", type=int, default=1350, help="items of each kind per trip")
+    parser.add_argument("--run", choices=VARIANTS)
+    parser.add_argument("--path")
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run, Path(args.path))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "travel_data.json"
+        save_state(make_state(args.trips, args.items), path, backups=0)
+        print(f"file: {path.stat().st_size / 2**20:.0f} MB, {args.trips} trips")
+        print(f"{'variant':>18} {'trips':>6} {'first ms':>10} {'total s':>8} {'peak RSS MB':>12} "
+              f"{'held RSS MB':>11}", flush=True)
+        for variant in VARIANTS:
+            if variant.split("/")[-1] in CODECS or variant == "iter_trips":
+                subprocess.run([sys.executable, __file__, "--run", variant, "--path", str(path)], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Theme switch and navigation latency on a main window holding thousands of
+extra widgets (labels, buttons and line edits in a scroll area).
+
+Compares the previous behaviour (application stylesheet replaced on every
+apply, every nav button repolished on each navigation) with the current
+style.apply_theme() and SidebarWidget.set_active_page(). Times include
+processing the resulting events. Each widget count runs in a fresh
+interpreter.
+
+Run from the repository root:  python benchmarks/bench_theme.py
+"""
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _data import make_state
+from travel_planner.storage import save_state
+
+REPEATS = 5
+PAGES = ["dashboard", "itinerary", "trips", "budget", "packing", "settings"]
+
+
+def add_filler(window, count: int) -> None:
+    from PyQt6.QtWidgets import QGridLayout, QLabel, QLineEdit, QPushButton, QScrollArea, QWidget
+
+    filler = QWidget()
+    grid = QGridLayout(filler)
+    kinds = [QLabel, QPushButton, QLineEdit]
+    for i in range(count):
+        widget = kinds[i % 3](f"w{i}")
+        if i % 3 == 1:
+            widget.setProperty("role", "ghost")
+        grid.addWidget(widget, i // 20, i % 20)
+    area = QScrollArea()
+    area.setWidget(filler)
+    window.centralWidget().layout().addWidget(area)
+
+
+def timed(app, fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    app.processEvents()
+    return (time.perf_counter() - t0) * 1000
+
+
+def legacy_navigate(window, key: str) -> None:
+    # Прежний set_active_page: unpolish/polish всех кнопок навигации.
+    window.pages_stack.setCurrentWidget(window.page(key))
+    window.bus.refresh_if_dirty(window.pages_stack.currentWidget())
+    for page_key, btn in window.sidebar.nav_buttons.items():
+        btn.setProperty("active", "true" if page_key == key else "false")
+        btn.style().unpolish(btn)
+        btn.style().polish(btn)
+        btn.update()
+    window.update_header()
+
+
+def run(widgets: int, path: Path) -> None:
+    from PyQt6.QtWidgets import QApplication
+    from travel_planner.main_window import MainWindow
+    from travel_planner.storage import load_state
+    from travel_planner.style import apply_theme, theme_stylesheet
+
+    app = QApplication([])
+    apply_theme(app, "dark")
+    window = MainWindow(load_state(path, lazy=True), path)
+    add_filler(window, widgets)
+    for key in PAGES:
+        window.page(key)
+    window.resize(1400, 900)
+    window.show()
+    app.processEvents()
+
+    themes = ["light", "dark"] * REPEATS
+    switch = [timed(app, lambda t=t: window.on_theme_changed(t)) for t in themes]
+    legacy_same = [timed(app, lambda: app.setStyleSheet(theme_stylesheet("dark"))) for _ in range(REPEATS)]
+    same = [timed(app, lambda: window.on_theme_changed("dark")) for _ in range(REPEATS)]
+    keys = PAGES[1:] + PAGES[:1]
+    legacy_nav = [timed(app, lambda k=k: legacy_navigate(window, k)) for k in keys * REPEATS]
+    # Прежний код оставил у всех кнопок active=false; начинаем с чистой панели.
+    window.sidebar.active_page = None
+    nav = [timed(app, lambda k=k: window.handle_navigation(k)) for k in keys * REPEATS]
+
+    def avg(values):
+        return sum(values) / len(values)
+
+    print(
+        f"{widgets:>8} {avg(switch):>10.1f} {avg(legacy_same):>12.1f} {avg(same):>10.1f}"
+        f" {avg(legacy_nav):>11.2f} {avg(nav):>10.2f}",
+        flush=True,
+    )
+    window.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--widgets", type=int, nargs="+", default=[1000, 3000, 6000])
+    parser.add_argument("--trips", type=int, default=50)
+    parser.add_argument("--items", type=int, default=50, help="items of each kind per trip")
+    parser.add_argument("--run", type=int)
+    parser.add_argument("--path", type=Path)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        run(args.run, args.path)
+        return
+
+    print(
+        f"{'widgets':>8} {'switch ms':>10} {'reapply old':>12} {'reapply ms':>10}"
+        f" {'nav old ms':>11} {'nav ms':>10}",
+        flush=True,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "travel_data.json"
+        save_state(make_state(args.trips, args.items), path, backups=0)
+        for widgets in args.widgets:
+            subprocess.run([sys.executable, __file__, "--run", str(widgets), "--path", str(path)],
+                           check=True, stderr=subprocess.DEVNULL)
+
+
+if __name__ == "__main__":
+    main()
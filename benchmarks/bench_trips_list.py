@@ -0,0 +1,128 @@
+"""TripsPage with thousands of trips: one TripCardWidget per trip (previous
+implementation) vs the QListView + TripCardDelegate with search index.
+
+Reports build time, RSS growth, the slowest search keystroke and the
+slowest scroll step (one repaint each). Each variant runs in a fresh
+interpreter.
+
+Run from the repository root:  python benchmarks/bench_trips_list.py
+"""
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _data import make_state
+
+QUERY = "city 1234"
+SCROLL_STEPS = 50
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def legacy_build(layout, state) -> None:
+    # Прежний TripsPage.refresh: QFrame с тремя QLabel и тремя кнопками на поездку.
+    from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QPushButton, QVBoxLayout
+    from travel_planner.utils import date_range_str, money
+
+    for trip in state.trips:
+        card = QFrame()
+        cl = QVBoxLayout(card)
+        cl.addWidget(QLabel(f"{trip.title} — {trip.destination}"))
+        cl.addWidget(QLabel(date_range_str(trip.start_date, trip.end_date)))
+        cl.addWidget(QLabel(f"Budget: {money(trip.total_budget())} | Paid: {money(trip.total_paid())}"))
+        row = QHBoxLayout()
+        for text in ("Set Active", "Edit", "Delete"):
+            row.addWidget(QPushButton(text))
+        cl.addLayout(row)
+        layout.addWidget(card)
+    layout.addStretch(1)
+
+
+def time_scroll(app, scroll_bar, repaint) -> float:
+    worst = 0.0
+    maximum = scroll_bar.maximum()
+    for step in range(1, SCROLL_STEPS + 1):
+        t0 = time.perf_counter()
+        scroll_bar.setValue(maximum * step // SCROLL_STEPS)
+        repaint()
+        app.processEvents()
+        worst = max(worst, time.perf_counter() - t0)
+    return worst * 1000
+
+
+def run(variant: str, n: int) -> None:
+    from PyQt6.QtWidgets import QApplication, QScrollArea, QVBoxLayout, QWidget
+    from travel_planner.pages.trips_page import TripsPage
+
+    app = QApplication([])
+    state = make_state(n, 2)
+    before = rss_bytes()
+
+    t0 = time.perf_counter()
+    if variant == "widgets":
+        area = QScrollArea()
+        area.setWidgetResizable(True)
+        content = QWidget()
+        area.setWidget(content)
+        legacy_build(QVBoxLayout(content), state)
+        area.resize(800, 700)
+        area.show()
+        app.processEvents()
+        build_ms = (time.perf_counter() - t0) * 1000
+        search_ms = float("nan")
+        scroll_ms = time_scroll(app, area.verticalScrollBar(), area.viewport().repaint)
+    else:
+        page = TripsPage(state)
+        page.resize(800, 700)
+        page.show()
+        page.refresh()
+        app.processEvents()
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        search_ms = 0.0
+        for i in range(1, len(QUERY) + 1):
+            t1 = time.perf_counter()
+            page.search_edit.setText(QUERY[:i])
+            page.list_view.viewport().repaint()
+            search_ms = max(search_ms, (time.perf_counter() - t1) * 1000)
+        page.search_edit.clear()
+        app.processEvents()
+
+        view = page.list_view
+        while page.model.canFetchMore():
+            page.model.fetchMore()
+        app.processEvents()
+        scroll_ms = time_scroll(app, view.verticalScrollBar(), view.viewport().repaint)
+
+    per_trip = (rss_bytes() - before) / n
+    print(f"{variant:>9} {n:>7} {build_ms:>9.1f} {per_trip:>10.0f} {search_ms:>10.2f} {scroll_ms:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 10_000])
+    parser.add_argument("--run", choices=["widgets", "delegate"])
+    parser.add_argument("--n", type=int)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run, args.n)
+        return
+
+    print(f"{'variant':>9} {'trips':>7} {'build ms':>9} {'bytes/trip':>10} {'search ms':>10} {'scroll ms':>10}", flush=True)
+    for n in args.sizes:
+        for variant in ("widgets", "delegate"):
+            subprocess.run([sys.executable, __file__, "--run", variant, "--n", str(n)],
+                           check=True, stderr=subprocess.DEVNULL)
+
+
+if __name__ == "__main__":
+    main()
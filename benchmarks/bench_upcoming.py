@@ -0,0 +1,80 @@
+"""Next-activity lookup: full sort on every refresh (previous
+get_upcoming_activity) vs the sorted activity index on Trip.
+
+Also times adding an activity and querying again, which is what the
+dashboard does after the user adds one.
+
+Run from the repository root:  python benchmarks/bench_upcoming.py
+"""
+from __future__ import annotations
+import argparse
+import time
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+from _data import make_state
+from travel_planner.models import ActivityItem
+
+
+def legacy_sort_key(act):
+    try:
+        parts = act.time.strip().split(":")
+        h, m = int(parts[0]), int(parts[1]) if len(parts) > 1 else 0
+    except Exception:
+        h, m = 99, 99
+    return (act.day.toordinal(), h, m)
+
+
+def legacy_upcoming(trip, today: date):
+    acts_sorted = sorted(trip.activities, key=legacy_sort_key)
+    if not acts_sorted:
+        return None
+    for a in acts_sorted:
+        if a.day >= today:
+            return a
+    return acts_sorted[0]
+
+
+def best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'acts':>8} {'legacy ms':>10} {'build ms':>10} {'query us':>10} {'add+query us':>13}")
+    for n in args.sizes:
+        trip = make_state(1, n).trips[0]
+        today = trip.start_date + timedelta(days=3)
+        now = datetime.combine(today, datetime.min.time()) + timedelta(hours=12)
+
+        legacy = best_ms(lambda: legacy_upcoming(trip, today), args.repeat)
+
+        def build():
+            trip.activities.invalidate_order()
+            trip.upcoming_activity(now)
+
+        build_ms = best_ms(build, args.repeat)
+        query_us = best_ms(lambda: trip.upcoming_activity(now), args.repeat * 100) * 1000
+
+        def add_and_query():
+            trip.activities.append(
+                ActivityItem(id=str(uuid4()), day=today, time="12:30", title="New", location="")
+            )
+            trip.upcoming_activity(now)
+
+        add_us = best_ms(add_and_query, args.repeat * 100) * 1000
+        assert trip.upcoming_activity(today) is legacy_upcoming(trip, today)
+        print(f"{n:>8} {legacy:>10.2f} {build_ms:>10.2f} {query_us:>10.2f} {add_us:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
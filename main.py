@@ -1,22 +1,74 @@
+import time
+
+# Отсчёт для --startup-timings начинается до импорта Qt и приложения.
+STARTED_AT = time.perf_counter()
+
+import argparse
 import sys
 from pathlib import Path
 from PyQt6.QtWidgets import QApplication
 
-from travel_planner.storage import load_state, get_default_path
+from travel_planner.models import AppState
+from travel_planner.storage import get_default_path, DEFAULT_FILE_NAMES
+from travel_planner.sqlite_storage import import_json
+from travel_planner.startup_timing import FirstPaintWatcher, StartupTimer
 from travel_planner.style import apply_theme
 from travel_planner.main_window import MainWindow
 
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="TripPlanner")
+    parser.add_argument(
+        "--storage",
+        choices=sorted(DEFAULT_FILE_NAMES),
+        default="json",
+        help="storage backend for trip data (default: json)",
+    )
+    parser.add_argument(
+        "--startup-timings",
+        action="store_true",
+        help="print import / load / window / first paint timings to stderr",
+    )
+    # Остальные аргументы (например, -style) передаём в QApplication.
+    return parser.parse_known_args(argv[1:])
+
+
 def main():
-    storage_path = get_default_path()
+    timer = StartupTimer(STARTED_AT)
+    timer.mark("imports")
+    args, qt_args = parse_args(sys.argv)
+    storage_path = get_default_path(args.storage)
 
-    state = load_state(storage_path)
+    if args.storage == "sqlite" and not storage_path.exists():
+        json_path = get_default_path("json")
+        if json_path.exists():
+            import_json(json_path, storage_path)
 
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
 
+    # Окно показывается сразу с пустым состоянием, данные читаются в
+    # фоновом потоке (крупный JSON - потоково, по поездкам).
+    state = AppState()
     apply_theme(app, state.theme)
+    timer.mark("application")
+
+    window = MainWindow(state, storage_path, journal=args.storage == "journal")
+    window.load_in_background(lazy=True)
+    timer.mark("main window")
+
+    if args.startup_timings:
+        pending = {"first paint", "data loaded"}
+
+        def stage_done(label):
+            timer.mark(label)
+            pending.discard(label)
+            if not pending:
+                print(timer.report(), file=sys.stderr)
 
-    window = MainWindow(state, storage_path)
+        # Ссылка держит фильтр событий живым до первой отрисовки.
+        watcher = FirstPaintWatcher(lambda: stage_done("first paint"), app)
+        window.loader.finished.connect(lambda: stage_done("data loaded"))
+        window.loader.failed.connect(lambda message: stage_done("data loaded"))
     window.show()
 
     sys.exit(app.exec())
@@ -0,0 +1,81 @@
+import json
+import threading
+from pathlib import Path
+
+from travel_planner import storage
+from travel_planner.autosave import AutosaveScheduler
+from travel_planner.journal import JournalStore
+from travel_planner.models import AppState
+from travel_planner.storage import load_state, save_state
+
+
+def test_autosave_coalesces_burst_into_one_write(qtbot, sample_state: AppState, tmp_storage_path: Path):
+    saver = AutosaveScheduler(sample_state, tmp_storage_path, delay_ms=20)
+
+    for _ in range(5):
+        saver.schedule()
+
+    assert not tmp_storage_path.exists()
+    with qtbot.waitSignal(saver.saved, timeout=2000):
+        pass
+
+    assert saver.request_count == 5
+    assert saver.save_count == 1
+    assert saver.coalesced_count == 4
+    with tmp_storage_path.open("r", encoding="utf-8") as f:
+        assert json.load(f) == sample_state.to_dict()
+    saver.shutdown()
+
+
+def test_autosave_writes_snapshot_taken_at_save_time(qtbot, sample_state: AppState, tmp_storage_path: Path):
+    saver = AutosaveScheduler(sample_state, tmp_storage_path, delay_ms=10_000)
+    saver.schedule()
+
+    sample_state.theme = "light"
+    saver.shutdown()
+
+    assert not saver.has_pending()
+    with tmp_storage_path.open("r", encoding="utf-8") as f:
+        assert json.load(f)["theme"] == "light"
+
+
+
+def test_autosave_encodes_json_in_worker_thread(qtbot, monkeypatch, sample_state: AppState, tmp_storage_path: Path):
+    threads = []
+    get_codec = storage.get_codec
+
+    def recording_codec():
+        threads.append(threading.current_thread())
+        return get_codec()
+
+    monkeypatch.setattr(storage, "get_codec", recording_codec)
+    saver = AutosaveScheduler(sample_state, tmp_storage_path)
+    saver.save_now()
+    saver.shutdown()
+
+    assert threads and threading.main_thread() not in threads
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+
+
+def test_autosave_flush_without_changes_does_not_write(qtbot, sample_state: AppState, tmp_storage_path: Path):
+    saver = AutosaveScheduler(sample_state, tmp_storage_path)
+    saver.flush()
+    assert saver.save_count == 0
+    assert not tmp_storage_path.exists()
+    saver.shutdown()
+
+
+def test_autosave_with_journal_appends_only_changes(qtbot, sample_state: AppState, tmp_storage_path: Path):
+    save_state(sample_state, tmp_storage_path)
+    size = tmp_storage_path.stat().st_size
+    journal = JournalStore(tmp_storage_path)
+    saver = AutosaveScheduler(sample_state, tmp_storage_path, journal=journal)
+
+    trip = sample_state.get_active_trip()
+    trip.update_packing_item(trip.packing_items[0].id, packed=True)
+    saver.save_now()
+
+    assert journal.record_count == 1
+    assert tmp_storage_path.stat().st_size == size
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+    saver.shutdown()
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from travel_planner.batch import compact_file, default_chunk_size, file_stats, run_batch
+from travel_planner.models import AppState
+from travel_planner.storage import load_state, save_state
+
+
+def make_corpus(state: AppState, root: Path, count: int) -> list:
+    paths = []
+    for i in range(count):
+        p = root / f"user{i}" / "travel_data.json"
+        p.parent.mkdir()
+        save_state(state, p, backups=0, snapshot=False)
+        paths.append(p)
+    return paths
+
+
+def test_run_batch_keeps_order_and_reports_bad_files(sample_state: AppState, tmp_path: Path):
+    paths = make_corpus(sample_state, tmp_path, 5)
+    paths[2].write_text('{"trips": [', encoding="utf-8")
+    paths.insert(4, tmp_path / "missing.json")
+    calls = []
+
+    report = run_batch(file_stats, paths, chunk_size=2, progress=lambda done, total: calls.append((done, total)))
+
+    assert [p for p, _ in report.results] == [paths[0], paths[1], paths[3], paths[5]]
+    assert [(e.path, e.error) for e in report.errors] == [
+        (paths[2], "JSONDecodeError"),
+        (paths[4], "FileNotFoundError"),
+    ]
+    assert report.files == 6
+    assert calls == [(2, 6), (4, 6), (6, 6)]
+    trip = sample_state.get_active_trip()
+    assert all(stats["budget_total"] == trip.total_budget() for _, stats in report.results)
+
+
+def test_process_pool_matches_serial_run(sample_state: AppState, tmp_path: Path):
+    paths = make_corpus(sample_state, tmp_path, 6)
+    paths[1].write_text("[]", encoding="utf-8")
+
+    serial = run_batch(file_stats, paths)
+    parallel = run_batch(file_stats, paths, workers=2, chunk_size=1, max_chunks_per_worker=2)
+
+    assert parallel.workers == 2
+    assert parallel.results == serial.results
+    assert [(e.path, e.error) for e in parallel.errors] == [(e.path, e.error) for e in serial.errors]
+
+    rewritten = run_batch(compact_file, paths[2:], 0, False, workers=2)
+    assert not rewritten.errors
+    assert all(load_state(p).to_dict() == sample_state.to_dict() for p in paths[2:])
+
+
+def test_default_chunk_size_spreads_work_over_workers():
+    assert default_chunk_size(10, 4) == 1
+    assert default_chunk_size(10_000, 8) == 64
+    assert default_chunk_size(1_000, 4) == 31
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from travel_planner import binary_snapshot, storage
+from travel_planner.binary_snapshot import read_binary_snapshot, snapshot_path
+from travel_planner import models
+from travel_planner.models import AppState, Trip
+from travel_planner.storage import load_state, save_state, write_state_data
+
+
+def test_save_writes_snapshot_preferred_by_load(monkeypatch, sample_state: AppState, tmp_storage_path: Path):
+    save_state(sample_state, tmp_storage_path)
+    assert snapshot_path(tmp_storage_path).exists()
+    assert read_binary_snapshot(tmp_storage_path).to_dict() == sample_state.to_dict()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("JSON should not be parsed")
+
+    monkeypatch.setattr(storage, "read_json", fail)
+    loaded = load_state(tmp_storage_path)
+    assert loaded.to_dict() == sample_state.to_dict()
+    assert loaded.trips[0].activities.sorted_items()
+
+
+def test_snapshot_ignored_when_json_changes_or_data_is_corrupt(sample_state: AppState, tmp_storage_path: Path):
+    save_state(sample_state, tmp_storage_path)
+    data = sample_state.to_dict()
+    data["theme"] = "light"
+    write_state_data(data, tmp_storage_path)
+    assert read_binary_snapshot(tmp_storage_path) is None
+    assert load_state(tmp_storage_path).theme == "light"
+
+    save_state(sample_state, tmp_storage_path)
+    snap = snapshot_path(tmp_storage_path)
+    raw = bytearray(snap.read_bytes())
+    raw[-1] ^= 0xFF
+    snap.write_bytes(bytes(raw))
+    assert read_binary_snapshot(tmp_storage_path) is None
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+
+
+def test_lazy_trips_are_snapshotted_without_loading(sample_state: AppState, tmp_storage_path: Path):
+    save_state(sample_state, tmp_storage_path, snapshot=False)
+    lazy = load_state(tmp_storage_path, lazy=True)
+    records = binary_snapshot.state_records(lazy)
+
+    assert not lazy.trips[0].is_loaded()
+    assert binary_snapshot.state_from_records(records).to_dict() == sample_state.to_dict()
+
+
+def test_raw_trip_records_match_model_records(monkeypatch, sample_state: AppState):
+    # Старые файлы: время числом или null, пустые категории и место.
+    data = sample_state.trips[0].to_dict()
+    data["activities"][0]["time"] = 9
+    data["activities"][-1]["time"] = None
+    data["budget_items"][0].update(category=None, cost="12.5", paid=0)
+    data["packing_items"][0].update(category=None, quantity="2")
+    del data["packing_items"][-1]["place"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("models should not be built")
+
+    eager = binary_snapshot.trip_record(Trip.from_dict(data))
+    lazy = Trip.from_dict(data, lazy=True)
+    for name in ("ActivityItem", "BudgetItem", "PackingItem"):
+        monkeypatch.setattr(getattr(models, name), "from_dict", fail)
+    assert binary_snapshot.trip_record(lazy) == eager
+    assert not lazy.is_loaded()
+
+
+def test_lazy_snapshot_load_defers_items(sample_state: AppState, tmp_storage_path: Path):
+    save_state(sample_state, tmp_storage_path)
+    lazy = load_state(tmp_storage_path, lazy=True)
+    trip = lazy.trips[0]
+
+    assert not trip.is_loaded()
+    assert lazy.to_dict() == sample_state.to_dict()
+    save_state(lazy, tmp_storage_path)
+    assert not trip.is_loaded()
+
+    assert trip.activities == sample_state.trips[0].activities
+    assert trip.is_loaded()
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
@@ -0,0 +1,96 @@
+import copy
+
+import pytest
+
+from travel_planner import budget_columns, models
+from travel_planner.budget_columns import BudgetColumns, use_columnar_budget
+from travel_planner.item_models import BudgetTableModel
+from travel_planner.models import BudgetItem, BudgetItemList, BudgetTotals, Trip, register_container
+
+
+def rows(n):
+    cats = ["Food", "Hotel", "Transport"]
+    return [
+        {"id": f"b{i}", "category": cats[i % 3], "description": f"line {i}", "cost": i * 1.25, "paid": i % 4 == 0}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_columnar_totals_match_item_totals(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(budget_columns, "numpy", None)
+
+    columns = BudgetColumns.from_rows(rows(200))
+    columns.update_item("b3", category="Gifts", paid=True)
+    columns.remove_id("b0")
+    columns.append(BudgetItem(id="x", category="Food", description="", cost=10.0, paid=False))
+
+    expected = BudgetTotals.from_items([view.to_item() for view in columns])
+    assert columns.totals().matches(expected)
+    assert columns.totals().by_category.keys() == expected.by_category.keys()
+
+
+def test_trip_keeps_columnar_budget_and_pages_read_views(sample_state):
+    trip = sample_state.get_active_trip()
+    before = trip.to_dict()
+    columns = use_columnar_budget(trip)
+    assert trip.budget_items is columns
+    assert trip.to_dict() == before
+    assert copy.deepcopy(trip) == trip
+
+    model = BudgetTableModel()
+    model.set_trip(trip)
+    index = model.index(0, BudgetTableModel.COL_COST)
+    assert model.setData(index, "99.5")
+    assert columns[0].cost == 99.5
+    assert trip.total_budget() == pytest.approx(sum(view.cost for view in columns))
+
+    model.remove_row(0)
+    assert len(trip.budget_items) == len(before["budget_items"]) - 1
+    assert trip.check_budget_totals()
+
+
+def test_columns_follow_budget_item_list_api():
+    items = [BudgetItem.from_dict(r) for r in rows(12)]
+    columns = BudgetColumns(items)
+    reference = BudgetItemList(BudgetItem.from_dict(r) for r in rows(12))
+    for target in (columns, reference):
+        target.remove_id("b2")
+        target.remove_id("b5", position=3)
+        target.insert(1, BudgetItem(id="i1", category="Gifts", description="", cost=3.0, paid=True))
+        target.insert(-2, BudgetItem(id="i2", category="Food", description="", cost=4.0, paid=False))
+        target.insert(100, BudgetItem(id="i3", category="Food", description="", cost=5.0, paid=False))
+        target.pop(0)
+        target.pop()
+        target.remove(target.get("b7"))
+    assert [view.to_dict() for view in columns] == [item.to_dict() for item in reference]
+    # Индекс id -> строка пересчитан после серии сдвигов.
+    assert all(columns.row_of(item.id) == row for row, item in enumerate(reference))
+    assert columns.totals().matches(BudgetTotals.from_items(reference))
+    with pytest.raises(ValueError):
+        columns.remove(BudgetItem(id="missing", category="", description="", cost=0.0))
+    with pytest.raises(ValueError):
+        columns.insert(0, BudgetItem(id="i1", category="", description="", cost=0.0))
+
+
+def test_large_budgets_load_as_columns(monkeypatch, sample_state):
+    monkeypatch.setattr(models, "COLUMNAR_BUDGET_ROWS", 50)
+    data = sample_state.get_active_trip().to_dict()
+    data["budget_items"] = rows(60)
+
+    eager = Trip.from_dict(data)
+    lazy = Trip.from_dict(data, lazy=True)
+    assert isinstance(eager.budget_items, BudgetColumns)
+    assert isinstance(lazy.budget_items, BudgetColumns)
+    assert eager.to_dict() == data == lazy.to_dict()
+
+    data["budget_items"] = rows(10)
+    assert type(Trip.from_dict(data).budget_items) is BudgetItemList
+
+
+def test_register_container_rejects_unknown_field():
+    with pytest.raises(KeyError):
+        register_container("receipts", BudgetColumns)
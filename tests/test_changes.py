@@ -0,0 +1,90 @@
+from travel_planner.changes import Change, ChangeBus
+
+
+class FakePage:
+    def __init__(self, visible: bool):
+        self.visible = visible
+        self.refreshes = 0
+
+    def isVisible(self):
+        return self.visible
+
+    def refresh(self):
+        self.refreshes += 1
+
+
+class FakeTripsPage(FakePage):
+    def __init__(self, visible: bool):
+        super().__init__(visible)
+        self.trip_ids = []
+
+    def refresh_trips(self, trip_ids):
+        self.trip_ids.append(trip_ids)
+
+
+def test_bus_refreshes_visible_and_marks_hidden_subscribers():
+    budget, packing, trips = FakePage(True), FakePage(False), FakePage(False)
+    bus = ChangeBus()
+    bus.subscribe(budget, Change.BUDGET | Change.ACTIVE_TRIP)
+    bus.subscribe(packing, Change.PACKING | Change.ACTIVE_TRIP)
+    bus.subscribe(trips, Change.BUDGET | Change.TRIP_HEADER)
+    for page in (budget, packing, trips):
+        bus.refresh_if_dirty(page)
+
+    bus.publish(Change.BUDGET)
+    assert budget.refreshes == 2
+    assert packing.refreshes == 1 and not bus.is_dirty(packing)
+    assert trips.refreshes == 1 and bus.is_dirty(trips)
+
+    assert bus.refresh_if_dirty(trips)
+    assert not bus.refresh_if_dirty(trips)
+    assert trips.refreshes == 2
+
+    bus.publish(Change.BUDGET, source=budget)
+    assert budget.refreshes == 2
+
+
+
+def test_bus_passes_changed_trip_ids_to_subscribers():
+    trips = FakeTripsPage(False)
+    bus = ChangeBus()
+    bus.subscribe(trips, Change.TRIP_HEADER | Change.ACTIVE_TRIP)
+    bus.refresh_if_dirty(trips)
+    assert trips.refreshes == 1 and trips.trip_ids == []
+
+    bus.publish(Change.TRIP_HEADER, trip_ids=["a"])
+    bus.publish(Change.ACTIVE_TRIP)
+    bus.publish(Change.TRIP_HEADER | Change.ACTIVE_TRIP, trip_ids=["b"])
+    assert bus.refresh_if_dirty(trips)
+    assert trips.trip_ids == [{"a", "b"}]
+
+    # Изменение без списка поездок требует полного обновления.
+    bus.publish(Change.TRIP_HEADER, trip_ids=["c"])
+    bus.publish(Change.TRIP_HEADER)
+    assert bus.refresh_if_dirty(trips)
+    assert trips.refreshes == 2 and len(trips.trip_ids) == 1
+
+    trips.visible = True
+    bus.publish(Change.ACTIVE_TRIP)
+    assert trips.trip_ids[-1] == set()
+
+
+def test_mainwindow_refreshes_hidden_pages_on_navigation(qtbot, sample_state, tmp_storage_path):
+    from travel_planner.main_window import MainWindow
+
+    win = MainWindow(sample_state, tmp_storage_path)
+    qtbot.addWidget(win)
+
+    budget_page = win.page("budget")
+    packing_page = win.page("packing")
+    assert not win.bus.is_dirty(win.page("dashboard"))
+
+    win.state_changed(Change.BUDGET)
+    assert win.bus.is_dirty(budget_page)
+
+    win.handle_navigation("budget")
+    assert not win.bus.is_dirty(budget_page)
+
+    win.state_changed(Change.PACKING)
+    assert win.bus.is_dirty(packing_page)
+    assert not win.bus.is_dirty(budget_page)
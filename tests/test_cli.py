@@ -0,0 +1,110 @@
+import io
+import json
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+from travel_planner.cli import main
+from travel_planner.models import AppState, BudgetItem, new_trip
+from travel_planner.storage import load_state, save_state
+
+
+def run_cli(*argv) -> tuple:
+    out = io.StringIO()
+    code = main([str(a) for a in argv], out=out)
+    return code, out.getvalue()
+
+
+def test_cli_runs_without_qt(sample_state: AppState, tmp_storage_path: Path):
+    save_state(sample_state, tmp_storage_path)
+    code = (
+        "import runpy, sys\n"
+        f"sys.argv = ['travel_planner', 'stats', {str(tmp_storage_path)!r}]\n"
+        "try:\n"
+        "    runpy.run_module('travel_planner', run_name='__main__')\n"
+        "except SystemExit as e:\n"
+        "    assert e.code == 0, e.code\n"
+        "print(sorted(m for m in sys.modules if m.startswith('PyQt')))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=Path(__file__).resolve().parents[1])
+    assert result.returncode == 0, result.stderr
+    assert "trips:          1" in result.stdout
+    assert result.stdout.rstrip().endswith("[]")
+
+
+def test_list_show_and_stats(sample_state: AppState, tmp_path: Path):
+    trip = sample_state.get_active_trip()
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        save_state(sample_state, tmp_path / name / "travel_data.json")
+
+    code, out = run_cli("list", "--json", tmp_path)
+    assert code == 0
+    rows = json.loads(out)
+    assert [r["id"] for r in rows] == [trip.id, trip.id]
+    assert all(r["active"] for r in rows)
+
+    code, out = run_cli("show", tmp_path / "a" / "travel_data.json", trip.title.upper())
+    assert code == 0
+    assert out.startswith(f"{trip.title} — {trip.destination}")
+
+    code, out = run_cli("stats", "--json", tmp_path)
+    stats = json.loads(out)
+    assert code == 0
+    assert stats["files"] == 2 and stats["trips"] == 2
+    assert stats["budget_total"] == 2 * trip.total_budget()
+    assert stats["activities"] == 2 * len(trip.activities)
+
+    code, out = run_cli("stats", "--json", "--jobs", 2, tmp_path)
+    parallel = json.loads(out)
+    assert code == 0 and parallel["workers"] == 2
+    assert {k: v for k, v in parallel.items() if k in stats and "second" not in k and k != "workers"} == {
+        k: v for k, v in stats.items() if "second" not in k and k != "workers"
+    }
+
+
+def test_validate_reports_problems_and_unreadable_files(sample_state: AppState, tmp_path: Path):
+    good = tmp_path / "good.json"
+    save_state(sample_state, good)
+    bad = tmp_path / "bad.json"
+    broken = new_trip("Broken", "Nowhere", date(2025, 5, 10), date(2025, 5, 1))
+    broken.budget_items.append(BudgetItem(id="b1", category="Food", description="", cost=-5.0))
+    save_state(AppState(trips=[broken], active_trip_id="missing"), bad)
+    (tmp_path / "torn.json").write_text('{"trips": [', encoding="utf-8")
+
+    code, out = run_cli("validate", tmp_path)
+    assert code == 1
+    assert "ends before it starts" in out
+    assert "negative cost" in out
+    assert "active trip missing does not exist" in out
+    assert "torn.json: cannot be read" in out
+    assert "good.json" not in out
+    assert out.rstrip().endswith("1/3 files valid")
+
+
+def test_export_import_and_compact(sample_state: AppState, tmp_path: Path):
+    src = tmp_path / "travel_data.json"
+    save_state(sample_state, src, pretty=True, snapshot=False)
+    extra = new_trip("Extra", "Oslo", date(2025, 8, 1), date(2025, 8, 3))
+    other = tmp_path / "other.json"
+    save_state(AppState(trips=[extra]), other)
+
+    code, _ = run_cli("export", src, tmp_path / "copy.db")
+    assert code == 0
+    assert load_state(tmp_path / "copy.db").to_dict() == sample_state.to_dict()
+    assert run_cli("export", src, tmp_path / "copy.db")[0] == 2
+
+    code, out = run_cli("import", src, other, "--backups", 0)
+    assert code == 0 and "imported 1 trips" in out
+    assert run_cli("import", src, other, "--backups", 0)[1].startswith("imported 0 trips, replaced 0, skipped 1")
+    merged = load_state(src)
+    assert [t.id for t in merged.trips] == [t.id for t in sample_state.trips] + [extra.id]
+
+    save_state(merged, src, pretty=True, snapshot=False)
+    size = src.stat().st_size
+    code, out = run_cli("compact", src, "--backups", 0)
+    assert code == 0
+    assert src.stat().st_size < size
+    assert load_state(src).to_dict() == merged.to_dict()
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from travel_planner.codec import CODECS, CODEC_ENV_VAR, JsonCodec, get_codec
+from travel_planner.storage import iter_state_chunks, load_state, save_state
+
+
+@pytest.mark.parametrize("name", sorted(CODECS))
+def test_streamed_state_matches_to_dict(sample_state, name):
+    codec = CODECS[name]
+    payload = b"".join(iter_state_chunks(sample_state, codec))
+    assert b"\n" not in payload
+    assert json.loads(payload) == sample_state.to_dict()
+    assert codec.loads(payload) == sample_state.to_dict()
+
+
+def test_save_is_compact_by_default_and_pretty_on_request(sample_state, tmp_storage_path):
+    save_state(sample_state, tmp_storage_path)
+    compact = tmp_storage_path.read_bytes()
+    save_state(sample_state, tmp_storage_path, pretty=True)
+    pretty = tmp_storage_path.read_bytes()
+
+    assert len(compact) < len(pretty)
+    assert b"\n" in pretty
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+
+
+def test_codec_can_be_forced_through_environment(monkeypatch):
+    monkeypatch.setenv(CODEC_ENV_VAR, "json")
+    assert type(get_codec()) is JsonCodec
+    monkeypatch.setenv(CODEC_ENV_VAR, "missing")
+    with pytest.raises(ValueError):
+        get_codec()
+
+
+def test_codecs_write_identical_bytes(sample_state):
+    data = sample_state.to_dict()
+    for pretty in (False, True):
+        outputs = {name: codec.dumps(data, pretty=pretty) for name, codec in CODECS.items()}
+        assert len(set(outputs.values())) == 1, sorted(outputs)
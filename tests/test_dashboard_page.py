@@ -0,0 +1,26 @@
+from datetime import date, datetime
+
+from travel_planner.models import AppState, ActivityItem, new_trip
+from travel_planner.pages.dashboard_page import DashboardPage
+
+
+def test_next_activity_rolls_over_without_full_refresh(qtbot):
+    trip = new_trip("Rome", "Rome", date(2025, 3, 1), date(2025, 3, 2))
+    trip.activities.append(ActivityItem(id="a", day=date(2025, 3, 1), time="10:00", title="Forum", location="Rome"))
+    trip.activities.append(ActivityItem(id="b", day=date(2025, 3, 1), time="15:30", title="Pantheon", location="Rome"))
+    state = AppState()
+    state.add_trip(trip)
+
+    page = DashboardPage(state)
+    qtbot.addWidget(page)
+    page.clock = lambda: datetime(2025, 3, 1, 9, 59, 30)
+    page.refresh()
+
+    assert "Forum" in page.next_activity_info_lbl.text()
+    assert page.rollover_timer.isActive()
+    assert page.rollover_timer.interval() == 90_000
+
+    page.clock = lambda: datetime(2025, 3, 1, 10, 1)
+    page.rollover_timer.timeout.emit()
+    assert "Pantheon" in page.next_activity_info_lbl.text()
+    assert page.rollover_timer.interval() == (5 * 60 + 30) * 60_000
@@ -0,0 +1,118 @@
+from uuid import uuid4
+
+from PyQt6.QtCore import Qt
+
+from travel_planner.item_models import (
+    BudgetTableModel,
+    PackingTableModel,
+    PackingFilterProxyModel,
+    ItineraryListModel,
+    EntryRole,
+)
+from travel_planner.models import AppState, BudgetItem
+
+
+def test_budget_model_reads_and_edits_trip_items(qtbot, sample_state: AppState):
+    trip = sample_state.get_active_trip()
+    model = BudgetTableModel()
+    model.set_trip(trip)
+
+    assert model.rowCount() == len(trip.budget_items)
+    assert model.data(model.index(0, 0)) == trip.budget_items[0].category
+    assert model.data(model.index(0, 2)) == f"{trip.budget_items[0].cost:.2f}"
+
+    hotel = model.index(1, BudgetTableModel.COL_PAID)
+    with qtbot.waitSignal(model.dataChanged) as blocker:
+        assert model.setData(hotel, Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+    assert blocker.args[0] == hotel and blocker.args[1] == hotel
+    assert trip.budget_items[1].paid
+    assert trip.total_paid() == trip.total_budget()
+
+    assert not model.setData(model.index(0, BudgetTableModel.COL_COST), "abc")
+    assert model.setData(model.index(0, BudgetTableModel.COL_COST), "99.5")
+    assert trip.budget_items[0].cost == 99.5
+    assert trip.check_budget_totals()
+
+
+def test_budget_model_inserts_and_removes_rows(qtbot, sample_state: AppState):
+    trip = sample_state.get_active_trip()
+    model = BudgetTableModel()
+    model.set_trip(trip)
+    start = model.rowCount()
+
+    with qtbot.waitSignal(model.rowsInserted):
+        model.append_item(BudgetItem(id=str(uuid4()), category="Food", description="Tapas", cost=30.0))
+    assert model.rowCount() == start + 1
+
+    first = trip.budget_items[0]
+    with qtbot.waitSignal(model.rowsRemoved):
+        assert model.remove_row(0) is first
+    assert model.rowCount() == start
+    assert trip.budget_items.get(first.id) is None
+
+    with qtbot.waitSignal(model.modelReset):
+        model.set_trip(None)
+    assert model.rowCount() == 0
+
+
+def test_packing_toggle_updates_single_index(qtbot, sample_state: AppState):
+    trip = sample_state.get_active_trip()
+    model = PackingTableModel()
+    model.set_trip(trip)
+
+    changed = []
+    model.dataChanged.connect(lambda tl, br, roles=None: changed.append((tl.row(), tl.column(), br.row(), br.column())))
+    model.modelReset.connect(lambda: changed.append("reset"))
+
+    packed = model.index(2, PackingTableModel.COL_PACKED)
+    assert model.setData(packed, Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+    assert trip.packing_items[2].packed
+    assert changed == [(2, PackingTableModel.COL_PACKED, 2, PackingTableModel.COL_PACKED)]
+
+
+def test_packing_proxy_filters_and_sorts(qtbot, sample_state: AppState):
+    trip = sample_state.get_active_trip()
+    model = PackingTableModel()
+    model.set_trip(trip)
+    proxy = PackingFilterProxyModel()
+    proxy.setSourceModel(model)
+
+    proxy.set_filters(place="Carry-on")
+    assert proxy.rowCount() == 2
+    proxy.set_filters(place="Carry-on", category="Documents")
+    assert proxy.rowCount() == 1
+    assert proxy.data(proxy.index(0, PackingTableModel.COL_ITEM)) == "Passport"
+
+    proxy.set_filters()
+    proxy.sort(PackingTableModel.COL_QTY, Qt.SortOrder.DescendingOrder)
+    assert proxy.data(proxy.index(0, PackingTableModel.COL_ITEM)) == "T-shirts"
+
+    proxy.set_filters(packed=True)
+    assert proxy.rowCount() == 0
+    model.setData(model.index(0, PackingTableModel.COL_PACKED), Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+    assert proxy.rowCount() == 1
+
+
+def test_itinerary_model_flattens_days_and_sorted_activities(qtbot, sample_state: AppState):
+    trip = sample_state.get_active_trip()
+    model = ItineraryListModel()
+    model.set_trip(trip)
+
+    entries = [model.data(model.index(row, 0), EntryRole) for row in range(model.rowCount())]
+    assert [(kind, getattr(payload, "title", payload)) for kind, payload, _ in entries] == [
+        ("day", trip.activities[0].day),
+        ("activity", "Sagrada Familia entry"),
+        ("activity", "Tapas walking tour"),
+        ("day", trip.activities[2].day),
+        ("activity", "Park Güell visit"),
+    ]
+    assert [last for _, _, last in entries] == [False, False, True, False, True]
+
+    act = entries[1][1]
+    act.notes = "Long notes " * 20
+    tooltip = model.data(model.index(1, 0), Qt.ItemDataRole.ToolTipRole)
+    assert tooltip.split("\n") == [t for t in (act.title, act.location, act.notes) if t]
+    assert model.data(model.index(0, 0), Qt.ItemDataRole.ToolTipRole) is None
+
+    model.set_trip(None)
+    assert model.rowCount() == 0
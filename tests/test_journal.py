@@ -0,0 +1,156 @@
+from datetime import date
+from pathlib import Path
+from uuid import uuid4
+
+from travel_planner.batch import read_state
+from travel_planner.journal import JournalStore
+from travel_planner.models import AppState, PackingItem, Trip, new_trip
+from travel_planner.storage import JsonSnapshot, load_state, save_state
+
+
+def test_journal_replays_changes_on_top_of_snapshot(sample_state: AppState, tmp_storage_path: Path):
+    store = JournalStore(tmp_storage_path)
+    store.compact(sample_state)
+
+    trip = sample_state.get_active_trip()
+    item = trip.packing_items[0]
+    item.packed = True
+    store.put_item(trip.id, item)
+
+    extra = PackingItem(id=str(uuid4()), item_name="Sunscreen", category="Toiletries")
+    trip.packing_items.append(extra)
+    store.put_item(trip.id, extra)
+
+    removed = trip.budget_items.pop(0)
+    store.delete_item(trip.id, "budget", removed.id)
+
+    sample_state.theme = "light"
+    store.put_meta(sample_state)
+    store.close()
+
+    reloaded = JournalStore(tmp_storage_path)
+    assert reloaded.load().to_dict() == sample_state.to_dict()
+    assert reloaded.record_count == 4
+
+
+def test_journal_compaction_truncates_log(sample_state: AppState, tmp_storage_path: Path):
+    store = JournalStore(tmp_storage_path, compact_every=2)
+    store.compact(sample_state)
+
+    trip = sample_state.get_active_trip()
+    store.put_trip(trip)
+    assert not store.maybe_compact(sample_state)
+    store.delete_trip(trip.id)
+    sample_state.delete_trip(trip.id)
+    assert store.maybe_compact(sample_state)
+
+    assert store.journal_path.stat().st_size == 0
+    assert JournalStore(tmp_storage_path).load().to_dict() == sample_state.to_dict()
+
+
+def test_journal_ignores_torn_last_record(sample_state: AppState, tmp_storage_path: Path):
+    store = JournalStore(tmp_storage_path)
+    store.compact(sample_state)
+    store.put_meta(sample_state)
+    store.close()
+
+    with store.journal_path.open("a", encoding="utf-8") as f:
+        f.write('{"op":"put","kind":"meta","da')
+
+    assert JournalStore(tmp_storage_path).load().to_dict() == sample_state.to_dict()
+
+
+def test_load_state_replays_journal_and_save_state_folds_it(sample_state: AppState, tmp_storage_path: Path):
+    store = JournalStore(tmp_storage_path)
+    store.compact(sample_state)
+    trip = sample_state.get_active_trip()
+    trip.packing_items[0].packed = True
+    store.put_item(trip.id, trip.packing_items[0])
+    store.close()
+
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+    assert load_state(tmp_storage_path, lazy=True).to_dict() == sample_state.to_dict()
+
+    # Полная запись из GUI делает журнал ненужным: старые записи не должны
+    # лечь поверх новых данных.
+    trip.packing_items[0].packed = False
+    save_state(sample_state, tmp_storage_path)
+    assert store.journal_path.stat().st_size == 0
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+    assert read_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+
+
+def test_journal_snapshot_appends_changes_and_compacts(sample_state: AppState, tmp_storage_path: Path):
+    save_state(sample_state, tmp_storage_path)
+    store = JournalStore(tmp_storage_path, compact_every=5)
+    store.track(sample_state)
+    assert store.snapshot(sample_state) == []
+
+    trip = sample_state.get_active_trip()
+    trip.update_packing_item(trip.packing_items[0].id, packed=True)
+    removed = trip.budget_items.pop(0)
+    records = store.snapshot(sample_state)
+    assert [(r["op"], r["kind"]) for r in records] == [("put", "packing"), ("del", "budget")]
+    assert records[1]["id"] == removed.id
+    store.write(records)
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+
+    sample_state.delete_trip(trip.id)
+    sample_state.theme = "light"
+    records = store.snapshot(sample_state)
+    # Записи об элементах удалённой поездки не нужны.
+    assert [(r["op"], r["kind"]) for r in records] == [("put", "meta"), ("del", "trip")]
+    store.write(records)
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+
+    sample_state.theme = "dark"
+    store.write(store.snapshot(sample_state))
+    assert store.journal_path.stat().st_size == 0
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+    store.close()
+
+
+def test_journal_snapshot_is_written_in_full_first(sample_state: AppState, tmp_storage_path: Path):
+    store = JournalStore(tmp_storage_path)
+    store.track(sample_state)
+    store.write(store.snapshot(sample_state))
+    store.close()
+
+    assert tmp_storage_path.exists()
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+
+
+def test_journal_snapshot_encodes_only_changed_trips(monkeypatch, sample_state: AppState, tmp_storage_path: Path):
+    other = new_trip("Other", "Oslo", date(2025, 3, 1), date(2025, 3, 4))
+    sample_state.add_trip(other)
+    save_state(sample_state, tmp_storage_path)
+    store = JournalStore(tmp_storage_path, compact_every=100)
+    store.track(sample_state)
+
+    to_dict = Trip.to_dict
+
+    def untouched_only(trip):
+        raise AssertionError(f"{trip.title} was serialised whole")
+
+    monkeypatch.setattr(Trip, "to_dict", untouched_only)
+    trip = sample_state.trips[0]
+    trip.title = "Renamed"
+    trip.update_budget_item(trip.budget_items[0].id, cost=5.0)
+    records = store.snapshot(sample_state)
+    assert [(r["op"], r["kind"]) for r in records] == [("put", "trip"), ("put", "budget")]
+    store.write(records)
+    monkeypatch.setattr(Trip, "to_dict", to_dict)
+
+    # Новая поездка пишется целиком, замена всего списка - полным снимком.
+    added = new_trip("Added", "Rome", date(2025, 4, 1), date(2025, 4, 2))
+    added.packing_items.append(PackingItem(id="p1", item_name="Hat", category="Clothes"))
+    sample_state.add_trip(added)
+    store.write(store.snapshot(sample_state))
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+
+    sample_state.trips = [sample_state.trips[-1]]
+    snapshot = store.snapshot(sample_state)
+    assert isinstance(snapshot, JsonSnapshot)
+    store.write(snapshot)
+    assert load_state(tmp_storage_path).to_dict() == sample_state.to_dict()
+    store.close()
@@ -0,0 +1,35 @@
+import io
+import json
+
+import pytest
+
+from travel_planner.json_stream import iter_members
+
+
+def members(text, chunk):
+    fh = io.StringIO(text)
+    read = fh.read
+    fh.read = lambda size=-1: read(min(size, chunk))
+    return list(iter_members(fh, "trips"))
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 1 << 20])
+def test_iter_members_streams_array_across_chunk_boundaries(chunk):
+    doc = {"theme": "dark", "trips": [{"id": "a", "n": 12345}, [], {"id": "b"}], "count": 1234567, "x": None}
+    result = members(json.dumps(doc, indent=2), chunk)
+    assert result == [
+        ("theme", "dark"),
+        ("trips", {"id": "a", "n": 12345}),
+        ("trips", []),
+        ("trips", {"id": "b"}),
+        ("count", 1234567),
+        ("x", None),
+    ]
+    assert members('{"trips": []}', chunk) == []
+    assert members("{}", chunk) == []
+
+
+@pytest.mark.parametrize("text", ['{"trips": [', '{"trips": [{"id": 1}', '{"trips": [] "x": 1}', "{} []"])
+def test_iter_members_rejects_broken_documents(text):
+    with pytest.raises(ValueError):
+        members(text, 4)
@@ -1,8 +1,14 @@
+import subprocess
+import sys
+import threading
+from datetime import date
 from pathlib import Path
 from PyQt6.QtWidgets import QMainWindow
 
+from travel_planner import state_loader
 from travel_planner.main_window import MainWindow
-from travel_planner.models import AppState
+from travel_planner.models import AppState, new_trip
+from travel_planner.storage import iter_trips, save_state
 from travel_planner.pages.dashboard_page import DashboardPage
 from travel_planner.pages.itinerary_page import ItineraryPage
 from travel_planner.pages.trips_page import TripsPage
@@ -20,12 +26,22 @@ def test_mainwindow_smoke(qtbot, sample_state: AppState, tmp_storage_path: Path)
 
     assert win.pages_stack.count() == 6
 
-    assert isinstance(win.pages_stack.widget(0), DashboardPage)
-    assert isinstance(win.pages_stack.widget(1), ItineraryPage)
-    assert isinstance(win.pages_stack.widget(2), TripsPage)
-    assert isinstance(win.pages_stack.widget(3), BudgetPage)
-    assert isinstance(win.pages_stack.widget(4), PackingPage)
-    assert isinstance(win.pages_stack.widget(5), SettingsPage)
+    # Создана только видимая страница, остальные - при первом переходе.
+    assert win.is_page_created("dashboard")
+    assert not any(win.is_page_created(key) for key in ("itinerary", "trips", "budget", "packing", "settings"))
+
+    assert isinstance(win.page("dashboard"), DashboardPage)
+    assert isinstance(win.page("itinerary"), ItineraryPage)
+    assert isinstance(win.page("trips"), TripsPage)
+    assert isinstance(win.page("budget"), BudgetPage)
+    assert isinstance(win.page("packing"), PackingPage)
+    assert isinstance(win.page("settings"), SettingsPage)
+    assert win.pages_stack.count() == 6
+    for key, idx in win.page_key_to_index.items():
+        assert win.pages_stack.widget(idx) is win.page(key)
+
+    win.handle_navigation("budget")
+    assert win.pages_stack.currentWidget() is win.page("budget")
 
     assert win.sidebar is not None
 
@@ -38,3 +54,110 @@ def test_mainwindow_smoke(qtbot, sample_state: AppState, tmp_storage_path: Path)
         assert win.open_packing_btn.isEnabled()
     else:
         assert "No trip selected" in win.header_trip_title_lbl.text()
+
+
+def _gated_iter_trips(gate: threading.Event):
+    # Отдаёт первую поездку сразу, остальные - после gate.set().
+    def gated(*args, **kwargs):
+        for i, trip in enumerate(iter_trips(*args, **kwargs)):
+            if i == 1:
+                gate.wait(5)
+            yield trip
+    return gated
+
+
+def test_mainwindow_loads_trips_in_background(qtbot, monkeypatch, sample_state: AppState, tmp_storage_path: Path):
+    gate = threading.Event()
+    monkeypatch.setattr(state_loader, "BATCH_MS", 0)
+    monkeypatch.setattr(state_loader, "iter_trips", _gated_iter_trips(gate))
+    active_id = sample_state.active_trip_id
+    for title in ("Second", "Third"):
+        sample_state.add_trip(new_trip(title, "Somewhere", date(2025, 1, 1), date(2025, 1, 3)))
+    sample_state.set_active_trip(active_id)
+    sample_state.theme = "light"
+    save_state(sample_state, tmp_storage_path)
+    saved = tmp_storage_path.read_bytes()
+
+    win = MainWindow(AppState(), tmp_storage_path, autosave_delay_ms=0)
+    qtbot.addWidget(win)
+    win.load_in_background(stream=True)
+    assert win.is_loading()
+    assert win.cancel_load_btn.isVisibleTo(win)
+    qtbot.waitUntil(lambda: len(win.state.trips) == 1)
+    assert win.state.theme == "light"
+
+    # Неполное состояние не должно попасть на диск.
+    win.state_changed()
+    win.force_save()
+    assert tmp_storage_path.read_bytes() == saved
+
+    gate.set()
+    qtbot.waitUntil(lambda: not win.is_loading())
+    win.autosave.wait()
+    assert win.state.to_dict() == sample_state.to_dict()
+    assert not win.autosave.is_held()
+    assert not win.cancel_load_btn.isVisibleTo(win)
+    assert sample_state.get_active_trip().title in win.header_trip_title_lbl.text()
+
+
+def test_mainwindow_background_load_reports_corrupt_file(qtbot, tmp_storage_path: Path):
+    tmp_storage_path.write_text('{"trips": [', encoding="utf-8")
+
+    win = MainWindow(AppState(), tmp_storage_path, autosave_delay_ms=0)
+    qtbot.addWidget(win)
+    with qtbot.waitSignal(win.loader.failed, timeout=2000):
+        win.load_in_background()
+
+    assert not win.is_loading()
+    assert win.load_error
+    assert win.retry_load_btn.isVisibleTo(win)
+    win.state_changed()
+    win.force_save()
+    assert tmp_storage_path.read_text(encoding="utf-8") == '{"trips": ['
+
+
+def test_mainwindow_background_load_can_be_cancelled(qtbot, monkeypatch, sample_state: AppState, tmp_storage_path: Path):
+    gate = threading.Event()
+    monkeypatch.setattr(state_loader, "BATCH_MS", 0)
+    monkeypatch.setattr(state_loader, "iter_trips", _gated_iter_trips(gate))
+    sample_state.add_trip(new_trip("Second", "Somewhere", date(2025, 1, 1), date(2025, 1, 3)))
+    save_state(sample_state, tmp_storage_path)
+
+    win = MainWindow(AppState(), tmp_storage_path)
+    qtbot.addWidget(win)
+    win.load_in_background(stream=True)
+    qtbot.waitUntil(lambda: len(win.state.trips) == 1)
+    win.cancel_loading()
+    gate.set()
+    win.loader.wait()
+    qtbot.wait(20)
+
+    assert not win.is_loading()
+    assert len(win.state.trips) == 1
+    assert win.autosave.is_held()
+
+    with qtbot.waitSignal(win.loader.finished, timeout=2000):
+        win.retry_loading()
+    assert win.state.to_dict() == sample_state.to_dict()
+
+
+def test_mainwindow_import_defers_pages_and_dialogs():
+    code = (
+        "import sys, travel_planner.main_window; "
+        "print(sorted(m for m in sys.modules if m.startswith(('travel_planner.pages.', 'travel_planner.dialogs'))))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parents[1]).stdout
+    assert out.strip() == "[]"
+
+
+def test_item_pages_import_dialogs_on_first_use():
+    code = (
+        "import sys; "
+        "import travel_planner.pages.budget_page, travel_planner.pages.itinerary_page, "
+        "travel_planner.pages.packing_page; "
+        "print('travel_planner.dialogs' in sys.modules)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parents[1]).stdout
+    assert out.strip() == "False"
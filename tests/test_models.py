@@ -86,3 +86,192 @@ def test_activityitem_roundtrip():
     assert restored.title == "Museum"
     assert restored.location == "City Museum"
     assert restored.notes == "Tickets in email"
+
+
+def test_lazy_appstate_loads_children_on_first_access(sample_state: AppState):
+    d = sample_state.to_dict()
+    lazy = AppState.from_dict(d, lazy=True)
+
+    trip = lazy.trips[0]
+    assert not trip.is_loaded()
+    assert trip.title == sample_state.trips[0].title
+    assert lazy.to_dict() == d
+    assert not trip.is_loaded()
+
+    assert trip.total_budget() == sample_state.trips[0].total_budget()
+    assert trip.is_loaded()
+    assert trip == sample_state.trips[0]
+    assert lazy.to_dict() == d
+
+
+def test_id_indexes_follow_list_mutations(sample_state: AppState):
+    trip = sample_state.get_active_trip()
+    assert sample_state.get_trip_by_id(trip.id) is trip
+
+    extra = BudgetItem(id="b-extra", category="Food", description="Lunch", cost=12.0)
+    trip.budget_items.append(extra)
+    assert trip.budget_items.get("b-extra") is extra
+
+    first = trip.budget_items[0]
+    assert trip.budget_items.remove_id(first.id) is first
+    assert trip.budget_items.get(first.id) is None
+    assert first not in trip.budget_items
+
+    trip.budget_items = [extra]
+    assert trip.budget_items.get("b-extra") is extra
+    assert trip.budget_items.ids() == ["b-extra"]
+
+    sample_state.delete_trip(trip.id)
+    assert sample_state.get_trip_by_id(trip.id) is None
+    assert sample_state.trips == []
+
+
+def test_budget_totals_are_maintained_incrementally():
+    t = new_trip("Totals", "Somewhere", date(2025, 1, 10), date(2025, 1, 12))
+    t.budget_items.append(BudgetItem(id="a", category="Hotel", description="", cost=200.0, paid=False))
+    assert t.total_budget() == 200.0
+
+    t.budget_items.append(BudgetItem(id="b", category="Food", description="", cost=50.0, paid=True))
+    t.budget_items.append(BudgetItem(id="c", category="Food", description="", cost=25.0, paid=False))
+    assert t.budget_by_category() == {"Hotel": 200.0, "Food": 75.0}
+    assert t.total_paid() == 50.0
+
+    t.update_budget_item("c", paid=True, cost=30.0)
+    t.update_budget_item("a", category="Stay")
+    t.budget_items.remove_id("b")
+    assert t.total_budget() == 230.0
+    assert t.total_paid() == 30.0
+    assert t.total_remaining() == 200.0
+    assert t.budget_by_category() == {"Stay": 200.0, "Food": 30.0}
+    assert t.check_budget_totals()
+
+    t.budget_items[0].cost = 1.0
+    assert not t.check_budget_totals()
+    t.invalidate_budget_totals()
+    assert t.check_budget_totals()
+    assert t.total_budget() == 31.0
+
+
+def test_activity_order_index_tracks_mutations():
+    from datetime import datetime
+    from travel_planner.models import activity_sort_key
+
+    t = new_trip("Order", "Somewhere", date(2025, 1, 10), date(2025, 1, 12))
+
+    def act(item_id, day, time):
+        return ActivityItem(id=item_id, day=date(2025, 1, day), time=time, title=item_id, location="")
+
+    t.activities.extend([act("b", 11, "09:00"), act("a", 10, "18:30")])
+    assert [a.id for a in t.activities.sorted_items()] == ["a", "b"]
+
+    t.activities.append(act("c", 10, "07:15"))
+    t.activities.insert(0, act("d", 11, "bad"))
+    t.update_activity("b", time="23:00")
+    t.activities.remove_id("a")
+    ordered = t.activities.sorted_items()
+    assert [a.id for a in ordered] == ["c", "b", "d"]
+    assert ordered == sorted(t.activities, key=activity_sort_key)
+
+    assert t.upcoming_activity(date(2025, 1, 11)).id == "b"
+    assert t.upcoming_activity(datetime(2025, 1, 10, 7, 15)).id == "c"
+    assert t.upcoming_activity(datetime(2025, 1, 10, 7, 16)).id == "b"
+    assert t.upcoming_activity(date(2025, 2, 1)).id == "c"
+
+
+def test_activity_time_is_parsed_once_and_kept_for_display():
+    act = ActivityItem.from_dict({"id": "x", "day": "2025-01-10", "time": " 9:05 ", "title": "T", "location": ""})
+    assert act.minute == 9 * 60 + 5
+    assert act.to_dict()["time"] == " 9:05 "
+
+    later = ActivityItem(id="y", day=date(2025, 1, 10), time="late", title="T", location="")
+    assert later.minute is None
+    assert later.sort_key > act.sort_key
+
+    later.time = "08:00"
+    assert later.minute == 480 and later.sort_key < act.sort_key
+    later.day = date(2025, 1, 11)
+    assert later.sort_key > act.sort_key
+
+    legacy = ActivityItem.from_dict({"id": "z", "day": "2025-01-10", "time": None, "title": "T", "location": ""})
+    assert legacy.time == "" and legacy.minute is None
+    assert ActivityItem.from_dict(legacy.to_dict()) == legacy
+    assert ActivityItem(id="w", day=date(2025, 1, 10), time="25:00", title="", location="").minute is None
+
+
+def test_models_are_slotted_and_share_repeated_values():
+    import copy
+    import pickle
+
+    data = create_sample_state().to_dict()
+    trip_data = data["trips"][0]
+    trip_data["packing_items"].append(dict(trip_data["packing_items"][0], id="copy"))
+    # Строки из разных мест JSON - разные объекты.
+    trip_data["packing_items"][1]["category"] = "".join(["Docu", "ments"])
+    trip = Trip.from_dict(trip_data)
+
+    first, second = trip.packing_items[0], trip.packing_items.get("copy")
+    for obj in (trip, first, trip.budget_items[0]):
+        assert not hasattr(obj, "__dict__")
+    assert first.category is second.category
+    assert first.place is second.place
+
+    lazy = Trip.from_dict(trip_data, lazy=True)
+    assert pickle.loads(pickle.dumps(lazy)).to_dict() == trip.to_dict()
+    assert copy.deepcopy(trip) == trip
+
+
+def test_null_shared_fields_load_as_defaults():
+    data = create_sample_state().to_dict()
+    trip_data = data["trips"][0]
+    trip_data["activities"][0]["location"] = None
+    trip_data["budget_items"][0]["category"] = None
+    trip_data["packing_items"][0].update(category=None, place=None)
+
+    trip = AppState.from_dict(data).trips[0]
+    assert trip.activities.get(trip_data["activities"][0]["id"]).location == ""
+    assert trip.budget_items[0].category == ""
+    assert (trip.packing_items[0].category, trip.packing_items[0].place) == ("", "Carry-on")
+
+
+def test_change_log_records_mutations_after_tracking(sample_state: AppState):
+    trip = sample_state.trips[0]
+    trip.title = "Before tracking"
+    changes = sample_state.track_changes()
+    assert not changes
+
+    trip.notes = "Changed"
+    trip.update_packing_item(trip.packing_items[0].id, packed=True)
+    removed = trip.budget_items.pop(0)
+    sample_state.theme = "light"
+    taken = sample_state.take_changes()
+
+    assert taken.meta and not taken.everything
+    assert taken.trips == {trip.id: False}
+    assert set(taken.items[trip.id]) == {"packing_items", "budget_items"}
+    assert removed.id in taken.items[trip.id]["budget_items"]
+    assert not sample_state.take_changes()
+
+    extra = new_trip("Extra", "Oslo", date(2025, 1, 1), date(2025, 1, 2))
+    sample_state.add_trip(extra)
+    sample_state.delete_trip(trip.id)
+    trip.title = "Detached"
+    taken = sample_state.take_changes()
+    assert taken.trips[extra.id] is True
+    assert taken.removed == {trip.id}
+    assert trip.id not in taken.trips
+
+    sample_state.trips = list(sample_state.trips)
+    assert sample_state.take_changes().everything
+
+
+def test_change_log_ignores_lazy_loading_and_tracks_list_replacement(sample_state: AppState):
+    state = AppState.from_dict(sample_state.to_dict(), lazy=True)
+    state.track_changes()
+    trip = state.trips[0]
+    old_ids = trip.to_dict()["activities"]
+    assert len(trip.activities) == len(old_ids)
+    assert not state.take_changes()
+
+    trip.activities = []
+    touched = state.take_changes().items[trip.id]["activities"]
+    assert set(touched) == {a["id"] for a in old_ids}
@@ -0,0 +1,46 @@
+from PyQt6.QtCore import Qt
+
+from travel_planner.item_models import PackingTableModel
+from travel_planner.models import AppState
+from travel_planner.pages.packing_page import ALL_CATEGORIES, ALL_PLACES, PackingPage
+
+
+def test_category_edit_updates_filter(qtbot, sample_state: AppState):
+    page = PackingPage(sample_state)
+    qtbot.addWidget(page)
+    page.refresh()
+    trip = sample_state.get_active_trip()
+    old = trip.packing_items[0].category
+    others = {p.category for p in trip.packing_items[1:]}
+
+    index = page.model.index(0, PackingTableModel.COL_CATEGORY)
+    assert page.model.setData(index, "Snorkelling")
+
+    filters = [page.category_filter.itemText(i) for i in range(page.category_filter.count())]
+    assert filters[0] == ALL_CATEGORIES
+    assert "Snorkelling" in filters
+    assert (old in filters) == (old in others)
+
+
+def test_place_filter_options_come_from_data(qtbot, monkeypatch, sample_state: AppState):
+    page = PackingPage(sample_state)
+    qtbot.addWidget(page)
+    page.refresh()
+
+    def options():
+        return [page.place_filter.itemText(i) for i in range(page.place_filter.count())]
+
+    places = sorted({p.place for p in sample_state.get_active_trip().packing_items})
+    assert options() == [ALL_PLACES] + places
+
+    assert page.model.setData(page.model.index(0, PackingTableModel.COL_PLACE), "Backpack")
+    assert "Backpack" in options()
+    page.place_filter.setCurrentText("Backpack")
+    assert page.proxy.rowCount() == 1
+
+    # Галочка "упаковано" пункты фильтров не пересчитывает.
+    rebuilds = []
+    monkeypatch.setattr(page, "update_filter_options", lambda: rebuilds.append(1))
+    packed = page.model.index(1, PackingTableModel.COL_PACKED)
+    assert page.model.setData(packed, 2, Qt.ItemDataRole.CheckStateRole)
+    assert rebuilds == []
@@ -0,0 +1,96 @@
+from datetime import date
+from pathlib import Path
+from uuid import uuid4
+
+from travel_planner.models import AppState, BudgetItem, Trip, new_trip
+from travel_planner.sqlite_storage import SqliteStore, SqliteSync, import_json, export_json
+from travel_planner.storage import save_state, load_state
+
+
+def test_sqlite_roundtrip_via_storage(sample_state: AppState, tmp_path: Path):
+    db = tmp_path / "travel_data.db"
+    save_state(sample_state, db)
+    assert load_state(db).to_dict() == sample_state.to_dict()
+
+
+def test_sqlite_single_item_updates(sample_state: AppState, tmp_path: Path):
+    store = SqliteStore(tmp_path / "travel_data.db")
+    store.save(sample_state)
+
+    trip = sample_state.get_active_trip()
+    first = trip.budget_items[0]
+    first.cost = 999.0
+    store.upsert_item(trip.id, first)
+
+    extra = BudgetItem(id=str(uuid4()), category="Food", description="Dinner", cost=45.5)
+    trip.budget_items.append(extra)
+    store.upsert_item(trip.id, extra)
+
+    removed = trip.packing_items.pop(1)
+    store.delete_item(trip.id, "packing_items", removed.id)
+
+    trip.title = "Renamed"
+    store.upsert_trip(trip)
+
+    assert store.load().to_dict() == sample_state.to_dict()
+
+
+def test_json_import_export_is_lossless(sample_state: AppState, tmp_path: Path):
+    src = tmp_path / "in.json"
+    db = tmp_path / "data.db"
+    dst = tmp_path / "out.json"
+    save_state(sample_state, src)
+
+    import_json(src, db)
+    export_json(db, dst)
+
+    assert dst.read_text(encoding="utf-8") == src.read_text(encoding="utf-8")
+
+
+def test_autosave_updates_only_changed_rows(qtbot, monkeypatch, sample_state: AppState, tmp_path: Path):
+    from travel_planner.autosave import AutosaveScheduler
+
+    db = tmp_path / "travel_data.db"
+    saver = AutosaveScheduler(sample_state, db)
+    saver.save_now()
+    assert load_state(db).to_dict() == sample_state.to_dict()
+
+    def full_rewrite(self, data):
+        raise AssertionError("full rewrite")
+
+    monkeypatch.setattr(SqliteStore, "save_data", full_rewrite)
+    trip = sample_state.get_active_trip()
+    trip.update_budget_item(trip.budget_items[0].id, cost=999.0)
+    trip.packing_items.pop(1)
+    trip.budget_items.append(BudgetItem(id=str(uuid4()), category="Food", description="Dinner", cost=45.5))
+    trip.title = "Renamed"
+    saver.save_now()
+    saver.shutdown()
+
+    assert load_state(db).to_dict() == sample_state.to_dict()
+
+
+def test_sqlite_sync_writes_only_logged_changes(monkeypatch, sample_state: AppState, tmp_path: Path):
+    db = tmp_path / "travel_data.db"
+    sync = SqliteSync(db)
+    sync.track(sample_state)
+    full = sync.snapshot(sample_state)
+    assert isinstance(full, tuple)
+    sync.write(full)
+
+    def whole_trip(trip):
+        raise AssertionError("untouched trip serialised")
+
+    monkeypatch.setattr(Trip, "to_dict", whole_trip)
+    trip = sample_state.get_active_trip()
+    trip.update_packing_item(trip.packing_items[0].id, quantity=7)
+    records = sync.snapshot(sample_state)
+    assert [(r["op"], r["kind"]) for r in records] == [("put", "packing")]
+    sync.write(records)
+    monkeypatch.undo()
+
+    added = new_trip("Added", "Rome", date(2025, 4, 1), date(2025, 4, 2))
+    sample_state.add_trip(added)
+    sample_state.delete_trip(trip.id)
+    sync.write(sync.snapshot(sample_state))
+    assert SqliteStore(db).load().to_dict() == sample_state.to_dict()
@@ -0,0 +1,22 @@
+from PyQt6.QtWidgets import QLabel
+
+from travel_planner.startup_timing import FirstPaintWatcher, StartupTimer
+
+
+def test_startup_timer_reports_stage_durations():
+    timer = StartupTimer(started_at=0.0)
+    timer.marks = [("imports", 0.1), ("main window", 0.25)]
+
+    assert [(label, round(ms)) for label, ms in timer.durations()] == [("imports", 100), ("main window", 150)]
+    assert "total" in timer.report() and "250.0" in timer.report()
+
+
+def test_first_paint_watcher_fires_once(qtbot):
+    calls = []
+    watcher = FirstPaintWatcher(lambda: calls.append(1))
+    label = QLabel("hello")
+    qtbot.addWidget(label)
+    label.show()
+    qtbot.waitUntil(lambda: bool(calls))
+    label.repaint()
+    assert calls == [1]
@@ -1,4 +1,6 @@
-from travel_planner.storage import save_state, load_state
+import json
+
+from travel_planner.storage import iter_trips, save_state, load_state, state_snapshot, write_snapshot
 from travel_planner.models import AppState
 from pathlib import Path
 
@@ -11,3 +13,92 @@ def test_save_and_load_roundtrip(sample_state: AppState, tmp_storage_path: Path)
     assert isinstance(loaded, AppState)
 
     assert loaded.to_dict() == sample_state.to_dict()
+
+
+def test_save_keeps_rotating_backups(sample_state: AppState, tmp_storage_path: Path):
+    for theme in ("dark", "light", "dark", "light"):
+        sample_state.theme = theme
+        save_state(sample_state, tmp_storage_path, backups=2)
+
+    assert load_state(tmp_storage_path).theme == "light"
+    assert load_state(tmp_storage_path.with_name(tmp_storage_path.name + ".1")).theme == "dark"
+    assert tmp_storage_path.with_name(tmp_storage_path.name + ".2").exists()
+    assert not tmp_storage_path.with_name(tmp_storage_path.name + ".3").exists()
+    assert not list(tmp_storage_path.parent.glob("*.tmp"))
+
+
+def test_load_falls_back_to_newest_valid_backup(sample_state: AppState, tmp_storage_path: Path):
+    save_state(sample_state, tmp_storage_path)
+    sample_state.theme = "light"
+    save_state(sample_state, tmp_storage_path)
+
+    tmp_storage_path.write_text('{"trips": [', encoding="utf-8")
+
+    loaded = load_state(tmp_storage_path)
+    assert loaded.theme == "dark"
+    assert loaded.active_trip_id == sample_state.active_trip_id
+
+
+def test_iter_trips_streams_compact_and_pretty_files(sample_state: AppState, tmp_storage_path: Path):
+    for pretty in (False, True):
+        save_state(sample_state, tmp_storage_path, pretty=pretty)
+        meta = {}
+        trips = list(iter_trips(tmp_storage_path, meta))
+        assert [t.to_dict() for t in trips] == [t.to_dict() for t in sample_state.trips]
+        assert meta == {"active_trip_id": sample_state.active_trip_id, "theme": sample_state.theme}
+        assert load_state(tmp_storage_path, stream=True).to_dict() == sample_state.to_dict()
+
+
+def test_streaming_load_falls_back_to_backup(sample_state: AppState, tmp_storage_path: Path):
+    save_state(sample_state, tmp_storage_path)
+    save_state(sample_state, tmp_storage_path)
+    data = tmp_storage_path.read_bytes()
+    tmp_storage_path.write_bytes(data[: len(data) // 2])
+
+    assert load_state(tmp_storage_path, stream=True).to_dict() == sample_state.to_dict()
+
+
+def test_lazy_load_falls_back_on_bad_child_records(sample_state: AppState, tmp_storage_path: Path):
+    save_state(sample_state, tmp_storage_path, snapshot=False)
+    data = sample_state.to_dict()
+    data["trips"][0]["activities"][0]["day"] = "not a date"
+    save_state(sample_state, tmp_storage_path, snapshot=False)
+    tmp_storage_path.write_text(json.dumps(data), encoding="utf-8")
+
+    for stream in (False, True):
+        loaded = load_state(tmp_storage_path, lazy=True, stream=stream)
+        assert loaded.to_dict() == sample_state.to_dict()
+
+
+def test_live_file_exists_throughout_save(monkeypatch, sample_state: AppState, tmp_storage_path: Path):
+    import os
+
+    save_state(sample_state, tmp_storage_path)
+    replace = os.replace
+    seen = []
+
+    def checked_replace(src, dst):
+        seen.append(tmp_storage_path.exists())
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", checked_replace)
+    sample_state.theme = "light"
+    save_state(sample_state, tmp_storage_path, snapshot=False)
+
+    assert seen and all(seen)
+    assert load_state(tmp_storage_path).theme == "light"
+    assert load_state(tmp_storage_path.with_name(tmp_storage_path.name + ".1")).theme == "dark"
+
+
+def test_state_snapshot_is_unaffected_by_later_edits(sample_state: AppState, tmp_storage_path: Path):
+    expected = sample_state.to_dict()
+    snapshot = state_snapshot(sample_state, tmp_storage_path)
+
+    trip = sample_state.trips[0]
+    trip.title = "Changed"
+    trip.budget_items[0].cost = 1234.0
+    trip.packing_items.pop()
+    write_snapshot(snapshot, tmp_storage_path)
+
+    assert json.loads(tmp_storage_path.read_text(encoding="utf-8")) == expected
+    assert load_state(tmp_storage_path).to_dict() == expected
@@ -0,0 +1,80 @@
+from PyQt6.QtGui import QPalette
+from PyQt6.QtWidgets import QApplication
+
+from travel_planner.main_window import MainWindow
+from travel_planner.style import (
+    THEME_COLORS,
+    apply_theme,
+    available_themes,
+    current_theme,
+    theme_palette,
+    theme_stylesheet,
+)
+from travel_planner.widgets.itinerary_delegate import COLOR_ROLES as ITINERARY_ROLES
+from travel_planner.widgets.trip_card_delegate import COLOR_ROLES as TRIP_CARD_ROLES
+
+
+def test_stylesheets_are_built_once_per_theme():
+    assert available_themes() == ["dark", "light"]
+    for theme in available_themes():
+        sheet = theme_stylesheet(theme)
+        assert "$" not in sheet
+        assert THEME_COLORS[theme]["window"] in sheet
+        assert theme_stylesheet(theme) is sheet
+    assert theme_stylesheet("Light") is theme_stylesheet("light")
+    assert theme_stylesheet("unknown") is theme_stylesheet("dark")
+
+
+def test_delegate_colours_come_from_theme_colors():
+    for roles in (ITINERARY_ROLES, TRIP_CARD_ROLES):
+        for theme, colors in THEME_COLORS.items():
+            assert set(roles.values()) <= set(colors), theme
+
+
+def test_apply_theme_sets_palette_and_skips_current_theme(qtbot):
+    app = QApplication.instance()
+    apply_theme(app, "dark")
+    try:
+        assert apply_theme(app, "light")
+        assert current_theme() == "light"
+        assert app.styleSheet() == theme_stylesheet("light")
+        window = app.palette().color(QPalette.ColorRole.Window)
+        assert window == theme_palette("light").color(QPalette.ColorRole.Window)
+        assert window.lightness() > 128
+        assert not apply_theme(app, "light")
+    finally:
+        apply_theme(app, "dark")
+
+
+def test_theme_change_reaches_created_pages(qtbot, sample_state, tmp_storage_path):
+    app = QApplication.instance()
+    apply_theme(app, "dark")
+    win = MainWindow(sample_state, tmp_storage_path)
+    qtbot.addWidget(win)
+    itinerary = win.page("itinerary")
+    trips = win.page("trips")
+    win.handle_navigation("itinerary")
+    try:
+        win.on_theme_changed("light")
+        light = THEME_COLORS["light"]
+        assert itinerary.delegate.colors["day_bg"].name() == light[ITINERARY_ROLES["day_bg"]]
+        # Скрытая страница помечена и перекрашивается при показе.
+        assert win.bus.is_dirty(trips)
+        win.handle_navigation("trips")
+        assert trips.delegate.colors["card_bg"].name() == light[TRIP_CARD_ROLES["card_bg"]]
+        assert sample_state.theme == "light"
+    finally:
+        apply_theme(app, "dark")
+
+
+def test_sidebar_repolishes_only_changed_buttons(qtbot, sample_state, tmp_storage_path):
+    win = MainWindow(sample_state, tmp_storage_path)
+    qtbot.addWidget(win)
+    buttons = win.sidebar.nav_buttons
+    assert buttons["dashboard"].property("active") == "true"
+
+    win.handle_navigation("budget")
+    assert buttons["dashboard"].property("active") == "false"
+    assert buttons["budget"].property("active") == "true"
+    # Кнопки, которые ни разу не были активными, не трогаются.
+    assert buttons["packing"].property("active") is None
@@ -0,0 +1,156 @@
+from datetime import date
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtTest import QTest
+from PyQt6.QtWidgets import QStyleOptionViewItem
+
+from travel_planner.item_models import TripListModel
+from travel_planner.models import AppState, new_trip
+from travel_planner.pages.trips_page import TripsPage
+from travel_planner.search import TripSearchIndex
+
+
+def make_state(count: int) -> AppState:
+    state = AppState()
+    for i in range(count):
+        state.add_trip(new_trip(f"Trip {i}", "Rome" if i % 2 else "Lisbon", date(2025, 1, 1), date(2025, 1, 5)))
+    state.set_active_trip(state.trips[0].id)
+    return state
+
+
+def test_search_index_matches_word_prefixes_in_order():
+    state = make_state(6)
+    index = TripSearchIndex()
+    index.update(state.trips)
+
+    assert index.search("") is None
+    assert index.search("ro") == [t.id for t in state.trips[1::2]]
+    assert index.search("lis trip 4") == [state.trips[4].id]
+    assert index.search("oslo") == []
+
+    state.trips[4].destination = "Oslo"
+    state.delete_trip(state.trips[0].id)
+    index.update(state.trips)
+    assert index.search("oslo") == [state.trips[3].id]
+    assert index.search("lisbon") == [state.trips[1].id]
+
+
+
+def test_search_index_updates_only_listed_trips():
+    state = make_state(4)
+    index = TripSearchIndex()
+    index.update(state.trips)
+    revision = index.revision
+
+    index.update_ids([], state.get_trip_by_id)
+    assert index.revision == revision
+
+    state.trips[2].title = "Zurich trip"
+    removed = state.trips[0].id
+    state.delete_trip(removed)
+    added = new_trip("Oslo", "Norway", date(2025, 2, 1), date(2025, 2, 3))
+    state.add_trip(added)
+    index.update_ids([state.trips[1].id, removed, added.id], state.get_trip_by_id)
+
+    assert index.revision > revision
+    assert index.ids() == [t.id for t in state.trips]
+    assert index.search("zur") == [state.trips[1].id]
+    assert index.search("trip") == [t.id for t in state.trips[:3]]
+    assert index.search("norway") == [added.id]
+
+    fresh = TripSearchIndex()
+    fresh.update(state.trips)
+    for query in ("trip", "rome", "lisbon", "o"):
+        assert index.search(query) == fresh.search(query)
+
+
+def test_trip_list_model_fetches_rows_in_batches(qtbot):
+    state = make_state(TripListModel.FETCH_BATCH + 20)
+    model = TripListModel(state)
+    model.refresh()
+
+    assert model.rowCount() == TripListModel.FETCH_BATCH
+    assert model.canFetchMore()
+    model.fetchMore()
+    assert model.rowCount() == len(state.trips)
+    assert not model.canFetchMore()
+
+    model.set_filter("trip 119")
+    assert [model.trip_at(r).title for r in range(model.rowCount())] == ["Trip 119"]
+    model.set_filter("trip 11")
+    assert model.match_count() == 11
+
+
+def test_switching_active_trip_does_not_reset_model(qtbot):
+    state = make_state(5)
+    model = TripListModel(state)
+    model.refresh()
+    resets = []
+    model.modelReset.connect(lambda: resets.append(1))
+
+    state.set_active_trip(state.trips[3].id)
+    model.refresh()
+    assert resets == []
+
+    removed = state.trips[1].id
+    assert model.row_of(removed) == 1
+    state.delete_trip(removed)
+    model.refresh([removed])
+    assert resets == [1]
+    assert model.rowCount() == 4
+    assert model.row_of(removed) == -1
+    assert model.row_of(state.trips[3].id) == 3
+
+    # Изменённое название без смены состава не сбрасывает модель.
+    state.trips[0].title = "Renamed"
+    model.refresh([state.trips[0].id])
+    assert resets == [1]
+    model.set_filter("renamed")
+    assert model.match_count() == 1
+
+
+def test_card_buttons_emit_trip_actions(qtbot):
+    state = make_state(3)
+    page = TripsPage(state)
+    qtbot.addWidget(page)
+    page.resize(600, 600)
+    page.show()
+    qtbot.waitExposed(page)
+    page.refresh()
+
+    view = page.list_view
+    index = page.model.index(1, 0)
+    option = QStyleOptionViewItem()
+    option.initFrom(view)
+    option.rect = view.visualRect(index)
+    rects = {action: rect for action, _, rect in page.delegate.button_rects(option, is_active=False)}
+
+    with qtbot.waitSignal(page.makeActiveTripRequested) as blocker:
+        QTest.mouseClick(view.viewport(), Qt.MouseButton.LeftButton, pos=rects["select"].center())
+    assert blocker.args == [state.trips[1].id]
+
+    with qtbot.waitSignal(page.deleteTripRequested) as blocker:
+        QTest.mouseClick(view.viewport(), Qt.MouseButton.LeftButton, pos=rects["delete"].center())
+    assert blocker.args == [state.trips[1].id]
+
+
+def test_card_actions_from_keyboard(qtbot):
+    state = make_state(3)
+    page = TripsPage(state)
+    qtbot.addWidget(page)
+    page.refresh()
+    view = page.list_view
+    view.setCurrentIndex(page.model.index(0, 0))
+    QTest.keyClick(view, Qt.Key.Key_Down)
+
+    with qtbot.waitSignal(page.makeActiveTripRequested) as blocker:
+        QTest.keyClick(view, Qt.Key.Key_Return)
+    assert blocker.args == [state.trips[1].id]
+
+    with qtbot.waitSignal(page.editTripRequested) as blocker:
+        QTest.keyClick(view, Qt.Key.Key_F2)
+    assert blocker.args == [state.trips[1].id]
+
+    with qtbot.waitSignal(page.deleteTripRequested) as blocker:
+        QTest.keyClick(view, Qt.Key.Key_Delete)
+    assert blocker.args == [state.trips[1].id]
@@ -0,0 +1,8 @@
+import sys
+
+from .cli import main
+
+# Защита нужна рабочим процессам пакетных команд (spawn импортирует
+# этот модуль заново под другим именем).
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from time import monotonic
+from typing import Optional, Union
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .journal import JournalStore
+from .models import AppState
+from .sqlite_storage import SqliteSync, is_sqlite_path
+from .storage import state_snapshot, write_snapshot
+
+AUTOSAVE_DELAY_MS = 750
+AUTOSAVE_MAX_WAIT_MS = 5000
+
+
+class AutosaveScheduler(QObject):
+    saved = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        state: AppState,
+        storage_path: Path,
+        delay_ms: int = AUTOSAVE_DELAY_MS,
+        max_wait_ms: int = AUTOSAVE_MAX_WAIT_MS,
+        journal: Optional[JournalStore] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.state = state
+        self.storage_path = storage_path
+        self.max_wait_ms = max_wait_ms
+        # С журналом на диск дописываются только изменения (полный снимок -
+        # раз в journal.compact_every записей), в SQLite меняются только
+        # изменённые строки. Без них JSON каждый раз пишется целиком.
+        self.sync: Optional[Union[JournalStore, SqliteSync]] = journal
+        if self.sync is None and is_sqlite_path(storage_path):
+            self.sync = SqliteSync(storage_path)
+        if self.sync is not None:
+            self.sync.track(state)
+
+        # Счётчики для диагностики: сколько раз просили сохранить,
+        # сколько реально записали и сколько запросов слилось в одну запись.
+        self.request_count = 0
+        self.save_count = 0
+        self.coalesced_count = 0
+
+        self._pending = False
+        self._held = False
+        self._first_request_at = 0.0
+        self._future: Optional[Future] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._write_pending)
+
+    @property
+    def delay_ms(self) -> int:
+        return self._timer.interval()
+
+    def set_delay_ms(self, delay_ms: int) -> None:
+        self._timer.setInterval(delay_ms)
+
+    def has_pending(self) -> bool:
+        return self._pending
+
+    def hold(self) -> None:
+        # Пока состояние загружено не полностью, запись на диск откладывается:
+        # иначе неполный список поездок перезаписал бы файл.
+        self._held = True
+        self._timer.stop()
+
+    def release(self) -> None:
+        self._held = False
+        if self.sync is not None:
+            # Загруженное состояние совпадает с диском; правки, сделанные
+            # во время загрузки, уходят полной записью.
+            pending = self._pending
+            self.sync.track(self.state)
+            if pending:
+                self.sync.request_compaction()
+        if self._pending:
+            self._write_pending()
+
+    def is_held(self) -> bool:
+        return self._held
+
+    def schedule(self) -> None:
+        self.request_count += 1
+        now = monotonic()
+        if self._pending:
+            self.coalesced_count += 1
+            waited_ms = (now - self._first_request_at) * 1000
+            if waited_ms >= self.max_wait_ms:
+                self._write_pending()
+                return
+        else:
+            self._pending = True
+            self._first_request_at = now
+        self._timer.start()
+
+    def save_now(self) -> None:
+        self._pending = True
+        self.flush()
+
+    def flush(self) -> None:
+        self._timer.stop()
+        self._write_pending()
+        self.wait()
+
+    def wait(self) -> None:
+        if self._future is not None:
+            self._future.exception()
+
+    def shutdown(self) -> None:
+        self.flush()
+        self._executor.shutdown(wait=True)
+        if self.sync is not None:
+            self.sync.close()
+
+    def _write_pending(self) -> None:
+        self._timer.stop()
+        if not self._pending or self._held:
+            return
+        self._pending = False
+        # Снимок делается в GUI-потоке, поэтому он согласован (для JSON это
+        # плоские кортежи по поездкам); кодирование и запись на диск уходят
+        # в фоновый поток.
+        self.save_count += 1
+        if self.sync is not None:
+            self._future = self._executor.submit(self.sync.write, self.sync.snapshot(self.state))
+        else:
+            snapshot = state_snapshot(self.state, self.storage_path)
+            self._future = self._executor.submit(write_snapshot, snapshot, self.storage_path)
+        self._future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: Future) -> None:
+        exc = future.exception()
+        if exc is None:
+            self.saved.emit()
+        else:
+            self.failed.emit(str(exc))
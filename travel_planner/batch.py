@@ -0,0 +1,274 @@
+from __future__ import annotations
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .journal import JournalStore
+from .models import AppState, Trip
+from .sqlite_storage import SqliteStore, is_sqlite_path
+from .storage import BACKUP_GENERATIONS, journal_path_for, load_state, save_state
+
+# Пакетная обработка множества файлов данных (по файлу на пользователя):
+# операция над одним файлом выполняется порциями в пуле процессов, в
+# родитель возвращаются только небольшие результаты, а не AppState.
+
+# Ошибки одного файла: попадают в отчёт, обработка остальных продолжается.
+# AttributeError - JSON верного синтаксиса, но не той структуры (например, список).
+FILE_ERRORS = (OSError, ValueError, KeyError, TypeError, AttributeError, sqlite3.DatabaseError)
+
+# Порций на процесс до его перезапуска: память, накопленная за тысячи
+# разобранных файлов, возвращается системе.
+MAX_CHUNKS_PER_WORKER = 32
+# Порций в работе на процесс: родитель не ставит в очередь весь список сразу.
+CHUNKS_IN_FLIGHT = 2
+MAX_CHUNK_SIZE = 64
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class FileError(NamedTuple):
+    path: Path
+    error: str
+    message: str
+
+
+@dataclass
+class BatchReport:
+    # Результаты и ошибки в порядке входного списка файлов.
+    results: List[Tuple[Path, Any]] = field(default_factory=list)
+    errors: List[FileError] = field(default_factory=list)
+    seconds: float = 0.0
+    workers: int = 1
+    chunk_size: int = 1
+
+    @property
+    def files(self) -> int:
+        return len(self.results) + len(self.errors)
+
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+
+def read_state(p: Path, lazy: bool = False) -> AppState:
+    # Без тихого отката на резервные поколения и без демо-поездки:
+    # о повреждённом или отсутствующем файле нужно сообщить.
+    # Непустой журнал load_state() применяет поверх снимка.
+    if not p.exists():
+        raise FileNotFoundError(f"{p}: no such file")
+    return load_state(p, backups=0, lazy=lazy)
+
+
+def trip_summary(trip: Trip) -> Dict[str, Any]:
+    totals = trip.budget_totals()
+    return {
+        "id": trip.id,
+        "title": trip.title,
+        "destination": trip.destination,
+        "start_date": trip.start_date.isoformat(),
+        "end_date": trip.end_date.isoformat(),
+        "activities": len(trip.activities),
+        "budget_items": len(trip.budget_items),
+        "packing_items": len(trip.packing_items),
+        "packed": sum(1 for p in trip.packing_items if p.packed),
+        "budget_total": totals.total,
+        "budget_paid": totals.paid,
+        "budget_by_category": dict(totals.by_category),
+    }
+
+
+def validate_state(state: AppState) -> List[str]:
+    problems: List[str] = []
+    seen_trips = set()
+    for trip in state.trips:
+        label = f"trip {trip.id}"
+        if trip.id in seen_trips:
+            problems.append(f"{label}: duplicate trip id")
+        seen_trips.add(trip.id)
+        if trip.end_date < trip.start_date:
+            problems.append(f"{label}: ends before it starts")
+        for kind, items in (
+            ("activity", trip.activities),
+            ("budget item", trip.budget_items),
+            ("packing item", trip.packing_items),
+        ):
+            ids = set()
+            for item in items:
+                if item.id in ids:
+                    problems.append(f"{label}: duplicate {kind} id {item.id}")
+                ids.add(item.id)
+        for act in trip.activities:
+            if not trip.start_date <= act.day <= trip.end_date:
+                problems.append(f"{label}: activity {act.id} on {act.day.isoformat()} is outside the trip dates")
+            if act.time and act.minute is None:
+                problems.append(f"{label}: activity {act.id} has invalid time {act.time!r}")
+        for item in trip.budget_items:
+            if item.cost < 0:
+                problems.append(f"{label}: budget item {item.id} has negative cost")
+        for item in trip.packing_items:
+            if item.quantity < 1:
+                problems.append(f"{label}: packing item {item.id} has quantity {item.quantity}")
+    if state.active_trip_id is not None and state.active_trip_id not in seen_trips:
+        problems.append(f"active trip {state.active_trip_id} does not exist")
+    return problems
+
+
+# Операции над одним файлом. Функции уровня модуля, чтобы передаваться в
+# рабочие процессы по имени.
+
+STAT_KEYS = ("trips", "activities", "budget_items", "packing_items", "packed", "budget_total", "budget_paid")
+
+
+def file_stats(p: Path) -> Dict[str, Any]:
+    stats: Dict[str, Any] = dict.fromkeys(STAT_KEYS, 0)
+    stats["bytes"] = p.stat().st_size
+    by_category: Dict[str, float] = {}
+    for trip in read_state(p).trips:
+        summary = trip_summary(trip)
+        summary["trips"] = 1
+        for key in STAT_KEYS:
+            stats[key] += summary[key]
+        for category, amount in summary["budget_by_category"].items():
+            by_category[category] = by_category.get(category, 0.0) + amount
+    stats["budget_by_category"] = by_category
+    return stats
+
+
+def file_problems(p: Path) -> List[str]:
+    return validate_state(read_state(p))
+
+
+def compact_file(p: Path, backups: int = BACKUP_GENERATIONS, snapshot: bool = True) -> Tuple[int, int]:
+    # (байт до, байт после) вместе с журналом.
+    journal = journal_path_for(p)
+
+    def size() -> int:
+        return p.stat().st_size + (journal.stat().st_size if journal.exists() else 0)
+
+    before = size()
+    if is_sqlite_path(p):
+        with closing(SqliteStore(p).connect()) as conn:
+            conn.execute("VACUUM")
+    elif journal.exists():
+        # Журнал сливается в снимок и обнуляется.
+        store = JournalStore(p, backups=backups)
+        store.compact(store.load())
+    else:
+        save_state(read_state(p), p, backups=backups, snapshot=snapshot)
+    return before, size()
+
+
+def default_chunk_size(files: int, workers: int) -> int:
+    # Порций примерно в 8 раз больше, чем процессов: хвост обработки
+    # выравнивается, а обмен с процессами идёт не по сообщению на файл.
+    return max(1, min(MAX_CHUNK_SIZE, files // (workers * 8)))
+
+
+def _run_chunk(task: Callable[..., Any], paths: Sequence[Path], args: tuple) -> List[Tuple[Path, bool, Any]]:
+    out = []
+    for p in paths:
+        try:
+            out.append((p, True, task(p, *args)))
+        except FILE_ERRORS as e:
+            out.append((p, False, (type(e).__name__, str(e) or type(e).__name__)))
+    return out
+
+
+def _failed_chunk(paths: Sequence[Path], error: BaseException) -> List[Tuple[Path, bool, Any]]:
+    return [(p, False, (type(error).__name__, str(error) or type(error).__name__)) for p in paths]
+
+
+def run_batch(
+    task: Callable[..., Any],
+    paths: Iterable[Path],
+    *args: Any,
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+    max_chunks_per_worker: Optional[int] = MAX_CHUNKS_PER_WORKER,
+    progress: Optional[ProgressCallback] = None,
+) -> BatchReport:
+    # task(path, *args) для каждого файла. workers=1 - в этом же процессе,
+    # 0 - по процессу на ядро. progress(готово файлов, всего) вызывается в
+    # вызывающем потоке после каждой порции.
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or default_chunk_size(len(paths), workers)
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    workers = max(1, min(workers, len(chunks)))
+    report = BatchReport(workers=workers, chunk_size=chunk_size)
+    slots: List[Optional[List[Tuple[Path, bool, Any]]]] = [None] * len(chunks)
+    done = 0
+
+    def collect(index: int, results: List[Tuple[Path, bool, Any]]) -> None:
+        nonlocal done
+        slots[index] = results
+        done += len(results)
+        if progress is not None:
+            progress(done, len(paths))
+
+    started = perf_counter()
+    if workers == 1:
+        for index, chunk in enumerate(chunks):
+            collect(index, _run_chunk(task, chunk, args))
+    else:
+        _run_pool(task, chunks, args, workers, max_chunks_per_worker, collect)
+    report.seconds = perf_counter() - started
+
+    for results in slots:
+        for p, ok, value in results or ():
+            if ok:
+                report.results.append((p, value))
+            else:
+                report.errors.append(FileError(p, *value))
+    return report
+
+
+def _run_pool(
+    task: Callable[..., Any],
+    chunks: List[List[Path]],
+    args: tuple,
+    workers: int,
+    max_chunks_per_worker: Optional[int],
+    collect: Callable[[int, List[Tuple[Path, bool, Any]]], None],
+) -> None:
+    # concurrent.futures.process тянет multiprocessing (~40 мс импорта):
+    # он нужен, только когда процессов больше одного.
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    queue = iter(enumerate(chunks))
+    pending: Dict[Any, Tuple[int, List[Path]]] = {}
+    # С max_tasks_per_child пул запускает процессы через spawn. Параметр
+    # появился в Python 3.11; на 3.10 процессы живут до конца пакета.
+    options: Dict[str, Any] = {}
+    if max_chunks_per_worker and sys.version_info >= (3, 11):
+        options["max_tasks_per_child"] = max_chunks_per_worker
+    with ProcessPoolExecutor(max_workers=workers, **options) as pool:
+
+        def submit_next() -> bool:
+            for index, chunk in queue:
+                try:
+                    pending[pool.submit(_run_chunk, task, chunk, args)] = (index, chunk)
+                except RuntimeError as e:
+                    # Пул сломан (процесс упал): порция помечается ошибкой.
+                    collect(index, _failed_chunk(chunk, e))
+                    continue
+                return True
+            return False
+
+        for _ in range(workers * CHUNKS_IN_FLIGHT):
+            if not submit_next():
+                break
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, chunk = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    results = _failed_chunk(chunk, e)
+                collect(index, results)
+                submit_next()
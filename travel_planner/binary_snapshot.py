@@ -0,0 +1,287 @@
+from __future__ import annotations
+import marshal
+import os
+import struct
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .models import ActivityItem, AppState, BudgetItem, PackingItem, Trip, parse_iso_date
+
+# Двоичный снимок состояния рядом с JSON (travel_data.json.snapshot) для
+# быстрого холодного старта. JSON остаётся основным форматом: снимок
+# используется, только если он записан для текущей версии JSON-файла
+# (размер, mtime, inode) и сходится контрольная сумма.
+#
+# Заголовок: магия, версия формата, crc32 и длина данных, отпечаток JSON.
+# Данные - marshal от кортежей; элементы поездки лежат плоскими кортежами
+# по полям подряд, без объекта на каждый элемент.
+MAGIC = b"TPSNAP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<6sHIQQQQ")
+SNAPSHOT_SUFFIX = ".snapshot"
+MARSHAL_VERSION = 4
+
+JsonStamp = Tuple[int, int, int]
+
+
+def snapshot_path(json_path: Path) -> Path:
+    return json_path.with_name(json_path.name + SNAPSHOT_SUFFIX)
+
+
+def json_stamp(json_path: Path) -> JsonStamp:
+    st = os.stat(json_path)
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def _flat_activities(items: Iterable[ActivityItem]) -> tuple:
+    out = []
+    for a in items:
+        out += (a.id, a.day.toordinal(), a.time, a.title, a.location, a.notes)
+    return tuple(out)
+
+
+def _flat_budget(items: Iterable[Any]) -> tuple:
+    out = []
+    for b in items:
+        out += (b.id, b.category, b.description, b.cost, b.paid)
+    return tuple(out)
+
+
+def _flat_packing(items: Iterable[PackingItem]) -> tuple:
+    out = []
+    for p in items:
+        out += (p.id, p.item_name, p.category, p.quantity, p.place, p.packed)
+    return tuple(out)
+
+
+# Плоские кортежи из сырых dict ленивой поездки, без создания моделей.
+# Нормализация полей та же, что в from_dict() соответствующих моделей.
+def _flat_raw_activities(rows: Iterable[Dict[str, Any]]) -> tuple:
+    out = []
+    for x in rows:
+        time = x.get("time")
+        out += (
+            x["id"], parse_iso_date(x["day"]).toordinal(), "" if time is None else str(time),
+            x.get("title", ""), x.get("location") or "", x.get("notes", ""),
+        )
+    return tuple(out)
+
+
+def _flat_raw_budget(rows: Iterable[Dict[str, Any]]) -> tuple:
+    out = []
+    for x in rows:
+        out += (
+            x["id"], x.get("category") or "", x.get("description", ""),
+            float(x.get("cost", 0.0)), bool(x.get("paid", False)),
+        )
+    return tuple(out)
+
+
+def _flat_raw_packing(rows: Iterable[Dict[str, Any]]) -> tuple:
+    out = []
+    for x in rows:
+        place = x.get("place")
+        out += (
+            x["id"], x.get("item_name", ""), x.get("category") or "", int(x.get("quantity", 1)),
+            "Carry-on" if place is None else place, bool(x.get("packed", False)),
+        )
+    return tuple(out)
+
+
+class PendingRecords:
+    # Незагруженные элементы поездки из снимка в виде плоских кортежей
+    # (Trip._pending ленивой поездки). Модели строятся при первом обращении.
+    __slots__ = ("activities", "budget_items", "packing_items")
+
+    def __init__(self, activities: tuple, budget_items: tuple, packing_items: tuple):
+        self.activities = activities
+        self.budget_items = budget_items
+        self.packing_items = packing_items
+
+    def build_children(self) -> Tuple[list, list, list]:
+        return _activities(self.activities), _budget(self.budget_items), _packing(self.packing_items)
+
+    def get(self, key: str, default: Any = None) -> List[Dict[str, Any]]:
+        # dict-представление для Trip.to_dict(), без создания моделей.
+        return CHILD_DICTS[key](getattr(self, key))
+
+
+def _activity_dicts(flat: tuple) -> List[Dict[str, Any]]:
+    it = iter(flat)
+    return [
+        {"id": i, "day": date.fromordinal(d).isoformat(), "time": t, "title": ti, "location": loc, "notes": n}
+        for i, d, t, ti, loc, n in zip(it, it, it, it, it, it)
+    ]
+
+
+def _budget_dicts(flat: tuple) -> List[Dict[str, Any]]:
+    it = iter(flat)
+    return [
+        {"id": i, "category": c, "description": d, "cost": cost, "paid": paid}
+        for i, c, d, cost, paid in zip(it, it, it, it, it)
+    ]
+
+
+def _packing_dicts(flat: tuple) -> List[Dict[str, Any]]:
+    it = iter(flat)
+    return [
+        {"id": i, "item_name": n, "category": c, "quantity": q, "place": pl, "packed": pk}
+        for i, n, c, q, pl, pk in zip(it, it, it, it, it, it)
+    ]
+
+
+CHILD_DICTS = {
+    "activities": _activity_dicts,
+    "budget_items": _budget_dicts,
+    "packing_items": _packing_dicts,
+}
+
+
+def trip_dict(record: tuple) -> Dict[str, Any]:
+    # Обратно к виду Trip.to_dict(): так JSON пишется из тех же кортежей,
+    # что и двоичный снимок.
+    tid, title, destination, start, end, accommodation, notes, acts, budget, packing = record
+    return {
+        "id": tid,
+        "title": title,
+        "destination": destination,
+        "start_date": date.fromordinal(start).isoformat(),
+        "end_date": date.fromordinal(end).isoformat(),
+        "accommodation": accommodation,
+        "notes": notes,
+        "activities": _activity_dicts(acts),
+        "budget_items": _budget_dicts(budget),
+        "packing_items": _packing_dicts(packing),
+    }
+
+
+def trip_record(trip: Trip) -> tuple:
+    pending = trip._pending
+    if isinstance(pending, PendingRecords):
+        children = (pending.activities, pending.budget_items, pending.packing_items)
+    elif pending is None:
+        children = (
+            _flat_activities(trip.activities),
+            _flat_budget(trip.budget_items),
+            _flat_packing(trip.packing_items),
+        )
+    else:
+        # Ленивая поездка из JSON: сырые dict раскладываются в кортежи сразу.
+        children = (
+            _flat_raw_activities(pending.get("activities", [])),
+            _flat_raw_budget(pending.get("budget_items", [])),
+            _flat_raw_packing(pending.get("packing_items", [])),
+        )
+    return (
+        trip.id, trip.title, trip.destination,
+        trip.start_date.toordinal(), trip.end_date.toordinal(),
+        trip.accommodation, trip.notes,
+    ) + children
+
+
+def state_data(records: tuple) -> Dict[str, Any]:
+    # Дерево AppState.to_dict() из state_records().
+    active_trip_id, theme, trips = records
+    return {"trips": [trip_dict(r) for r in trips], "active_trip_id": active_trip_id, "theme": theme}
+
+
+def state_records(state: AppState) -> tuple:
+    # Неизменяемые кортежи: их можно отдать фоновому потоку на запись,
+    # и из них же там кодируется JSON (trip_dict()).
+    return state.active_trip_id, state.theme, tuple(trip_record(t) for t in state.trips)
+
+
+def encode(records: tuple, stamp: JsonStamp) -> bytes:
+    payload = marshal.dumps(records, MARSHAL_VERSION)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, zlib.crc32(payload), len(payload), *stamp)
+    return header + payload
+
+
+def decode(data: bytes, stamp: Optional[JsonStamp] = None) -> Optional[tuple]:
+    # None, если снимок чужой, устарел или повреждён.
+    if len(data) < HEADER.size:
+        return None
+    magic, version, crc, length, *written_for = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    if stamp is not None and tuple(written_for) != tuple(stamp):
+        return None
+    payload = memoryview(data)[HEADER.size:]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        return None
+    try:
+        return marshal.loads(payload)
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _activities(flat: tuple) -> list:
+    from_ordinal = date.fromordinal
+    build = ActivityItem.from_fields
+    it = iter(flat)
+    return [build(i, from_ordinal(d), t, ti, loc, n) for i, d, t, ti, loc, n in zip(it, it, it, it, it, it)]
+
+
+def _budget(flat: tuple) -> list:
+    it = iter(flat)
+    return [BudgetItem(i, c, d, cost, paid) for i, c, d, cost, paid in zip(it, it, it, it, it)]
+
+
+def _packing(flat: tuple) -> list:
+    it = iter(flat)
+    return [PackingItem(i, n, c, q, pl, pk) for i, n, c, q, pl, pk in zip(it, it, it, it, it, it)]
+
+
+def state_from_records(records: tuple, lazy: bool = False) -> AppState:
+    active_trip_id, theme, trips = records
+    from_ordinal = date.fromordinal
+    if lazy:
+        built = [
+            Trip.lazy_header(
+                tid, title, destination, from_ordinal(start), from_ordinal(end), accommodation, notes,
+                PendingRecords(acts, budget, packing),
+            )
+            for tid, title, destination, start, end, accommodation, notes, acts, budget, packing in trips
+        ]
+    else:
+        built = [
+            Trip(
+                id=tid, title=title, destination=destination,
+                start_date=from_ordinal(start), end_date=from_ordinal(end),
+                accommodation=accommodation, notes=notes,
+                activities=_activities(acts), budget_items=_budget(budget), packing_items=_packing(packing),
+            )
+            for tid, title, destination, start, end, accommodation, notes, acts, budget, packing in trips
+        ]
+    return AppState(trips=built, active_trip_id=active_trip_id, theme=theme)
+
+
+def has_valid_header(json_path: Path) -> bool:
+    # Быстрая проверка без чтения данных (crc проверяется при загрузке).
+    try:
+        with snapshot_path(json_path).open("rb") as f:
+            header = f.read(HEADER.size)
+        stamp = json_stamp(json_path)
+    except OSError:
+        return False
+    if len(header) < HEADER.size:
+        return False
+    magic, version, _crc, _length, *written_for = HEADER.unpack(header)
+    return magic == MAGIC and version == FORMAT_VERSION and tuple(written_for) == stamp
+
+
+def read_binary_snapshot(json_path: Path, lazy: bool = False) -> Optional[AppState]:
+    try:
+        stamp = json_stamp(json_path)
+        data = snapshot_path(json_path).read_bytes()
+    except OSError:
+        return None
+    records = decode(data, stamp)
+    if records is None:
+        return None
+    try:
+        return state_from_records(records, lazy=lazy)
+    except (ValueError, TypeError, OverflowError):
+        return None
@@ -0,0 +1,334 @@
+from __future__ import annotations
+from array import array
+from itertools import compress, count, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .models import BudgetItem, BudgetTotals, Trip, register_container
+
+try:
+    import numpy
+except ImportError:  # numpy необязателен: без него итоги считаются через array/itertools
+    numpy = None
+
+
+class BudgetItemView:
+    # Строка колонок, которая выглядит как BudgetItem: страницы и модели
+    # читают и пишут те же атрибуты. Привязана к id, а не к позиции, поэтому
+    # переживает удаление соседних строк; позиция хранится как подсказка.
+    __slots__ = ("_columns", "id", "_row_hint")
+
+    def __init__(self, columns: "BudgetColumns", item_id: str, row: int = -1):
+        self._columns = columns
+        self.id = item_id
+        self._row_hint = row
+
+    def _row(self) -> int:
+        ids = self._columns._ids
+        row = self._row_hint
+        if not (0 <= row < len(ids) and ids[row] == self.id):
+            row = self._row_hint = self._columns.row_of(self.id)
+        return row
+
+    @property
+    def category(self) -> str:
+        return self._columns._categories[self._columns._codes[self._row()]]
+
+    @category.setter
+    def category(self, value: Any) -> None:
+        self._columns.update_item(self.id, category=value)
+
+    @property
+    def description(self) -> str:
+        return self._columns._descriptions[self._row()]
+
+    @description.setter
+    def description(self, value: Any) -> None:
+        self._columns.update_item(self.id, description=value)
+
+    @property
+    def cost(self) -> float:
+        return self._columns._costs[self._row()]
+
+    @cost.setter
+    def cost(self, value: Any) -> None:
+        self._columns.update_item(self.id, cost=value)
+
+    @property
+    def paid(self) -> bool:
+        return bool(self._columns._paid[self._row()])
+
+    @paid.setter
+    def paid(self, value: Any) -> None:
+        self._columns.update_item(self.id, paid=value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "category": self.category,
+            "description": self.description,
+            "cost": self.cost,
+            "paid": self.paid,
+        }
+
+    def to_item(self) -> BudgetItem:
+        return BudgetItem(self.id, self.category, self.description, self.cost, self.paid)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (BudgetItemView, BudgetItem)):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"BudgetItemView({self.to_dict()!r})"
+
+
+class BudgetColumns:
+    # Колоночное хранение бюджета поездки для импорта выписок на 100k+ строк:
+    # стоимости в array('d'), флаги оплаты байтами в bytearray, категории -
+    # целые коды в словаре категорий. Итоги считаются по колонкам целиком
+    # (numpy, если он установлен) и кэшируются до следующего изменения.
+    # Интерфейс совпадает с BudgetItemList в той части, которой пользуются
+    # Trip, страницы, журнал и хранилища. Trip.load_children()/from_dict()
+    # выбирают этот контейнер сами для бюджетов от COLUMNAR_BUDGET_ROWS строк.
+
+    # Как у IndexedList: через поездку-владельца изменения попадают в ChangeLog.
+    _owner: Optional[Any] = None
+    _field = ""
+
+    def __init__(self, items: Iterable[Any] = ()):
+        self._ids: List[str] = []
+        # id -> строка; строится при первом обращении по id, чтобы импорт
+        # и подсчёт итогов не держали словарь на каждую строку.
+        self._row_index: Optional[Dict[str, int]] = None
+        # Строки индекса начиная с этой могли сдвинуться после удаления или
+        # вставки; они пересчитываются одним проходом при следующем поиске.
+        self._stale_from = 0
+        self._descriptions: List[str] = []
+        self._costs = array("d")
+        self._paid = bytearray()
+        self._codes = array("I")
+        self._categories: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        self._totals: Optional[BudgetTotals] = None
+        self.extend(items)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "BudgetColumns":
+        columns = cls()
+        # Те же нормализации полей, что и в BudgetItem.from_dict().
+        for data in rows:
+            columns._append_row(
+                data["id"],
+                data.get("category") or "",
+                data.get("description", ""),
+                float(data.get("cost", 0.0)),
+                bool(data.get("paid", False)),
+            )
+        return columns
+
+    def __reduce__(self):
+        return (self.__class__, ([view.to_item() for view in self],))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[BudgetItemView]:
+        return (BudgetItemView(self, item_id, row) for row, item_id in enumerate(self._ids))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [BudgetItemView(self, self._ids[row], row) for row in range(*key.indices(len(self)))]
+        row = range(len(self._ids))[key]
+        return BudgetItemView(self, self._ids[row], row)
+
+    def __eq__(self, other: Any) -> bool:
+        try:
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def _rows(self) -> Dict[str, int]:
+        ids = self._ids
+        if self._row_index is None:
+            self._row_index = dict(zip(ids, count()))
+        elif self._stale_from < len(ids):
+            start = self._stale_from
+            self._row_index.update(zip(islice(ids, start, None), count(start)))
+        self._stale_from = len(ids)
+        return self._row_index
+
+    def row_of(self, item_id: str) -> int:
+        return self._rows()[item_id]
+
+    def get(self, item_id: str) -> Optional[BudgetItemView]:
+        row = self._rows().get(item_id)
+        return None if row is None else BudgetItemView(self, item_id, row)
+
+    def has_id(self, item_id: str) -> bool:
+        return item_id in self._rows()
+
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    def append(self, item: Any) -> None:
+        self._append_row(item.id, item.category, item.description, float(item.cost), bool(item.paid))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.append(item)
+
+    def insert(self, index: int, item: Any) -> None:
+        # Позиция ограничивается так же, как в list.insert().
+        size = len(self._ids)
+        row = max(0, size + index) if index < 0 else index
+        if row >= size:
+            self.append(item)
+            return
+        self._check_new_id(item.id)
+        self._ids.insert(row, item.id)
+        self._descriptions.insert(row, item.description)
+        self._costs.insert(row, float(item.cost))
+        self._paid.insert(row, bool(item.paid))
+        self._codes.insert(row, self._encode(item.category))
+        if self._row_index is not None:
+            self._row_index[item.id] = row
+            self._stale_from = min(self._stale_from, row + 1)
+        self._totals = None
+        self._touch(item.id)
+
+    def pop(self, index: int = -1) -> BudgetItem:
+        if not self._ids:
+            raise IndexError("pop from empty BudgetColumns")
+        row = range(len(self._ids))[index]
+        return self.remove_id(self._ids[row], row)
+
+    def remove(self, item: Any) -> None:
+        if self.remove_id(item.id) is None:
+            raise ValueError(f"budget item {item.id!r} not in list")
+
+    def _check_new_id(self, item_id: str) -> None:
+        # Удалённые id из индекса убираются сразу, так что проверка верна
+        # и при ещё не пересчитанных номерах строк.
+        if self._row_index is not None and item_id in self._row_index:
+            raise ValueError(f"duplicate budget item id {item_id!r}")
+
+    def _append_row(self, item_id: str, category: str, description: str, cost: float, paid: bool) -> None:
+        if self._row_index is not None:
+            self._check_new_id(item_id)
+            self._row_index[item_id] = len(self._ids)
+        self._ids.append(item_id)
+        self._descriptions.append(description)
+        self._costs.append(cost)
+        self._paid.append(paid)
+        self._codes.append(self._encode(category))
+        self._totals = None
+        self._touch(item_id)
+
+    def _encode(self, category: str) -> int:
+        code = self._category_codes.get(category)
+        if code is None:
+            code = len(self._categories)
+            self._categories.append(category)
+            self._category_codes[category] = code
+        return code
+
+    def remove_id(self, item_id: str, position: Optional[int] = None) -> Optional[BudgetItem]:
+        # position - подсказка, как в IndexedList.remove_id(). Сдвинувшиеся
+        # строки индекса не пересчитываются здесь, а помечаются устаревшими:
+        # серия удалений обходится одним проходом при следующем поиске.
+        ids = self._ids
+        if position is not None and 0 <= position < len(ids) and ids[position] == item_id:
+            row = position
+        else:
+            row = self._rows().get(item_id)
+            if row is None:
+                return None
+        removed = BudgetItemView(self, item_id, row).to_item()
+        del ids[row]
+        del self._descriptions[row]
+        del self._costs[row]
+        del self._paid[row]
+        del self._codes[row]
+        if self._row_index is not None:
+            self._row_index.pop(item_id, None)
+            self._stale_from = min(self._stale_from, row)
+        self._totals = None
+        self._touch(item_id)
+        return removed
+
+    def update_item(self, item_id: str, **changes: Any) -> Optional[BudgetItemView]:
+        row = self._rows().get(item_id)
+        if row is None:
+            return None
+        for name, value in changes.items():
+            if name == "category":
+                self._codes[row] = self._encode(value)
+            elif name == "description":
+                self._descriptions[row] = value
+            elif name == "cost":
+                self._costs[row] = float(value)
+            elif name == "paid":
+                self._paid[row] = bool(value)
+            else:
+                raise AttributeError(f"BudgetItem has no field {name!r}")
+        self._totals = None
+        self._touch(item_id)
+        return BudgetItemView(self, item_id, row)
+
+    def _touch(self, item_id: str) -> None:
+        if self._owner is not None:
+            self._owner.touch_item(self._field, item_id)
+
+    def invalidate_totals(self) -> None:
+        self._totals = None
+
+    def totals(self) -> BudgetTotals:
+        if self._totals is None:
+            self._totals = self._compute_totals()
+        return self._totals
+
+    def _compute_totals(self) -> BudgetTotals:
+        size = len(self._categories)
+        if numpy is not None and self._ids:
+            costs = numpy.frombuffer(self._costs, dtype=numpy.float64)
+            codes = numpy.frombuffer(self._codes, dtype=f"u{self._codes.itemsize}")
+            paid = numpy.frombuffer(self._paid, dtype=numpy.uint8).astype(bool)
+            sums = numpy.bincount(codes, weights=costs, minlength=size).tolist()
+            paid_sums = numpy.bincount(codes[paid], weights=costs[paid], minlength=size).tolist()
+            counts = numpy.bincount(codes, minlength=size).tolist()
+            total = float(costs.sum())
+            paid_total = float(costs[paid].sum())
+        else:
+            # Один проход по колонкам без создания объектов строк.
+            sums = [0.0] * size
+            paid_sums = [0.0] * size
+            counts = [0] * size
+            for code, cost, paid in zip(self._codes, self._costs, self._paid):
+                sums[code] += cost
+                counts[code] += 1
+                if paid:
+                    paid_sums[code] += cost
+            total = sum(self._costs)
+            paid_total = sum(compress(self._costs, self._paid))
+
+        totals = BudgetTotals(total=total, paid=paid_total)
+        for code, category in enumerate(self._categories):
+            if not counts[code]:
+                continue
+            totals.by_category[category] = sums[code]
+            totals.count_by_category[category] = counts[code]
+            if paid_sums[code]:
+                totals.paid_by_category[category] = paid_sums[code]
+        return totals
+
+
+register_container("budget_items", BudgetColumns)
+
+
+def use_columnar_budget(trip: Trip) -> BudgetColumns:
+    # Переводит бюджет поездки в колонки; обратно - trip.budget_items = [...].
+    columns = trip.budget_items
+    if not isinstance(columns, BudgetColumns):
+        columns = BudgetColumns(trip.budget_items)
+        trip.budget_items = columns
+    return columns
@@ -0,0 +1,80 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from enum import Flag, auto
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+
+class Change(Flag):
+    NONE = 0
+    TRIP_HEADER = auto()   # поля поездки или состав списка поездок
+    ACTIVE_TRIP = auto()
+    ACTIVITIES = auto()
+    BUDGET = auto()
+    PACKING = auto()
+    THEME = auto()
+    ALL = TRIP_HEADER | ACTIVE_TRIP | ACTIVITIES | BUDGET | PACKING | THEME
+
+
+@dataclass
+class _Subscription:
+    slices: Change
+    dirty: bool = True
+    # Поездки, чьи заголовки или членство в списке изменились с последнего
+    # обновления; None - неизвестно какие, нужен полный проход.
+    trip_ids: Optional[Set[str]] = None
+
+
+class ChangeBus:
+    # Страницы подписываются на нужные им срезы состояния. Видимая страница
+    # обновляется сразу, скрытая только помечается и обновляется при показе.
+
+    def __init__(self, is_visible: Optional[Callable[[Any], bool]] = None):
+        self._is_visible = is_visible or (lambda page: page.isVisible())
+        self._subs: Dict[Any, _Subscription] = {}
+
+    def subscribe(self, page: Any, slices: Change, dirty: bool = True) -> None:
+        self._subs[page] = _Subscription(slices, dirty, None if dirty else set())
+
+    def is_dirty(self, page: Any) -> bool:
+        sub = self._subs.get(page)
+        return sub is not None and sub.dirty
+
+    def publish(self, changes: Change, source: Any = None, trip_ids: Optional[Iterable[str]] = None) -> None:
+        # trip_ids уточняет TRIP_HEADER: какие поездки добавлены, удалены
+        # или изменены. Без него подписчики пересматривают все поездки.
+        if not (changes & Change.TRIP_HEADER):
+            header_ids: Optional[Set[str]] = set()
+        else:
+            header_ids = None if trip_ids is None else set(trip_ids)
+        for page, sub in self._subs.items():
+            if not (sub.slices & changes):
+                continue
+            if page is source:
+                # Страница-источник уже отразила своё изменение сама.
+                continue
+            if not sub.dirty:
+                sub.trip_ids = set()
+            if header_ids is None or sub.trip_ids is None:
+                sub.trip_ids = None
+            else:
+                sub.trip_ids |= header_ids
+            sub.dirty = True
+            if self._is_visible(page):
+                self._refresh(page, sub)
+
+    def refresh_if_dirty(self, page: Any) -> bool:
+        sub = self._subs.get(page)
+        if sub is None or not sub.dirty:
+            return False
+        self._refresh(page, sub)
+        return True
+
+    @staticmethod
+    def _refresh(page: Any, sub: _Subscription) -> None:
+        trip_ids, sub.trip_ids = sub.trip_ids, set()
+        sub.dirty = False
+        refresh_trips = getattr(page, "refresh_trips", None)
+        if trip_ids is not None and refresh_trips is not None:
+            refresh_trips(trip_ids)
+        else:
+            page.refresh()
@@ -0,0 +1,316 @@
+from __future__ import annotations
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, TextIO
+
+from .batch import (
+    FILE_ERRORS,
+    STAT_KEYS,
+    BatchReport,
+    compact_file,
+    file_problems,
+    file_stats,
+    read_state,
+    run_batch,
+    trip_summary,
+)
+from .models import AppState, Trip
+from .sqlite_storage import SQLITE_SUFFIXES
+from .storage import BACKUP_GENERATIONS, save_state
+from .utils import date_range_str, human_date, money
+
+# Консольный инструмент для пакетной работы с файлами данных без GUI:
+# python -m travel_planner <команда>. Qt здесь не импортируется.
+
+DATA_SUFFIXES = (".json",) + SQLITE_SUFFIXES
+
+
+class CliError(Exception):
+    pass
+
+
+def iter_data_files(paths: Iterable[Path]) -> Iterator[Path]:
+    # Каталог разворачивается в файлы данных внутри него (рекурсивно);
+    # резервные поколения (.json.1) и снимки (.snapshot) не подходят по суффиксу.
+    for p in paths:
+        if p.is_dir():
+            yield from sorted(f for f in p.rglob("*") if f.suffix in DATA_SUFFIXES and f.is_file())
+        elif p.exists():
+            yield p
+        else:
+            raise CliError(f"{p}: no such file or directory")
+
+
+def find_trip(state: AppState, key: Optional[str]) -> Trip:
+    if key is None:
+        trip = state.get_active_trip() or (state.trips[0] if state.trips else None)
+    else:
+        trip = state.get_trip_by_id(key)
+        if trip is None:
+            lowered = key.lower()
+            trip = next((t for t in state.trips if t.title.lower() == lowered), None)
+    if trip is None:
+        raise CliError(f"trip not found: {key}" if key else "no trips in file")
+    return trip
+
+
+def cmd_list(args: argparse.Namespace, out: TextIO) -> int:
+    files = list(iter_data_files(args.paths))
+    rows = []
+    errors = 0
+    for p in files:
+        try:
+            state = read_state(p, lazy=True)
+        except FILE_ERRORS as e:
+            errors += 1
+            print(f"{p}: error: {e}", file=sys.stderr)
+            continue
+        for trip in state.trips:
+            rows.append((p, trip, trip.id == state.active_trip_id))
+    if args.json:
+        json.dump([
+            {
+                "file": str(p),
+                "id": t.id,
+                "title": t.title,
+                "destination": t.destination,
+                "start_date": t.start_date.isoformat(),
+                "end_date": t.end_date.isoformat(),
+                "active": active,
+            }
+            for p, t, active in rows
+        ], out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    else:
+        for p, t, active in rows:
+            prefix = f"{p}: " if len(files) > 1 else ""
+            mark = "*" if active else " "
+            print(f"{prefix}{mark} {t.id}  {t.title} — {t.destination}  {date_range_str(t.start_date, t.end_date)}", file=out)
+    return 1 if errors else 0
+
+
+def cmd_show(args: argparse.Namespace, out: TextIO) -> int:
+    trip = find_trip(read_state(args.path), args.trip)
+    if args.json:
+        data = trip.to_dict()
+        data["summary"] = trip_summary(trip)
+        json.dump(data, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+        return 0
+    print(f"{trip.title} — {trip.destination}", file=out)
+    print(date_range_str(trip.start_date, trip.end_date), file=out)
+    if trip.accommodation:
+        print(f"Accommodation: {trip.accommodation}", file=out)
+    if trip.notes:
+        print(f"Notes: {trip.notes}", file=out)
+
+    print(f"\nActivities ({len(trip.activities)}):", file=out)
+    current_day: Optional[date] = None
+    for act in trip.activities.sorted_items():
+        if act.day != current_day:
+            current_day = act.day
+            print(f"  {human_date(act.day)}", file=out)
+        where = f" @ {act.location}" if act.location else ""
+        print(f"    {act.time or '--:--':>5}  {act.title}{where}", file=out)
+
+    totals = trip.budget_totals()
+    print(
+        f"\nBudget: {money(totals.total)} total, {money(totals.paid)} paid,"
+        f" {money(totals.total - totals.paid)} remaining",
+        file=out,
+    )
+    for category, amount in sorted(totals.by_category.items()):
+        print(f"  {category or '(none)'}: {money(amount)}", file=out)
+
+    packed = sum(1 for p in trip.packing_items if p.packed)
+    print(f"\nPacking: {packed}/{len(trip.packing_items)} packed", file=out)
+    return 0
+
+
+def cmd_export(args: argparse.Namespace, out: TextIO) -> int:
+    if args.output.exists() and not args.force:
+        raise CliError(f"{args.output} already exists (use --force to overwrite)")
+    state = read_state(args.path)
+    if args.trip:
+        trips = [find_trip(state, key) for key in args.trip]
+        active = state.active_trip_id if any(t.id == state.active_trip_id for t in trips) else trips[0].id
+        state = AppState(trips=trips, active_trip_id=active, theme=state.theme)
+    save_state(state, args.output, backups=0, pretty=args.pretty, snapshot=False)
+    print(f"exported {len(state.trips)} trips to {args.output}", file=out)
+    return 0
+
+
+def cmd_import(args: argparse.Namespace, out: TextIO) -> int:
+    state = read_state(args.path) if args.path.exists() else AppState()
+    added = replaced = skipped = 0
+    for source in iter_data_files(args.sources):
+        for trip in read_state(source).trips:
+            if state.get_trip_by_id(trip.id) is None:
+                state.trips.append(trip)
+                added += 1
+            elif args.replace:
+                index = next(i for i, t in enumerate(state.trips) if t.id == trip.id)
+                state.trips[index] = trip
+                replaced += 1
+            else:
+                skipped += 1
+    if state.active_trip_id is None and state.trips:
+        state.active_trip_id = state.trips[0].id
+    save_state(state, args.path, backups=args.backups)
+    print(f"imported {added} trips, replaced {replaced}, skipped {skipped} into {args.path}", file=out)
+    return 0
+
+
+def _print_progress(done: int, total: int) -> None:
+    print(f"\r{done}/{total} files", end="\n" if done == total else "", file=sys.stderr, flush=True)
+
+
+def _run(args: argparse.Namespace, task, *task_args: Any) -> BatchReport:
+    progress = _print_progress if args.progress else None
+    return run_batch(task, iter_data_files(args.paths), *task_args, workers=args.jobs, progress=progress)
+
+
+def _report_errors(report: BatchReport) -> None:
+    for error in report.errors:
+        print(f"{error.path}: error: {error.message}", file=sys.stderr)
+
+
+def cmd_stats(args: argparse.Namespace, out: TextIO) -> int:
+    report = _run(args, file_stats)
+    _report_errors(report)
+    totals: Dict[str, Any] = dict.fromkeys(STAT_KEYS, 0)
+    totals.update(files=len(report.results), errors=len(report.errors), bytes=0)
+    by_category: Dict[str, float] = {}
+    for _, stats in report.results:
+        totals["bytes"] += stats["bytes"]
+        for key in STAT_KEYS:
+            totals[key] += stats[key]
+        for category, amount in stats["budget_by_category"].items():
+            by_category[category] = by_category.get(category, 0.0) + amount
+    totals["budget_by_category"] = by_category
+    elapsed = report.seconds
+    totals["seconds"] = elapsed
+    totals["workers"] = report.workers
+    totals["files_per_second"] = report.files_per_second()
+    totals["mb_per_second"] = totals["bytes"] / 2**20 / elapsed if elapsed else 0.0
+
+    if args.json:
+        json.dump(totals, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    else:
+        print(f"files:          {totals['files']} ({totals['errors']} unreadable)", file=out)
+        print(f"trips:          {totals['trips']}", file=out)
+        print(f"activities:     {totals['activities']}", file=out)
+        print(f"packing items:  {totals['packed']}/{totals['packing_items']} packed", file=out)
+        print(f"budget items:   {totals['budget_items']}", file=out)
+        print(
+            f"budget:         {money(totals['budget_total'])} total, {money(totals['budget_paid'])} paid",
+            file=out,
+        )
+        for category, amount in sorted(by_category.items()):
+            print(f"  {category or '(none)'}: {money(amount)}", file=out)
+        print(
+            f"throughput:     {totals['files_per_second']:.0f} files/s,"
+            f" {totals['mb_per_second']:.1f} MB/s ({elapsed * 1000:.0f} ms, {report.workers} workers)",
+            file=out,
+        )
+    return 1 if report.errors else 0
+
+
+def cmd_validate(args: argparse.Namespace, out: TextIO) -> int:
+    report = _run(args, file_problems)
+    failed = len(report.errors)
+    for p, problems in report.results:
+        if problems:
+            failed += 1
+        for problem in problems:
+            print(f"{p}: {problem}", file=out)
+    for error in report.errors:
+        print(f"{error.path}: cannot be read: {error.message}", file=out)
+    print(f"{report.files - failed}/{report.files} files valid", file=out)
+    return 1 if failed else 0
+
+
+def cmd_compact(args: argparse.Namespace, out: TextIO) -> int:
+    report = _run(args, compact_file, args.backups, not args.no_snapshot)
+    _report_errors(report)
+    before_total = after_total = 0
+    for p, (before, after) in report.results:
+        before_total += before
+        after_total += after
+        print(f"{p}: {before} -> {after} bytes", file=out)
+    print(f"total: {before_total} -> {after_total} bytes", file=out)
+    return 1 if report.errors else 0
+
+
+def _add_batch_options(p: argparse.ArgumentParser) -> None:
+    p.add_argument("-j", "--jobs", type=int, default=1, help="worker processes (0: one per CPU core)")
+    p.add_argument("--progress", action="store_true", help="report progress on stderr")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m travel_planner",
+        description="Batch operations on TripPlanner data files (JSON or SQLite) without the GUI.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="list trips in files or directories")
+    p.add_argument("paths", nargs="+", type=Path)
+    p.add_argument("--json", action="store_true", help="machine-readable output")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("show", help="show one trip (active trip by default)")
+    p.add_argument("path", type=Path)
+    p.add_argument("trip", nargs="?", help="trip id or exact title")
+    p.add_argument("--json", action="store_true", help="machine-readable output")
+    p.set_defaults(func=cmd_show)
+
+    p = sub.add_parser("export", help="write the state or selected trips to another file (.json or .db)")
+    p.add_argument("path", type=Path)
+    p.add_argument("output", type=Path)
+    p.add_argument("--trip", action="append", help="trip id or title to export (repeatable)")
+    p.add_argument("--pretty", action="store_true", help="indented JSON")
+    p.add_argument("--force", action="store_true", help="overwrite an existing output file")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="add trips from other files")
+    p.add_argument("path", type=Path)
+    p.add_argument("sources", nargs="+", type=Path)
+    p.add_argument("--replace", action="store_true", help="replace trips with the same id")
+    p.add_argument("--backups", type=int, default=BACKUP_GENERATIONS)
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("stats", help="trip, item and budget totals with throughput")
+    p.add_argument("paths", nargs="+", type=Path)
+    p.add_argument("--json", action="store_true", help="machine-readable output")
+    _add_batch_options(p)
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("validate", help="check files for unreadable data and inconsistencies")
+    p.add_argument("paths", nargs="+", type=Path)
+    _add_batch_options(p)
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("compact", help="rewrite files compactly, fold journals, vacuum SQLite")
+    p.add_argument("paths", nargs="+", type=Path)
+    p.add_argument("--backups", type=int, default=BACKUP_GENERATIONS)
+    p.add_argument("--no-snapshot", action="store_true", help="do not write the binary snapshot")
+    _add_batch_options(p)
+    p.set_defaults(func=cmd_compact)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None, out: Optional[TextIO] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args, out or sys.stdout)
+    except CliError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except FILE_ERRORS as e:
+        print(f"error: {args.command}: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,72 @@
+from __future__ import annotations
+import json
+import os
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Переменная окружения для принудительного выбора кодека (например, "json").
+CODEC_ENV_VAR = "TRAVEL_PLANNER_JSON"
+
+
+class JsonCodec:
+    # Кодек по умолчанию на stdlib json. dumps() возвращает UTF-8 байты:
+    # компактно по умолчанию, с отступами - только по запросу.
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    # orjson (вместе с uuid, platform и др.) импортируется при первом
+    # разборе или записи: чтению двоичного снимка и консольным командам
+    # без JSON он не нужен.
+    name = "orjson"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        import orjson
+
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        import orjson
+
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+
+CODECS: Dict[str, JsonCodec] = {"json": JsonCodec()}
+# orjson необязателен, без него работает stdlib json.
+if find_spec("orjson") is not None:
+    CODECS["orjson"] = OrjsonCodec()
+
+# Порядок предпочтения, если кодек не задан явно.
+PREFERRED_CODECS: List[str] = ["orjson", "json"]
+
+
+def register_codec(codec: JsonCodec, preferred: bool = False) -> None:
+    CODECS[codec.name] = codec
+    if preferred:
+        PREFERRED_CODECS.insert(0, codec.name)
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    name = name or os.environ.get(CODEC_ENV_VAR)
+    if name:
+        try:
+            return CODECS[name]
+        except KeyError:
+            raise ValueError(f"Unknown JSON codec: {name}") from None
+    for preferred in PREFERRED_CODECS:
+        if preferred in CODECS:
+            return CODECS[preferred]
+    return CODECS["json"]
+
+
+def read_json(path: Union[str, Path], codec: Optional[JsonCodec] = None) -> Any:
+    return (codec or get_codec()).loads(Path(path).read_bytes())
@@ -0,0 +1,417 @@
+from __future__ import annotations
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import (
+    QAbstractListModel,
+    QAbstractTableModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+    pyqtSignal,
+)
+
+from .models import AppState, BudgetItem, PackingItem, Trip
+from .search import TripSearchIndex
+from .utils import human_date
+
+ALIGN_RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+ALIGN_CENTER = Qt.AlignmentFlag.AlignCenter
+
+# Роль с "сырым" значением ячейки для сортировки (числа сортируются как числа).
+SortRole = Qt.ItemDataRole.UserRole + 1
+
+
+class TripItemsTableModel(QAbstractTableModel):
+    # Общая часть табличных моделей над одним из списков поездки:
+    # строки читаются прямо из trip.<LIST_FIELD>, без копий.
+    # id элемента и изменённая колонка.
+    itemEdited = pyqtSignal(str, int)
+
+    HEADERS: List[str] = []
+    LIST_FIELD = ""
+    CHECK_COLUMN = -1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._trip: Optional[Trip] = None
+        self._rows = 0
+
+    def trip(self) -> Optional[Trip]:
+        return self._trip
+
+    def items(self):
+        return getattr(self._trip, self.LIST_FIELD)
+
+    def set_trip(self, trip: Optional[Trip]) -> None:
+        count = len(getattr(trip, self.LIST_FIELD)) if trip is not None else 0
+        if trip is self._trip and count == self._rows:
+            # Та же поездка и те же строки - достаточно перерисовать видимое.
+            if count:
+                self.dataChanged.emit(self.index(0, 0), self.index(count - 1, len(self.HEADERS) - 1))
+            return
+        self.beginResetModel()
+        self._trip = trip
+        self._rows = count
+        self.endResetModel()
+
+    def item_at(self, row: int) -> Any:
+        if self._trip is None or not (0 <= row < self._rows):
+            return None
+        return self.items()[row]
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        if not index.isValid():
+            return flags
+        if index.column() == self.CHECK_COLUMN:
+            return flags | Qt.ItemFlag.ItemIsUserCheckable
+        return flags | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        item = self.item_at(index.row()) if index.isValid() else None
+        if item is None:
+            return False
+        if index.column() == self.CHECK_COLUMN:
+            if role != Qt.ItemDataRole.CheckStateRole:
+                return False
+            value = Qt.CheckState(value) == Qt.CheckState.Checked
+        elif role != Qt.ItemDataRole.EditRole:
+            return False
+
+        if not self.update_item(item, index.column(), value):
+            return False
+        self.dataChanged.emit(index, index)
+        self.itemEdited.emit(item.id, index.column())
+        return True
+
+    def update_item(self, item: Any, column: int, value: Any) -> bool:
+        # Подклассы меняют поле элемента по колонке; False - правка не принята.
+        return False
+
+    def append_item(self, item: Any) -> None:
+        if self._trip is None:
+            return
+        self.beginInsertRows(QModelIndex(), self._rows, self._rows)
+        self.items().append(item)
+        self._rows += 1
+        self.endInsertRows()
+
+    def remove_row(self, row: int) -> Any:
+        item = self.item_at(row)
+        if item is None:
+            return None
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.items().remove_id(item.id, row)
+        self._rows -= 1
+        self.endRemoveRows()
+        return item
+
+
+class BudgetTableModel(TripItemsTableModel):
+    HEADERS = ["Category", "Description", "Cost (€)", "Paid"]
+    LIST_FIELD = "budget_items"
+    COL_CATEGORY, COL_DESCRIPTION, COL_COST, COL_PAID = range(4)
+    CHECK_COLUMN = COL_PAID
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        bi: Optional[BudgetItem] = self.item_at(index.row()) if index.isValid() else None
+        if bi is None:
+            return None
+        col = index.column()
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if col == self.COL_CATEGORY:
+                return bi.category
+            if col == self.COL_DESCRIPTION:
+                return bi.description
+            if col == self.COL_COST:
+                return f"{bi.cost:.2f}"
+            if col == self.COL_PAID and role == Qt.ItemDataRole.DisplayRole:
+                return "Paid" if bi.paid else ""
+        elif role == Qt.ItemDataRole.CheckStateRole and col == self.COL_PAID:
+            return Qt.CheckState.Checked if bi.paid else Qt.CheckState.Unchecked
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if col == self.COL_COST:
+                return ALIGN_RIGHT
+            if col == self.COL_PAID:
+                return ALIGN_CENTER
+        return None
+
+    def update_item(self, item: BudgetItem, column: int, value: Any) -> bool:
+        if column == self.COL_PAID:
+            self._trip.update_budget_item(item.id, paid=value)
+        elif column == self.COL_CATEGORY:
+            self._trip.update_budget_item(item.id, category=str(value).strip())
+        elif column == self.COL_DESCRIPTION:
+            self._trip.update_budget_item(item.id, description=str(value).strip())
+        elif column == self.COL_COST:
+            try:
+                self._trip.update_budget_item(item.id, cost=float(value))
+            except (TypeError, ValueError):
+                return False
+        else:
+            return False
+        return True
+
+
+class PackingTableModel(TripItemsTableModel):
+    HEADERS = ["Item", "Category", "Qty", "Place", "Packed"]
+    LIST_FIELD = "packing_items"
+    COL_ITEM, COL_CATEGORY, COL_QTY, COL_PLACE, COL_PACKED = range(5)
+    CHECK_COLUMN = COL_PACKED
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        pi: Optional[PackingItem] = self.item_at(index.row()) if index.isValid() else None
+        if pi is None:
+            return None
+        col = index.column()
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if col == self.COL_ITEM:
+                return pi.item_name
+            if col == self.COL_CATEGORY:
+                return pi.category
+            if col == self.COL_QTY:
+                return str(pi.quantity)
+            if col == self.COL_PLACE:
+                return pi.place
+            if col == self.COL_PACKED and role == Qt.ItemDataRole.DisplayRole:
+                return "Packed" if pi.packed else ""
+        elif role == Qt.ItemDataRole.CheckStateRole and col == self.COL_PACKED:
+            return Qt.CheckState.Checked if pi.packed else Qt.CheckState.Unchecked
+        elif role == SortRole:
+            return (pi.item_name, pi.category, pi.quantity, pi.place, pi.packed)[col]
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if col == self.COL_QTY:
+                return ALIGN_RIGHT
+            if col in (self.COL_PLACE, self.COL_PACKED):
+                return ALIGN_CENTER
+        return None
+
+    def update_item(self, item: PackingItem, column: int, value: Any) -> bool:
+        if column == self.COL_PACKED:
+            self._trip.update_packing_item(item.id, packed=value)
+        elif column == self.COL_ITEM:
+            self._trip.update_packing_item(item.id, item_name=str(value).strip())
+        elif column == self.COL_CATEGORY:
+            self._trip.update_packing_item(item.id, category=str(value).strip())
+        elif column == self.COL_QTY:
+            try:
+                self._trip.update_packing_item(item.id, quantity=int(value))
+            except (TypeError, ValueError):
+                return False
+        elif column == self.COL_PLACE:
+            self._trip.update_packing_item(item.id, place=str(value).strip())
+        else:
+            return False
+        return True
+
+
+class PackingFilterProxyModel(QSortFilterProxyModel):
+    # Фильтр по категории, месту и статусу "упаковано"; None - без фильтра.
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._category: Optional[str] = None
+        self._place: Optional[str] = None
+        self._packed: Optional[bool] = None
+        self.setSortRole(SortRole)
+        self.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+
+    def set_filters(
+        self,
+        category: Optional[str] = None,
+        place: Optional[str] = None,
+        packed: Optional[bool] = None,
+    ) -> None:
+        if (category, place, packed) == (self._category, self._place, self._packed):
+            return
+        self._category = category
+        self._place = place
+        self._packed = packed
+        self.invalidateRowsFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        pi = self.sourceModel().item_at(source_row)
+        if pi is None:
+            return False
+        if self._category is not None and pi.category != self._category:
+            return False
+        if self._place is not None and pi.place != self._place:
+            return False
+        if self._packed is not None and pi.packed != self._packed:
+            return False
+        return True
+
+
+# Роль со строкой плоского списка маршрута: (kind, payload, is_last_in_day).
+EntryRole = Qt.ItemDataRole.UserRole + 2
+ENTRY_DAY = "day"
+ENTRY_ACTIVITY = "activity"
+
+
+class ItineraryListModel(QAbstractListModel):
+    # Маршрут как плоский список: заголовок дня, затем его активности.
+    # Виджетов на строку нет - всё рисует делегат.
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries: List[Tuple[str, Any, bool]] = []
+
+    def set_trip(self, trip: Optional[Trip]) -> None:
+        entries: List[Tuple[str, Any, bool]] = []
+        if trip is not None:
+            # Активности уже упорядочены индексом поездки - остаётся
+            # разбить их на дни.
+            current_day: Optional[date] = None
+            for act in trip.activities.sorted_items():
+                if act.day != current_day:
+                    if entries:
+                        entries[-1] = (ENTRY_ACTIVITY, entries[-1][1], True)
+                    current_day = act.day
+                    entries.append((ENTRY_DAY, act.day, False))
+                entries.append((ENTRY_ACTIVITY, act, False))
+            if entries:
+                entries[-1] = (ENTRY_ACTIVITY, entries[-1][1], True)
+
+        self.beginResetModel()
+        self._entries = entries
+        self.endResetModel()
+
+    def entry(self, row: int) -> Optional[Tuple[str, Any, bool]]:
+        if 0 <= row < len(self._entries):
+            return self._entries[row]
+        return None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        entry = self.entry(index.row()) if index.isValid() else None
+        if entry is None:
+            return None
+        kind, payload, _ = entry
+        if role == EntryRole:
+            return entry
+        if role == Qt.ItemDataRole.DisplayRole:
+            if kind == ENTRY_DAY:
+                return human_date(payload)
+            return f"{payload.time} {payload.title}"
+        if role == Qt.ItemDataRole.ToolTipRole and kind != ENTRY_DAY:
+            # Делегат обрезает длинные название и строку места/заметок -
+            # полный текст виден в подсказке.
+            return "\n".join(t for t in (payload.title, payload.location, payload.notes) if t)
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        return Qt.ItemFlag.ItemIsEnabled
+
+
+class TripListModel(QAbstractListModel):
+    # Список поездок для TripsPage. Строки отдаются порциями через
+    # fetchMore, поиск идёт по префиксному индексу, а не по самим поездкам.
+
+    FETCH_BATCH = 100
+
+    def __init__(self, state: AppState, parent=None):
+        super().__init__(parent)
+        self._state = state
+        self._index = TripSearchIndex()
+        self._query = ""
+        self._ids: List[str] = []
+        # id -> строка в _ids; строится при первом row_of() после сброса.
+        self._rows: Optional[Dict[str, int]] = None
+        self._fetched = 0
+        self._revision = -1
+
+    def refresh(self, trip_ids: Optional[Iterable[str]] = None) -> None:
+        # trip_ids - изменённые, добавленные или удалённые поездки; без них
+        # индекс сверяется со всем списком.
+        if trip_ids is None:
+            self._index.update(self._state.trips)
+        else:
+            self._index.update_ids(trip_ids, self._state.get_trip_by_id)
+        self._apply_filter()
+
+    def set_filter(self, query: str) -> None:
+        if query == self._query:
+            return
+        self._query = query
+        self._revision = -1
+        self._apply_filter()
+
+    def filter_text(self) -> str:
+        return self._query
+
+    def match_count(self) -> int:
+        return len(self._ids)
+
+    def _apply_filter(self) -> None:
+        ids = None
+        if self._index.revision != self._revision:
+            self._revision = self._index.revision
+            matches = self._index.search(self._query)
+            ids = list(self._index.ids()) if matches is None else matches
+        if ids is None or ids == self._ids:
+            # Состав не изменился (например, сменилась активная поездка):
+            # view перерисует только видимые строки.
+            if self._fetched:
+                self.dataChanged.emit(self.index(0, 0), self.index(self._fetched - 1, 0))
+            return
+        self.beginResetModel()
+        self._ids = ids
+        self._rows = None
+        self._fetched = min(len(ids), self.FETCH_BATCH)
+        self.endResetModel()
+
+    def trip_at(self, row: int) -> Optional[Trip]:
+        if not (0 <= row < self._fetched):
+            return None
+        return self._state.get_trip_by_id(self._ids[row])
+
+    def row_of(self, trip_id: str) -> int:
+        if self._rows is None:
+            self._rows = {tid: row for row, tid in enumerate(self._ids)}
+        return self._rows.get(trip_id, -1)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._fetched
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._fetched < len(self._ids)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        count = min(self.FETCH_BATCH, len(self._ids) - self._fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        trip = self.trip_at(index.row()) if index.isValid() else None
+        if trip is None:
+            return None
+        if role == EntryRole:
+            return trip, trip.id == self._state.active_trip_id
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{trip.title} — {trip.destination}"
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        return Qt.ItemFlag.ItemIsEnabled
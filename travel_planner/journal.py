@@ -0,0 +1,295 @@
+from __future__ import annotations
+from pathlib import Path
+import os
+from typing import Any, Dict, IO, List, Optional, Union
+
+from .codec import JsonCodec, get_codec, read_json
+from .models import AppState, ActivityItem, BudgetItem, ChangeLog, PackingItem, Trip, create_sample_state
+from .storage import (
+    BACKUP_GENERATIONS,
+    JsonSnapshot,
+    journal_path_for,
+    save_state,
+    state_generations,
+    state_snapshot,
+    write_snapshot,
+)
+
+COMPACT_EVERY = 1000
+
+# kind записи -> ключ списка внутри Trip.to_dict()
+ITEM_KINDS: Dict[str, str] = {
+    "activity": "activities",
+    "budget": "budget_items",
+    "packing": "packing_items",
+}
+FIELD_KINDS: Dict[str, str] = {key: kind for kind, key in ITEM_KINDS.items()}
+
+
+def item_kind(item: Union[ActivityItem, BudgetItem, PackingItem]) -> str:
+    if isinstance(item, ActivityItem):
+        return "activity"
+    if isinstance(item, BudgetItem):
+        return "budget"
+    if isinstance(item, PackingItem):
+        return "packing"
+    raise TypeError(f"Unsupported journal item: {type(item).__name__}")
+
+
+class JournalStore:
+
+    def __init__(
+        self,
+        snapshot_path: Union[str, Path],
+        compact_every: int = COMPACT_EVERY,
+        fsync: bool = False,
+        backups: int = BACKUP_GENERATIONS,
+        codec: Optional[JsonCodec] = None,
+    ):
+        self.snapshot_path = Path(snapshot_path)
+        self.codec = codec or get_codec()
+        self.journal_path = journal_path_for(self.snapshot_path)
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.backups = backups
+        self.record_count = 0
+        self._fh: Optional[IO[bytes]] = None
+        # Для автосохранения (GUI-поток): число записей в журнале с учётом
+        # ещё не дописанных.
+        self._journaled = 0
+
+    def load(self, lazy: bool = False) -> AppState:
+        if self.snapshot_path.exists():
+            raw = self._read_snapshot()
+        elif self.journal_path.exists():
+            raw = AppState().to_dict()
+        else:
+            return create_sample_state()
+
+        trips = _index_snapshot(raw)
+        meta = {"active_trip_id": raw.get("active_trip_id"), "theme": raw.get("theme", "dark")}
+
+        self.record_count = 0
+        if self.journal_path.exists():
+            with self.journal_path.open("rb") as f:
+                lines = f.readlines()
+            for n, line in enumerate(lines):
+                if not line.strip():
+                    continue
+                try:
+                    record = self.codec.loads(line)
+                except ValueError:
+                    # Обрезанная последняя строка - запись не успела завершиться.
+                    if n == len(lines) - 1:
+                        break
+                    raise
+                _apply(trips, meta, record)
+                self.record_count += 1
+
+        return AppState.from_dict({
+            "trips": [_unindex_trip(t) for t in trips.values()],
+            "active_trip_id": meta["active_trip_id"],
+            "theme": meta["theme"],
+        }, lazy=lazy)
+
+    def _read_snapshot(self) -> Dict[str, Any]:
+        # Как load_state(): при повреждённом снимке берём резервное поколение.
+        last_error: Exception | None = None
+        for candidate in state_generations(self.snapshot_path, self.backups):
+            if not candidate.exists():
+                continue
+            try:
+                return read_json(candidate, self.codec)
+            except ValueError as e:
+                last_error = e
+        raise last_error
+
+    def put_trip(self, trip: Trip) -> None:
+        self._append({"op": "put", "kind": "trip", "data": trip.header_dict()})
+
+    def delete_trip(self, trip_id: str) -> None:
+        self._append({"op": "del", "kind": "trip", "id": trip_id})
+
+    def put_item(self, trip_id: str, item: Union[ActivityItem, BudgetItem, PackingItem]) -> None:
+        self._append({"op": "put", "kind": item_kind(item), "trip": trip_id, "data": item.to_dict()})
+
+    def delete_item(self, trip_id: str, kind: str, item_id: str) -> None:
+        if kind not in ITEM_KINDS:
+            raise ValueError(f"Unknown item kind: {kind}")
+        self._append({"op": "del", "kind": kind, "trip": trip_id, "id": item_id})
+
+    def put_meta(self, state: AppState) -> None:
+        self._append({
+            "op": "put",
+            "kind": "meta",
+            "data": {"active_trip_id": state.active_trip_id, "theme": state.theme},
+        })
+
+    def needs_compaction(self) -> bool:
+        return self.record_count >= self.compact_every
+
+    def compact(self, state: AppState) -> None:
+        # Сначала атомарно пишем снимок, потом обнуляем журнал (это делает
+        # save_state): если упадём между шагами, повторное применение записей
+        # идемпотентно.
+        self.close()
+        save_state(state, self.snapshot_path, self.backups)
+        self.record_count = 0
+
+    def save(self, state: AppState) -> None:
+        self.compact(state)
+
+    def maybe_compact(self, state: AppState) -> bool:
+        if not self.needs_compaction():
+            return False
+        self.compact(state)
+        return True
+
+    def track(self, state: AppState) -> None:
+        # Автосохранение: state совпадает с тем, что уже на диске (снимок + журнал);
+        # дальше snapshot() отдаёт только то, что отметил ChangeLog состояния.
+        state.track_changes()
+        self._journaled = _count_records(self.journal_path)
+        if not self.snapshot_path.exists():
+            # Снимка ещё нет (например, state - демо-поездка): первая запись полная.
+            self.request_compaction()
+
+    def request_compaction(self) -> None:
+        self._journaled = self.compact_every
+
+    def snapshot(self, state: AppState) -> Union[List[Dict[str, Any]], JsonSnapshot]:
+        # В GUI-потоке: записи об изменениях с прошлого вызова или, когда
+        # журнал дорос до compact_every, полный снимок для write().
+        changes = state.take_changes()
+        if changes.everything:
+            self.request_compaction()
+            records: List[Dict[str, Any]] = []
+        else:
+            records = change_records(state, changes)
+        self._journaled += len(records)
+        if self._journaled >= self.compact_every:
+            self._journaled = 0
+            return state_snapshot(state, self.snapshot_path)
+        return records
+
+    def write(self, snapshot: Union[List[Dict[str, Any]], JsonSnapshot]) -> None:
+        if isinstance(snapshot, JsonSnapshot):
+            self.close()
+            write_snapshot(snapshot, self.snapshot_path, self.backups)
+            self.record_count = 0
+        elif snapshot:
+            self._append_all(snapshot)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._append_all([record])
+
+    def _append_all(self, records: List[Dict[str, Any]]) -> None:
+        if self._fh is None:
+            self._fh = self.journal_path.open("ab")
+        self._fh.write(b"".join(self.codec.dumps(record) + b"\n" for record in records))
+        self._fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+        self.record_count += len(records)
+
+
+def change_records(state: AppState, changes: ChangeLog) -> List[Dict[str, Any]]:
+    # Записи журнала только для того, что отметил ChangeLog: сначала put
+    # (метаданные, поездки, элементы), затем удаления - поездки последними.
+    # Удалён элемент или изменён, видно по тому, остался ли он в коллекции.
+    out: List[Dict[str, Any]] = []
+    deletes: List[Dict[str, Any]] = []
+    if changes.meta:
+        out.append({
+            "op": "put",
+            "kind": "meta",
+            "data": {"active_trip_id": state.active_trip_id, "theme": state.theme},
+        })
+    for trip_id, added in changes.trips.items():
+        trip = state.get_trip_by_id(trip_id)
+        if trip is None:
+            continue
+        if not added:
+            out.append({"op": "put", "kind": "trip", "data": trip.header_dict()})
+            continue
+        if trip_id in changes.removed:
+            # Поездку заменили другой с тем же id: прежние элементы не нужны.
+            out.append({"op": "del", "kind": "trip", "id": trip_id})
+        data = trip.to_dict()
+        out.append({"op": "put", "kind": "trip", "data": trip.header_dict()})
+        for kind, key in ITEM_KINDS.items():
+            out.extend({"op": "put", "kind": kind, "trip": trip_id, "data": item} for item in data[key])
+    for trip_id, fields in changes.items.items():
+        trip = state.get_trip_by_id(trip_id)
+        # Элементы удалённой поездки уходят вместе с ней, новой - уже записаны.
+        if trip is None or changes.trips.get(trip_id):
+            continue
+        for key, item_ids in fields.items():
+            kind = FIELD_KINDS[key]
+            items = getattr(trip, key)
+            for item_id in item_ids:
+                item = items.get(item_id)
+                if item is None:
+                    deletes.append({"op": "del", "kind": kind, "trip": trip_id, "id": item_id})
+                else:
+                    out.append({"op": "put", "kind": kind, "trip": trip_id, "data": item.to_dict()})
+    for trip_id in changes.removed:
+        if state.get_trip_by_id(trip_id) is None:
+            deletes.append({"op": "del", "kind": "trip", "id": trip_id})
+    return out + deletes
+
+
+def _count_records(journal_path: Path) -> int:
+    if not journal_path.exists():
+        return 0
+    with journal_path.open("rb") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def _index_snapshot(raw: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    trips: Dict[str, Dict[str, Any]] = {}
+    for t in raw.get("trips", []):
+        indexed = dict(t)
+        for key in ITEM_KINDS.values():
+            indexed[key] = {x["id"]: x for x in t.get(key, [])}
+        trips[t["id"]] = indexed
+    return trips
+
+
+def _unindex_trip(t: Dict[str, Any]) -> Dict[str, Any]:
+    out = dict(t)
+    for key in ITEM_KINDS.values():
+        out[key] = list(t[key].values())
+    return out
+
+
+def _apply(trips: Dict[str, Dict[str, Any]], meta: Dict[str, Any], record: Dict[str, Any]) -> None:
+    op = record["op"]
+    kind = record["kind"]
+
+    if kind == "meta":
+        meta.update(record["data"])
+    elif kind == "trip":
+        if op == "del":
+            trips.pop(record["id"], None)
+            return
+        data = record["data"]
+        existing = trips.get(data["id"])
+        if existing is None:
+            existing = {key: {} for key in ITEM_KINDS.values()}
+            trips[data["id"]] = existing
+        existing.update(data)
+    else:
+        trip = trips.get(record["trip"])
+        if trip is None:
+            return
+        items = trip[ITEM_KINDS[kind]]
+        if op == "del":
+            items.pop(record["id"], None)
+        else:
+            items[record["data"]["id"]] = record["data"]
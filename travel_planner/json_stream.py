@@ -0,0 +1,112 @@
+from __future__ import annotations
+import json
+from typing import IO, Any, Iterator, Tuple
+
+READ_CHUNK_CHARS = 1 << 20
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    # Окно поверх текстового файла: дочитывает по кускам и отбрасывает
+    # разобранное, так что в памяти только текущее значение и хвост куска.
+
+    def __init__(self, fh: IO[str], chunk_chars: int = READ_CHUNK_CHARS):
+        self._fh = fh
+        self._chunk = chunk_chars
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        if self._eof:
+            return False
+        data = self._fh.read(size)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+    def peek(self) -> str:
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill(self._chunk):
+                return ""
+
+    def take(self) -> str:
+        ch = self.peek()
+        if not ch:
+            raise self._error("Unexpected end of file")
+        self._pos += 1
+        return ch
+
+    def expect(self, ch: str) -> None:
+        if self.take() != ch:
+            self._pos -= 1
+            raise self._error(f"Expecting {ch!r}")
+
+    def value(self) -> Any:
+        self.peek()
+        need = self._chunk
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Значение не уместилось в окно - дочитываем, каждый раз вдвое
+                # больше, чтобы большой объект не разбирался заново слишком часто.
+                if not self._fill(need):
+                    raise
+                need *= 2
+                continue
+            if end == len(self._buf) and self._fill(self._chunk):
+                # Число на границе куска могло оборваться - разбираем ещё раз.
+                continue
+            self._pos = end
+            return value
+
+
+def iter_members(fh: IO[str], stream_key: str) -> Iterator[Tuple[str, Any]]:
+    # Пары (ключ, значение) верхнего уровня JSON-объекта. Массив под
+    # stream_key не собирается целиком: его элементы отдаются по одному
+    # как (stream_key, элемент).
+    reader = _Reader(fh)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.take()
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise reader._error("Expecting property name")
+            reader.expect(":")
+            if key == stream_key and reader.peek() == "[":
+                reader.take()
+                if reader.peek() == "]":
+                    reader.take()
+                else:
+                    while True:
+                        yield key, reader.value()
+                        sep = reader.take()
+                        if sep == "]":
+                            break
+                        if sep != ",":
+                            raise reader._error("Expecting ',' delimiter")
+            else:
+                yield key, reader.value()
+            sep = reader.take()
+            if sep == "}":
+                break
+            if sep != ",":
+                raise reader._error("Expecting ',' delimiter")
+    if reader.peek():
+        raise reader._error("Extra data")
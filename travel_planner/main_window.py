@@ -1,6 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from PyQt6.QtWidgets import (
     QMainWindow,
@@ -17,29 +17,54 @@ from PyQt6.QtWidgets import (
     QDialog,
     QApplication,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QCoreApplication, Qt
 
+from .changes import Change, ChangeBus
+from .journal import JournalStore
 from .models import AppState, Trip, new_trip
+from .state_loader import StateLoader
 from .utils import date_range_str
-from .storage import save_state
+from .autosave import AutosaveScheduler, AUTOSAVE_DELAY_MS
 from .style import apply_theme
-from .dialogs import TripEditorDialog
 from .widgets.sidebar import SidebarWidget
-from .pages.dashboard_page import DashboardPage
-from .pages.itinerary_page import ItineraryPage
-from .pages.trips_page import TripsPage
-from .pages.budget_page import BudgetPage
-from .pages.packing_page import PackingPage
-from .pages.settings_page import SettingsPage
+
+# Модули страниц и диалогов импортируются при первом обращении к ним,
+# а не при импорте главного окна.
 
 
 class MainWindow(QMainWindow):
 
-    def __init__(self, state: AppState, storage_path: Path, parent=None):
+    def __init__(
+        self,
+        state: AppState,
+        storage_path: Path,
+        parent=None,
+        autosave_delay_ms: int = AUTOSAVE_DELAY_MS,
+        journal: bool = False,
+    ):
         super().__init__(parent)
         self.state = state
         self.storage_path = storage_path
 
+        self.autosave = AutosaveScheduler(
+            self.state,
+            self.storage_path,
+            delay_ms=autosave_delay_ms,
+            journal=JournalStore(self.storage_path, fsync=True) if journal else None,
+            parent=self,
+        )
+        self.autosave.failed.connect(self.on_autosave_failed)
+
+        self._loading = False
+        self._load_lazy = False
+        self._applied_meta: Set[str] = set()
+        self.load_error: Optional[str] = None
+        self.loader = StateLoader(self)
+        self.loader.tripsLoaded.connect(self._on_trips_loaded)
+        self.loader.stateLoaded.connect(self._on_state_loaded)
+        self.loader.finished.connect(self._on_load_finished)
+        self.loader.failed.connect(self._on_load_failed)
+
         self.setWindowTitle("TripPlanner — Travel Planning Assistant")
         self.resize(1200, 800)
 
@@ -77,6 +102,24 @@ class MainWindow(QMainWindow):
 
         header_layout.addLayout(self.header_text_col)
 
+        self.load_status_lbl = QLabel("")
+        self.load_status_lbl.setProperty("role", "headerSecondary")
+        self.load_status_lbl.setWordWrap(True)
+        self.load_status_lbl.hide()
+        header_layout.addWidget(self.load_status_lbl)
+
+        self.cancel_load_btn = QPushButton("Cancel")
+        self.cancel_load_btn.setProperty("role", "ghost")
+        self.cancel_load_btn.clicked.connect(self.cancel_loading)
+        self.cancel_load_btn.hide()
+        header_layout.addWidget(self.cancel_load_btn)
+
+        self.retry_load_btn = QPushButton("Retry")
+        self.retry_load_btn.setProperty("role", "ghost")
+        self.retry_load_btn.clicked.connect(self.retry_loading)
+        self.retry_load_btn.hide()
+        header_layout.addWidget(self.retry_load_btn)
+
         header_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum))
 
         self.edit_trip_btn = QPushButton("Edit Trip")
@@ -103,77 +146,209 @@ class MainWindow(QMainWindow):
 
         self.pages_stack = QStackedWidget()
 
-        self.dashboard_page = DashboardPage(self.state)
-        self.itinerary_page = ItineraryPage(self.state)
-        self.trips_page = TripsPage(self.state)
-        self.budget_page = BudgetPage(self.state)
-        self.packing_page = PackingPage(self.state)
-        self.settings_page = SettingsPage(self.state)
-
-        self.pages_stack.addWidget(self.dashboard_page)
-        self.pages_stack.addWidget(self.itinerary_page)
-        self.pages_stack.addWidget(self.trips_page)
-        self.pages_stack.addWidget(self.budget_page)
-        self.pages_stack.addWidget(self.packing_page)
-        self.pages_stack.addWidget(self.settings_page)
+        # Страница создаётся при первом переходе на неё (или через page());
+        # до этого в стеке стоит пустая заглушка.
+        self.page_factories: Dict[str, Callable[[], QWidget]] = {
+            "dashboard": self._create_dashboard_page,
+            "itinerary": self._create_itinerary_page,
+            "trips": self._create_trips_page,
+            "budget": self._create_budget_page,
+            "packing": self._create_packing_page,
+            "settings": self._create_settings_page,
+        }
+        self.page_key_to_index: Dict[str, int] = {key: i for i, key in enumerate(self.page_factories)}
+        self._pages: Dict[str, QWidget] = {}
+        for _ in self.page_factories:
+            self.pages_stack.addWidget(QWidget())
 
         right_wrapper.addWidget(self.pages_stack)
         root_layout.addLayout(right_wrapper)
         self.setCentralWidget(central)
 
-        self.trips_page.editTripRequested.connect(self.open_edit_trip_dialog_by_id)
-        self.trips_page.deleteTripRequested.connect(self.delete_trip_by_id)
-        self.trips_page.makeActiveTripRequested.connect(self.make_active_trip)
+        # Обновляется только текущая страница; остальные помечаются
+        # устаревшими и обновляются при переходе на них.
+        self.bus = ChangeBus(is_visible=lambda page: page is self.pages_stack.currentWidget())
 
-        self.budget_page.dataChanged.connect(self.state_changed)
-        self.packing_page.dataChanged.connect(self.state_changed)
-        self.itinerary_page.dataChanged.connect(self.state_changed)
+        self.handle_navigation("dashboard")
 
-        self.settings_page.themeChanged.connect(self.on_theme_changed)
-        self.settings_page.requestSave.connect(self.force_save)
+        apply_theme(QApplication.instance(), self.state.theme)
 
-        self.page_key_to_index: Dict[str, int] = {
-            "dashboard": 0,
-            "itinerary": 1,
-            "trips": 2,
-            "budget": 3,
-            "packing": 4,
-            "settings": 5,
-        }
+    def load_in_background(self, lazy: bool = False, stream: Optional[bool] = None) -> None:
+        # Окно уже показано, состояние читается в фоновом потоке и
+        # подставляется по мере готовности. До конца загрузки автосохранение
+        # отложено, чтобы неполное состояние не перезаписало файл.
+        self._loading = True
+        self._load_lazy = lazy
+        self.load_error = None
+        self._applied_meta.clear()
+        self.autosave.hold()
+        self.loader.start(self.storage_path, lazy=lazy, stream=stream)
+        self.update_header()
 
-        self.handle_navigation("dashboard")
+    def is_loading(self) -> bool:
+        return self._loading
+
+    def cancel_loading(self) -> None:
+        if not self._loading:
+            return
+        self.loader.cancel()
+        self._loading = False
+        self.load_error = "Loading was cancelled"
+        self.update_header()
+
+    def retry_loading(self) -> None:
+        # Повторная загрузка заменяет всё, что было получено до ошибки.
+        self.state.trips = []
+        self.state.active_trip_id = None
         self.refresh_all_pages()
+        self.load_in_background(lazy=self._load_lazy)
 
-        apply_theme(QApplication.instance(), self.state.theme)
+    def finish_loading(self) -> None:
+        # Дождаться фонового потока и сразу обработать его события.
+        if not self._loading:
+            return
+        self.loader.wait()
+        QCoreApplication.sendPostedEvents(self.loader)
+
+    def _on_trips_loaded(self, trips: List[Trip], meta: Dict[str, Any]) -> None:
+        self.state.trips.extend(trips)
+        changes = Change.TRIP_HEADER | Change.ACTIVE_TRIP | self._apply_loaded_meta(meta)
+        self.bus.publish(changes, trip_ids=[t.id for t in trips])
+        self.update_header()
+
+    def _on_state_loaded(self, state: AppState) -> None:
+        self.state.trips = state.trips
+        self._applied_meta.clear()
+        self._apply_loaded_meta({"active_trip_id": state.active_trip_id, "theme": state.theme})
+        self.refresh_all_pages()
+
+    def _apply_loaded_meta(self, meta: Dict[str, Any]) -> Change:
+        # Ключи из файла применяются один раз: если пользователь успел
+        # переключить поездку или тему во время загрузки, его выбор важнее.
+        changes = Change.NONE
+        if "active_trip_id" in meta and "active_trip_id" not in self._applied_meta:
+            self._applied_meta.add("active_trip_id")
+            self.state.active_trip_id = meta["active_trip_id"]
+        if "theme" in meta and "theme" not in self._applied_meta:
+            self._applied_meta.add("theme")
+            if meta["theme"] != self.state.theme:
+                self.state.theme = meta["theme"]
+                apply_theme(QApplication.instance(), self.state.theme)
+                changes |= Change.THEME
+        return changes
+
+    def _on_load_finished(self) -> None:
+        self._loading = False
+        self.autosave.release()
+        self.update_header()
+
+    def _on_load_failed(self, message: str) -> None:
+        # Автосохранение остаётся отложенным: на диске остаётся прежний файл.
+        self._loading = False
+        self.load_error = message
+        self.update_header()
+
+    def page(self, page_key: str) -> QWidget:
+        page = self._pages.get(page_key)
+        if page is None:
+            page = self.page_factories[page_key]()
+            idx = self.page_key_to_index[page_key]
+            placeholder = self.pages_stack.widget(idx)
+            self.pages_stack.insertWidget(idx, page)
+            self.pages_stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self._pages[page_key] = page
+            # Страница только что построена по текущему состоянию.
+            self.bus.subscribe(page, page.SUBSCRIBES, dirty=False)
+        return page
+
+    def is_page_created(self, page_key: str) -> bool:
+        return page_key in self._pages
+
+    def _create_dashboard_page(self) -> QWidget:
+        from .pages.dashboard_page import DashboardPage
+
+        return DashboardPage(self.state)
+
+    def _create_itinerary_page(self) -> QWidget:
+        from .pages.itinerary_page import ItineraryPage
+
+        page = ItineraryPage(self.state)
+        page.dataChanged.connect(self.on_page_data_changed)
+        return page
+
+    def _create_trips_page(self) -> QWidget:
+        from .pages.trips_page import TripsPage
+
+        page = TripsPage(self.state)
+        page.editTripRequested.connect(self.open_edit_trip_dialog_by_id)
+        page.deleteTripRequested.connect(self.delete_trip_by_id)
+        page.makeActiveTripRequested.connect(self.make_active_trip)
+        return page
+
+    def _create_budget_page(self) -> QWidget:
+        from .pages.budget_page import BudgetPage
+
+        page = BudgetPage(self.state)
+        page.dataChanged.connect(self.on_page_data_changed)
+        return page
+
+    def _create_packing_page(self) -> QWidget:
+        from .pages.packing_page import PackingPage
+
+        page = PackingPage(self.state)
+        page.dataChanged.connect(self.on_page_data_changed)
+        return page
+
+    def _create_settings_page(self) -> QWidget:
+        from .pages.settings_page import SettingsPage
+
+        page = SettingsPage(self.state)
+        page.themeChanged.connect(self.on_theme_changed)
+        page.requestSave.connect(self.force_save)
+        return page
 
     def handle_navigation(self, page_key: str) -> None:
-        idx = self.page_key_to_index.get(page_key, 0)
-        self.pages_stack.setCurrentIndex(idx)
+        if page_key not in self.page_factories:
+            page_key = "dashboard"
+        self.pages_stack.setCurrentWidget(self.page(page_key))
+        self.bus.refresh_if_dirty(self.pages_stack.currentWidget())
         self.sidebar.set_active_page(page_key)
 
         self.update_header()
 
-    def state_changed(self) -> None:
-        self.refresh_all_pages()
-        self.force_save()
+    def on_page_data_changed(self, changes: Change) -> None:
+        self.state_changed(changes, source=self.sender())
+
+    def state_changed(self, changes: Change = Change.ALL, source=None, trip_ids: Optional[List[str]] = None) -> None:
+        self.bus.publish(changes, source=source, trip_ids=trip_ids)
+        if changes & (Change.TRIP_HEADER | Change.ACTIVE_TRIP):
+            self.update_header()
+        self.autosave.schedule()
 
     def force_save(self) -> None:
-        save_state(self.state, self.storage_path)
+        self.autosave.save_now()
+
+    def on_autosave_failed(self, message: str) -> None:
+        QMessageBox.warning(self, "Save failed", f"Could not save your data:\n{message}")
+
+    def closeEvent(self, event) -> None:
+        # Сохраняем только полностью загруженное состояние: если во время
+        # загрузки были правки, дожидаемся её, иначе просто отменяем.
+        if self._loading:
+            if self.autosave.has_pending():
+                self.finish_loading()
+            else:
+                self.cancel_loading()
+        self.autosave.shutdown()
+        super().closeEvent(event)
 
     def refresh_all_pages(self) -> None:
-        self.dashboard_page.refresh()
-        self.itinerary_page.refresh()
-        self.trips_page.refresh()
-        self.budget_page.refresh()
-        self.packing_page.refresh()
-
-        idx = self.settings_page.theme_combo.findText(self.state.theme)
-        if idx != -1:
-            self.settings_page.theme_combo.setCurrentIndex(idx)
-
+        self.bus.publish(Change.ALL)
         self.update_header()
 
     def update_header(self) -> None:
+        self._update_load_status()
         trip = self.state.get_active_trip()
         if trip is None:
             self.header_trip_title_lbl.setText("No trip selected")
@@ -192,7 +367,21 @@ class MainWindow(QMainWindow):
         self.open_budget_btn.setEnabled(True)
         self.open_packing_btn.setEnabled(True)
 
+    def _update_load_status(self) -> None:
+        if self._loading:
+            text = f"Loading trips… {len(self.state.trips)} so far"
+        elif self.load_error is not None:
+            text = f"Could not load your data: {self.load_error}. Changes will not be saved."
+        else:
+            text = ""
+        self.load_status_lbl.setText(text)
+        self.load_status_lbl.setVisible(bool(text))
+        self.cancel_load_btn.setVisible(self._loading)
+        self.retry_load_btn.setVisible(not self._loading and self.load_error is not None)
+
     def open_add_trip_dialog(self) -> None:
+        from .dialogs import TripEditorDialog
+
         dlg = TripEditorDialog(self)
         if dlg.exec() == QDialog.DialogCode.Accepted:
             data = dlg.get_data()
@@ -206,7 +395,7 @@ class MainWindow(QMainWindow):
                     notes=data["notes"],
                 )
                 self.state.add_trip(t)
-                self.state_changed()
+                self.state_changed(Change.TRIP_HEADER | Change.ACTIVE_TRIP, trip_ids=[t.id])
                 self.handle_navigation("trips")
 
     def open_edit_current_trip(self) -> None:
@@ -222,6 +411,8 @@ class MainWindow(QMainWindow):
         self._edit_trip_common(trip)
 
     def _edit_trip_common(self, trip: Trip) -> None:
+        from .dialogs import TripEditorDialog
+
         dlg = TripEditorDialog(self, trip=trip)
         if dlg.exec() == QDialog.DialogCode.Accepted:
             data = dlg.get_data()
@@ -232,7 +423,7 @@ class MainWindow(QMainWindow):
                 trip.start_date = data["start_date"]
                 trip.end_date = data["end_date"]
                 trip.notes = data["notes"]
-                self.state_changed()
+                self.state_changed(Change.TRIP_HEADER, trip_ids=[trip.id])
 
     def delete_trip_by_id(self, trip_id: str) -> None:
         trip = self.state.get_trip_by_id(trip_id)
@@ -247,13 +438,14 @@ class MainWindow(QMainWindow):
         )
         if reply == QMessageBox.StandardButton.Yes:
             self.state.delete_trip(trip_id)
-            self.state_changed()
+            self.state_changed(Change.TRIP_HEADER | Change.ACTIVE_TRIP, trip_ids=[trip_id])
 
     def make_active_trip(self, trip_id: str) -> None:
         self.state.set_active_trip(trip_id)
-        self.state_changed()
+        self.state_changed(Change.ACTIVE_TRIP)
 
     def on_theme_changed(self, theme: str) -> None:
         apply_theme(QApplication.instance(), theme)
         self.state.theme = theme
+        self.bus.publish(Change.THEME, source=self._pages.get("settings"))
         self.force_save()
@@ -1,11 +1,213 @@
 from __future__ import annotations
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from datetime import date
-from uuid import uuid4
-from typing import List, Optional, Dict, Any
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from math import isclose
+from operator import indexOf
+from sys import intern
+from typing import List, Optional, Dict, Any, Iterable, Set
+
+
+class ChangeLog:
+    # Что изменилось в AppState с прошлого take(): заполняется хуками моделей
+    # в момент правки (добавление, удаление, update_item(), поля поездки),
+    # поэтому автосохранение пишет только затронутые поездки и элементы, не
+    # сравнивая состояние целиком. Поля элементов, изменённые напрямую, а не
+    # через update_item(), сюда не попадают - для них есть touch_item().
+
+    def __init__(self):
+        self.meta = False
+        # Массовая замена списка поездок: перечислить изменения нельзя.
+        self.everything = False
+        # id поездки -> добавлена ли она (тогда пишется целиком); порядок
+        # вставки - порядок, в котором поездки появились в списке.
+        self.trips: Dict[str, bool] = {}
+        self.removed: Set[str] = set()
+        # id поездки -> поле дочерней коллекции -> id элементов.
+        self.items: Dict[str, Dict[str, Dict[str, None]]] = {}
+
+    def __bool__(self) -> bool:
+        return self.meta or self.everything or bool(self.trips or self.removed or self.items)
+
+    def touch_meta(self) -> None:
+        self.meta = True
+
+    def touch_trip(self, trip_id: str) -> None:
+        self.trips.setdefault(trip_id, False)
+
+    def trip_added(self, trip_id: str) -> None:
+        self.trips[trip_id] = True
+
+    def trip_removed(self, trip_id: str) -> None:
+        self.removed.add(trip_id)
+
+    def touch_item(self, trip_id: str, field_name: str, item_id: str) -> None:
+        self.items.setdefault(trip_id, {}).setdefault(field_name, {})[item_id] = None
+
+    def take(self) -> "ChangeLog":
+        taken = ChangeLog()
+        taken.__dict__, self.__dict__ = self.__dict__, taken.__dict__
+        return taken
+
+
+class IndexedList(list):
+    # Список моделей с индексом id -> объект, который поддерживается
+    # при любых изменениях списка. Поиск и удаление по id без перебора
+    # в Python-коде.
+
+    # Поездка-владелец и имя поля в ней: через них изменения попадают в ChangeLog.
+    _owner: Optional[Any] = None
+    _field = ""
+
+    def __init__(self, items: Iterable[Any] = ()):
+        super().__init__(items)
+        self._reindex()
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    def get(self, item_id: str) -> Any:
+        return self._by_id.get(item_id)
+
+    def has_id(self, item_id: str) -> bool:
+        return item_id in self._by_id
+
+    def ids(self) -> List[str]:
+        return list(self._by_id)
+
+    def remove_id(self, item_id: str, position: Optional[int] = None) -> Any:
+        # position - подсказка (например, строка таблицы); если она верна,
+        # удаление не требует поиска элемента в списке.
+        item = self._by_id.get(item_id)
+        if item is None:
+            return None
+        if position is None or not (0 <= position < len(self)) or self[position] is not item:
+            # Сравнение по identity, а не через __eq__ датаклассов.
+            position = indexOf(map(id, self), id(item))
+        super().__delitem__(position)
+        self._removed(item)
+        return item
+
+    def update_item(self, item_id: str, **changes: Any) -> Any:
+        # Изменение полей через _removed/_added, чтобы производные индексы
+        # подклассов (итоги, порядок) обновились инкрементально.
+        item = self._by_id.get(item_id)
+        if item is None:
+            return None
+        self._removed(item)
+        for name, value in changes.items():
+            setattr(item, name, value)
+        self._added(item)
+        return item
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        self._added(item)
+
+    def extend(self, items: Iterable[Any]) -> None:
+        items = list(items)
+        super().extend(items)
+        for x in items:
+            self._added(x)
+
+    def __iadd__(self, items: Iterable[Any]) -> "IndexedList":
+        self.extend(items)
+        return self
+
+    def insert(self, index: int, item: Any) -> None:
+        super().insert(index, item)
+        self._added(item)
+
+    def remove(self, item: Any) -> None:
+        super().remove(item)
+        self._removed(item)
+
+    def pop(self, index: int = -1) -> Any:
+        item = super().pop(index)
+        self._removed(item)
+        return item
+
+    def clear(self) -> None:
+        self._bulk_changed()
+        super().clear()
+        self._reindex()
+
+    def __setitem__(self, key, value) -> None:
+        if isinstance(key, slice):
+            self._bulk_changed()
+            super().__setitem__(key, value)
+            self._reindex()
+            self._bulk_changed()
+            return
+        old = self[key]
+        super().__setitem__(key, value)
+        self._removed(old)
+        self._added(value)
+
+    def __delitem__(self, key) -> None:
+        if isinstance(key, slice):
+            self._bulk_changed()
+            super().__delitem__(key)
+            self._reindex()
+            return
+        self.pop(key)
+
+    def _added(self, item: Any) -> None:
+        self._by_id[item.id] = item
+        if self._owner is not None:
+            self._owner.touch_item(self._field, item.id)
+
+    def _removed(self, item: Any) -> None:
+        if self._by_id.get(item.id) is item:
+            del self._by_id[item.id]
+        if self._owner is not None:
+            self._owner.touch_item(self._field, item.id)
+
+    def _bulk_changed(self) -> None:
+        if self._owner is not None:
+            for item_id in self._by_id:
+                self._owner.touch_item(self._field, item_id)
+
+    def _reindex(self) -> None:
+        self._by_id: Dict[str, Any] = {x.id: x for x in self}
+
+
+MINUTES_PER_DAY = 24 * 60
+# Слот для нераспознанного времени: после всех минут дня.
+UNTIMED_SLOT = MINUTES_PER_DAY
+DAY_SLOTS = MINUTES_PER_DAY + 1
+
+
+# Даты и минуты неизменяемы, поэтому одинаковые значения можно разделять
+# между элементами: кэш и экономит разбор, и не плодит объекты.
+parse_iso_date = lru_cache(maxsize=4096)(date.fromisoformat)
+
+
+@lru_cache(maxsize=4096)
+def parse_minute(t: str) -> Optional[int]:
+    # "HH:MM" (или "HH") -> минута дня; None, если время не распознано.
+    parts = t.strip().split(":")
+    try:
+        h = int(parts[0])
+        m = int(parts[1]) if len(parts) > 1 else 0
+    except ValueError:
+        return None
+    if not (0 <= h < 24 and 0 <= m < 60):
+        return None
+    return h * 60 + m
 
 
-@dataclass
+@lru_cache(maxsize=16384)
+def _sort_key(day: date, minute: Optional[int]) -> int:
+    return day.toordinal() * DAY_SLOTS + (UNTIMED_SLOT if minute is None else minute)
+
+
+# Модели со __slots__, без __dict__ на экземпляр. Повторяющиеся строки
+# (категории, места, время) при загрузке интернируются.
+
+
+@dataclass(slots=True)
 class ActivityItem:
     id: str
     day: date
@@ -13,6 +215,23 @@ class ActivityItem:
     title: str
     location: str
     notes: str = ""
+    # Производные от day/time, пересчитываются при их присваивании.
+    minute: Optional[int] = field(init=False, repr=False, compare=False)
+    sort_key: int = field(init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name == "time" or name == "day":
+            self._update_sort_key()
+
+    def _update_sort_key(self) -> None:
+        day = getattr(self, "day", None)
+        time = getattr(self, "time", None)
+        if day is None or time is None:
+            return
+        minute = parse_minute(time)
+        object.__setattr__(self, "minute", minute)
+        object.__setattr__(self, "sort_key", _sort_key(day, minute))
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -26,17 +245,114 @@ class ActivityItem:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ActivityItem":
-        return cls(
-            id=data["id"],
-            day=date.fromisoformat(data["day"]),
-            time=data.get("time", ""),
-            title=data.get("title", ""),
-            location=data.get("location", ""),
-            notes=data.get("notes", ""),
+        # Старые файлы могут содержать time как число или null: строку
+        # сохраняем для отображения, а minute вычисляется из неё.
+        # Поля заполняются напрямую, минуя __setattr__ - это горячий путь загрузки.
+        time = data.get("time")
+        return cls.from_fields(
+            data["id"],
+            parse_iso_date(data["day"]),
+            intern("" if time is None else str(time)),
+            data.get("title", ""),
+            intern(data.get("location") or ""),
+            data.get("notes", ""),
         )
 
-
-@dataclass
+    @classmethod
+    def from_fields(cls, id: str, day: date, time: str, title: str, location: str, notes: str) -> "ActivityItem":
+        minute = parse_minute(time)
+        act = cls.__new__(cls)
+        set_field = object.__setattr__
+        set_field(act, "id", id)
+        set_field(act, "day", day)
+        set_field(act, "time", time)
+        set_field(act, "title", title)
+        set_field(act, "location", location)
+        set_field(act, "notes", notes)
+        set_field(act, "minute", minute)
+        set_field(act, "sort_key", _sort_key(day, minute))
+        return act
+
+
+def activity_sort_key(act: ActivityItem) -> int:
+    return act.sort_key
+
+
+def moment_key(when: date) -> int:
+    # Ключ того же вида, что ActivityItem.sort_key: дата - начало дня,
+    # datetime - конкретная минута.
+    if isinstance(when, datetime):
+        return when.toordinal() * DAY_SLOTS + when.hour * 60 + when.minute
+    return when.toordinal() * DAY_SLOTS
+
+
+def activity_passes_at(act: ActivityItem) -> datetime:
+    # Момент, когда активность перестаёт быть "следующей": через минуту
+    # после начала, а при нераспознанном времени - в конце её дня.
+    start = datetime.combine(act.day, datetime.min.time())
+    if act.minute is None:
+        return start + timedelta(days=1)
+    return start + timedelta(minutes=act.minute + 1)
+
+
+class ActivityList(IndexedList):
+    # Активности с хронологическим индексом: ключи и элементы хранятся
+    # отсортированными, вставка через bisect, "следующая активность" за
+    # O(log n). Индекс строится лениво и сбрасывается при массовых изменениях.
+
+    _keys: Optional[List[int]] = None
+    _ordered: Optional[List[ActivityItem]] = None
+
+    def sorted_items(self) -> List[ActivityItem]:
+        self._ensure_order()
+        return self._ordered
+
+    def first_from(self, when: date) -> Optional[ActivityItem]:
+        self._ensure_order()
+        i = bisect_left(self._keys, moment_key(when))
+        return self._ordered[i] if i < len(self._ordered) else None
+
+    def invalidate_order(self) -> None:
+        self._keys = None
+        self._ordered = None
+
+    def _ensure_order(self) -> None:
+        if self._keys is not None:
+            return
+        keys = [a.sort_key for a in self]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = [keys[i] for i in order]
+        self._ordered = [self[i] for i in order]
+
+    def _added(self, item: Any) -> None:
+        super()._added(item)
+        if self._keys is not None:
+            key = item.sort_key
+            # bisect_right: при равных ключах порядок добавления, как у sorted().
+            i = bisect_right(self._keys, key)
+            self._keys.insert(i, key)
+            self._ordered.insert(i, item)
+
+    def _removed(self, item: Any) -> None:
+        super()._removed(item)
+        if self._keys is not None:
+            key = item.sort_key
+            lo = bisect_left(self._keys, key)
+            hi = bisect_right(self._keys, key, lo)
+            for i in range(lo, hi):
+                if self._ordered[i] is item:
+                    del self._keys[i]
+                    del self._ordered[i]
+                    return
+            # Ключ элемента поменяли в обход update_item().
+            self.invalidate_order()
+
+    def _reindex(self) -> None:
+        super()._reindex()
+        self.invalidate_order()
+
+
+@dataclass(slots=True)
 class BudgetItem:
     id: str
     category: str
@@ -57,7 +373,7 @@ class BudgetItem:
     def from_dict(cls, data: Dict[str, Any]) -> "BudgetItem":
         return cls(
             id=data["id"],
-            category=data.get("category", ""),
+            category=intern(data.get("category") or ""),
             description=data.get("description", ""),
             cost=float(data.get("cost", 0.0)),
             paid=bool(data.get("paid", False)),
@@ -65,6 +381,93 @@ class BudgetItem:
 
 
 @dataclass
+class BudgetTotals:
+    total: float = 0.0
+    paid: float = 0.0
+    by_category: Dict[str, float] = field(default_factory=dict)
+    paid_by_category: Dict[str, float] = field(default_factory=dict)
+    count_by_category: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_items(cls, items: Iterable[BudgetItem]) -> "BudgetTotals":
+        totals = cls()
+        for item in items:
+            totals.add(item)
+        return totals
+
+    def add(self, item: BudgetItem) -> None:
+        cat = item.category
+        self.total += item.cost
+        self.by_category[cat] = self.by_category.get(cat, 0.0) + item.cost
+        self.count_by_category[cat] = self.count_by_category.get(cat, 0) + 1
+        if item.paid:
+            self.paid += item.cost
+            self.paid_by_category[cat] = self.paid_by_category.get(cat, 0.0) + item.cost
+
+    def discard(self, item: BudgetItem) -> None:
+        cat = item.category
+        self.total -= item.cost
+        if item.paid:
+            self.paid -= item.cost
+        count = self.count_by_category.get(cat, 0) - 1
+        if count <= 0:
+            # Убираем категорию целиком, чтобы не копить ошибку округления.
+            self.count_by_category.pop(cat, None)
+            self.by_category.pop(cat, None)
+            self.paid_by_category.pop(cat, None)
+            return
+        self.count_by_category[cat] = count
+        self.by_category[cat] -= item.cost
+        if item.paid:
+            self.paid_by_category[cat] -= item.cost
+
+    def matches(self, other: "BudgetTotals", rel_tol: float = 1e-9, abs_tol: float = 1e-6) -> bool:
+        def close(a: float, b: float) -> bool:
+            return isclose(a, b, rel_tol=rel_tol, abs_tol=abs_tol)
+
+        if self.count_by_category != other.count_by_category:
+            return False
+        if not (close(self.total, other.total) and close(self.paid, other.paid)):
+            return False
+        for cat in self.count_by_category:
+            if not close(self.by_category[cat], other.by_category[cat]):
+                return False
+            if not close(self.paid_by_category.get(cat, 0.0), other.paid_by_category.get(cat, 0.0)):
+                return False
+        return True
+
+
+class BudgetItemList(IndexedList):
+    # Список статей бюджета с итогами, которые пересчитываются за O(1)
+    # при добавлении/удалении и через update_item(). Итоги строятся лениво
+    # и сбрасываются при массовых изменениях списка.
+
+    _totals: Optional[BudgetTotals] = None
+
+    def totals(self) -> BudgetTotals:
+        if self._totals is None:
+            self._totals = BudgetTotals.from_items(self)
+        return self._totals
+
+    def invalidate_totals(self) -> None:
+        self._totals = None
+
+    def _added(self, item: Any) -> None:
+        super()._added(item)
+        if self._totals is not None:
+            self._totals.add(item)
+
+    def _removed(self, item: Any) -> None:
+        super()._removed(item)
+        if self._totals is not None:
+            self._totals.discard(item)
+
+    def _reindex(self) -> None:
+        super()._reindex()
+        self._totals = None
+
+
+@dataclass(slots=True)
 class PackingItem:
     id: str
     item_name: str
@@ -85,18 +488,70 @@ class PackingItem:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "PackingItem":
+        place = data.get("place")
         return cls(
             id=data["id"],
             item_name=data.get("item_name", ""),
-            category=data.get("category", ""),
+            category=intern(data.get("category") or ""),
             quantity=int(data.get("quantity", 1)),
-            place=data.get("place", "Carry-on"),
+            place=intern("Carry-on" if place is None else place),
             packed=bool(data.get("packed", False)),
         )
 
 
-@dataclass
+TRIP_CHILD_FIELDS = ("activities", "budget_items", "packing_items")
+TRIP_HEADER_FIELDS = frozenset(("id", "title", "destination", "start_date", "end_date", "accommodation", "notes"))
+
+TRIP_CHILD_LIST_TYPES = {
+    "activities": ActivityList,
+    "budget_items": BudgetItemList,
+    "packing_items": IndexedList,
+}
+
+
+def check_child_payloads(data: Dict[str, Any]) -> None:
+    # Ленивая поездка строит элементы уже после load_state(), когда откат на
+    # резервное поколение невозможен. Поэтому сразу проверяются те поля, на
+    # которых упал бы from_dict(), но модели не создаются.
+    for x in data.get("activities", []):
+        x["id"]
+        parse_iso_date(x["day"])
+    for x in data.get("budget_items", []):
+        x["id"]
+        float(x.get("cost", 0.0))
+    for x in data.get("packing_items", []):
+        x["id"]
+        int(x.get("quantity", 1))
+
+
+# Контейнеры, которые Trip принимает как есть, без обёртки в TRIP_CHILD_LIST_TYPES.
+# Дополнительные типы добавляются только через register_container().
+TRIP_CHILD_CONTAINERS = {name: [list_type] for name, list_type in TRIP_CHILD_LIST_TYPES.items()}
+
+# С этого размера бюджет поездки при загрузке кладётся в колонки (BudgetColumns).
+COLUMNAR_BUDGET_ROWS = 20_000
+
+
+def register_container(name: str, container_type: type) -> None:
+    if name not in TRIP_CHILD_CONTAINERS:
+        raise KeyError(f"Trip has no child collection {name!r}")
+    containers = TRIP_CHILD_CONTAINERS[name]
+    if container_type not in containers:
+        containers.append(container_type)
+
+
+def budget_items_from_rows(rows: List[Dict[str, Any]]) -> Any:
+    if len(rows) >= COLUMNAR_BUDGET_ROWS:
+        from .budget_columns import BudgetColumns
+        return BudgetColumns.from_rows(rows)
+    return [BudgetItem.from_dict(x) for x in rows]
+
+
+@dataclass(slots=True)
 class Trip:
+    # ChangeLog состояния, в списке которого поездка; объявлен первым, чтобы
+    # __setattr__ мог читать его уже при заполнении остальных полей.
+    _log: Optional[ChangeLog] = field(default=None, init=False, repr=False, compare=False)
     id: str
     title: str
     destination: str
@@ -107,8 +562,68 @@ class Trip:
     activities: List[ActivityItem] = field(default_factory=list)
     budget_items: List[BudgetItem] = field(default_factory=list)
     packing_items: List[PackingItem] = field(default_factory=list)
-
-    def to_dict(self) -> Dict[str, Any]:
+    # Сырые дочерние коллекции ленивой поездки; None - всё уже загружено.
+    _pending: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        list_type = TRIP_CHILD_LIST_TYPES.get(name)
+        if list_type is not None:
+            if type(value) not in TRIP_CHILD_CONTAINERS[name]:
+                value = list_type(value)
+            if self._log is not None:
+                self._replace_children(name, value)
+            value._owner = self
+            value._field = name
+        elif name in TRIP_HEADER_FIELDS and self._log is not None:
+            self._log.touch_trip(self.id)
+        object.__setattr__(self, name, value)
+
+    def _replace_children(self, name: str, value: Any) -> None:
+        # Замена коллекции целиком: затронуты и прежние, и новые элементы.
+        try:
+            old = [x.id for x in object.__getattribute__(self, name)]
+        except AttributeError:
+            pending = self._pending
+            old = [x["id"] for x in pending.get(name, [])] if pending is not None else []
+        for item_id in old:
+            self._log.touch_item(self.id, name, item_id)
+        for item in value:
+            self._log.touch_item(self.id, name, item.id)
+
+    def touch_item(self, field_name: str, item_id: str) -> None:
+        if self._log is not None:
+            self._log.touch_item(self.id, field_name, item_id)
+
+    def __getattr__(self, name: str) -> Any:
+        # Вызывается только для отсутствующих атрибутов, т.е. для дочерних
+        # коллекций ленивой поездки до первого обращения к ним.
+        if name in TRIP_CHILD_FIELDS and object.__getattribute__(self, "_pending") is not None:
+            self.load_children()
+            return object.__getattribute__(self, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def is_loaded(self) -> bool:
+        return self._pending is None
+
+    def load_children(self) -> None:
+        data = self._pending
+        if data is None:
+            return
+        # Загрузка ничего не меняет: ChangeLog на это время отключается.
+        log = self._log
+        object.__setattr__(self, "_log", None)
+        if isinstance(data, dict):
+            self.activities = [ActivityItem.from_dict(x) for x in data.get("activities", [])]
+            self.budget_items = budget_items_from_rows(data.get("budget_items", []))
+            self.packing_items = [PackingItem.from_dict(x) for x in data.get("packing_items", [])]
+        else:
+            # Отложенные коллекции не из JSON (например, из двоичного снимка):
+            # объект сам строит модели, а get() отдаёт dict-представление для to_dict().
+            self.activities, self.budget_items, self.packing_items = data.build_children()
+        self._pending = None
+        object.__setattr__(self, "_log", log)
+
+    def header_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "title": self.title,
@@ -117,34 +632,160 @@ class Trip:
             "end_date": self.end_date.isoformat(),
             "accommodation": self.accommodation,
             "notes": self.notes,
-            "activities": [a.to_dict() for a in self.activities],
-            "budget_items": [b.to_dict() for b in self.budget_items],
-            "packing_items": [p.to_dict() for p in self.packing_items],
         }
 
+    def to_dict(self) -> Dict[str, Any]:
+        data = self.header_dict()
+        if self._pending is not None:
+            # Незагруженные коллекции никто не менял - отдаём их как есть.
+            for key in TRIP_CHILD_FIELDS:
+                data[key] = self._pending.get(key, [])
+            return data
+        data["activities"] = [a.to_dict() for a in self.activities]
+        data["budget_items"] = [b.to_dict() for b in self.budget_items]
+        data["packing_items"] = [p.to_dict() for p in self.packing_items]
+        return data
+
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "Trip":
+    def from_dict(cls, data: Dict[str, Any], lazy: bool = False) -> "Trip":
+        if lazy:
+            return cls.header_from_dict(data)
         return cls(
             id=data["id"],
             title=data.get("title", ""),
             destination=data.get("destination", ""),
-            start_date=date.fromisoformat(data["start_date"]),
-            end_date=date.fromisoformat(data["end_date"]),
+            start_date=parse_iso_date(data["start_date"]),
+            end_date=parse_iso_date(data["end_date"]),
             accommodation=data.get("accommodation", ""),
             notes=data.get("notes", ""),
             activities=[ActivityItem.from_dict(x) for x in data.get("activities", [])],
-            budget_items=[BudgetItem.from_dict(x) for x in data.get("budget_items", [])],
+            budget_items=budget_items_from_rows(data.get("budget_items", [])),
             packing_items=[PackingItem.from_dict(x) for x in data.get("packing_items", [])],
         )
 
+    @classmethod
+    def header_from_dict(cls, data: Dict[str, Any]) -> "Trip":
+        check_child_payloads(data)
+        return cls.lazy_header(
+            data["id"],
+            data.get("title", ""),
+            data.get("destination", ""),
+            parse_iso_date(data["start_date"]),
+            parse_iso_date(data["end_date"]),
+            data.get("accommodation", ""),
+            data.get("notes", ""),
+            data,
+        )
+
+    @classmethod
+    def lazy_header(
+        cls,
+        id: str,
+        title: str,
+        destination: str,
+        start_date: date,
+        end_date: date,
+        accommodation: str,
+        notes: str,
+        pending: Any,
+    ) -> "Trip":
+        trip = cls.__new__(cls)
+        object.__setattr__(trip, "_log", None)
+        trip.id = id
+        trip.title = title
+        trip.destination = destination
+        trip.start_date = start_date
+        trip.end_date = end_date
+        trip.accommodation = accommodation
+        trip.notes = notes
+        trip._pending = pending
+        return trip
+
+    def upcoming_activity(self, when: date) -> Optional[ActivityItem]:
+        # Первая активность не раньше when; если все прошли - самая ранняя.
+        acts = self.activities
+        if not acts:
+            return None
+        upcoming = acts.first_from(when)
+        return upcoming if upcoming is not None else acts.sorted_items()[0]
+
+    def update_activity(self, item_id: str, **changes: Any) -> Optional[ActivityItem]:
+        return self.activities.update_item(item_id, **changes)
+
+    def budget_totals(self) -> BudgetTotals:
+        return self.budget_items.totals()
+
     def total_budget(self) -> float:
-        return sum(item.cost for item in self.budget_items)
+        return self.budget_totals().total
 
     def total_paid(self) -> float:
-        return sum(item.cost for item in self.budget_items if item.paid)
+        return self.budget_totals().paid
 
     def total_remaining(self) -> float:
-        return self.total_budget() - self.total_paid()
+        totals = self.budget_totals()
+        return totals.total - totals.paid
+
+    def budget_by_category(self) -> Dict[str, float]:
+        return dict(self.budget_totals().by_category)
+
+    def update_budget_item(self, item_id: str, **changes: Any) -> Optional[BudgetItem]:
+        return self.budget_items.update_item(item_id, **changes)
+
+    def update_packing_item(self, item_id: str, **changes: Any) -> Optional[PackingItem]:
+        return self.packing_items.update_item(item_id, **changes)
+
+    def invalidate_budget_totals(self) -> None:
+        # Для кода, который меняет cost/paid/category напрямую, в обход update_budget_item().
+        self.budget_items.invalidate_totals()
+
+    def check_budget_totals(self) -> bool:
+        return self.budget_totals().matches(BudgetTotals.from_items(self.budget_items))
+
+
+class TripList(IndexedList):
+    # Список поездок AppState: поездки в нём пишут в общий ChangeLog, а
+    # добавление и удаление поездок отмечаются в нём же.
+
+    _log: Optional[ChangeLog] = None
+
+    def attach(self, log: Optional[ChangeLog]) -> None:
+        self._log = log
+        for trip in self:
+            object.__setattr__(trip, "_log", log)
+
+    def update_item(self, item_id: str, **changes: Any) -> Any:
+        # Поля поездки отмечает Trip.__setattr__; снимать поездку с учёта
+        # и добавлять заново, как это делает IndexedList, здесь не нужно.
+        trip = self._by_id.get(item_id)
+        if trip is None:
+            return None
+        for name, value in changes.items():
+            setattr(trip, name, value)
+        return trip
+
+    def _added(self, item: Any) -> None:
+        super()._added(item)
+        log = self._log
+        object.__setattr__(item, "_log", log)
+        if log is not None:
+            log.trip_added(item.id)
+
+    def _removed(self, item: Any) -> None:
+        super()._removed(item)
+        log = self._log
+        if log is not None:
+            if item._log is log:
+                object.__setattr__(item, "_log", None)
+            log.trip_removed(item.id)
+
+    def _bulk_changed(self) -> None:
+        if self._log is not None:
+            self._log.everything = True
+
+    def _reindex(self) -> None:
+        super()._reindex()
+        if self._log is not None:
+            self.attach(self._log)
 
 
 @dataclass
@@ -152,6 +793,8 @@ class AppState:
     trips: List[Trip] = field(default_factory=list)
     active_trip_id: Optional[str] = None
     theme: str = "dark"
+    # Включается track_changes(); до этого изменения не отслеживаются.
+    _changes: Optional[ChangeLog] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -161,18 +804,44 @@ class AppState:
         }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "AppState":
+    def from_dict(cls, data: Dict[str, Any], lazy: bool = False) -> "AppState":
         return cls(
-            trips=[Trip.from_dict(x) for x in data.get("trips", [])],
+            trips=[Trip.from_dict(x, lazy=lazy) for x in data.get("trips", [])],
             active_trip_id=data.get("active_trip_id"),
             theme=data.get("theme", "dark"),
         )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        log = self.__dict__.get("_changes")
+        if name == "trips":
+            if not isinstance(value, TripList):
+                value = TripList(value)
+            if log is not None:
+                old = self.__dict__.get("trips")
+                if old is not None and old is not value:
+                    old.attach(None)
+                value.attach(log)
+                log.everything = True
+        elif log is not None and name in ("active_trip_id", "theme"):
+            log.touch_meta()
+        object.__setattr__(self, name, value)
+
+    def track_changes(self) -> ChangeLog:
+        # Начинает отсчёт изменений с текущего состояния.
+        if self._changes is None:
+            self._changes = ChangeLog()
+            self.trips.attach(self._changes)
+        else:
+            self._changes.take()
+        return self._changes
+
+    def take_changes(self) -> ChangeLog:
+        if self._changes is None:
+            raise RuntimeError("track_changes() was not called")
+        return self._changes.take()
+
     def get_trip_by_id(self, trip_id: str) -> Optional[Trip]:
-        for t in self.trips:
-            if t.id == trip_id:
-                return t
-        return None
+        return self.trips.get(trip_id)
 
     def get_active_trip(self) -> Optional[Trip]:
         if self.active_trip_id is None:
@@ -187,11 +856,18 @@ class AppState:
         self.active_trip_id = trip.id
 
     def delete_trip(self, trip_id: str) -> None:
-        self.trips = [t for t in self.trips if t.id != trip_id]
+        self.trips.remove_id(trip_id)
         if self.active_trip_id == trip_id:
             self.active_trip_id = self.trips[0].id if self.trips else None
 
 
+def new_id() -> str:
+    # uuid тянет за собой platform; импорт откладывается до первого нового id.
+    from uuid import uuid4
+
+    return str(uuid4())
+
+
 def new_trip(
     title: str,
     destination: str,
@@ -201,7 +877,7 @@ def new_trip(
     notes: str = "",
 ) -> Trip:
     return Trip(
-        id=str(uuid4()),
+        id=new_id(),
         title=title,
         destination=destination,
         start_date=start_date,
@@ -223,7 +899,7 @@ def create_sample_state() -> AppState:
 
     t.budget_items.append(
         BudgetItem(
-            id=str(uuid4()),
+            id=new_id(),
             category="Transport",
             description="Flights",
             cost=220.0,
@@ -232,7 +908,7 @@ def create_sample_state() -> AppState:
     )
     t.budget_items.append(
         BudgetItem(
-            id=str(uuid4()),
+            id=new_id(),
             category="Hotel",
             description="Hotel Mediterraneo (3 nights)",
             cost=300.0,
@@ -242,7 +918,7 @@ def create_sample_state() -> AppState:
 
     t.packing_items.append(
         PackingItem(
-            id=str(uuid4()),
+            id=new_id(),
             item_name="Passport",
             category="Documents",
             quantity=1,
@@ -252,7 +928,7 @@ def create_sample_state() -> AppState:
     )
     t.packing_items.append(
         PackingItem(
-            id=str(uuid4()),
+            id=new_id(),
             item_name="Phone charger",
             category="Electronics",
             quantity=1,
@@ -262,7 +938,7 @@ def create_sample_state() -> AppState:
     )
     t.packing_items.append(
         PackingItem(
-            id=str(uuid4()),
+            id=new_id(),
             item_name="T-shirts",
             category="Clothes",
             quantity=3,
@@ -273,7 +949,7 @@ def create_sample_state() -> AppState:
 
     t.activities.append(
         ActivityItem(
-            id=str(uuid4()),
+            id=new_id(),
             day=date(2025, 11, 14),
             time="12:00",
             title="Sagrada Familia entry",
@@ -283,7 +959,7 @@ def create_sample_state() -> AppState:
     )
     t.activities.append(
         ActivityItem(
-            id=str(uuid4()),
+            id=new_id(),
             day=date(2025, 11, 14),
             time="18:00",
             title="Tapas walking tour",
@@ -293,7 +969,7 @@ def create_sample_state() -> AppState:
     )
     t.activities.append(
         ActivityItem(
-            id=str(uuid4()),
+            id=new_id(),
             day=date(2025, 11, 15),
             time="10:30",
             title="Park Güell visit",
@@ -1,15 +1,21 @@
-from .dashboard_page import DashboardPage
-from .itinerary_page import ItineraryPage
-from .trips_page import TripsPage
-from .budget_page import BudgetPage
-from .packing_page import PackingPage
-from .settings_page import SettingsPage
-
-__all__ = [
-    "DashboardPage",
-    "ItineraryPage",
-    "TripsPage",
-    "BudgetPage",
-    "PackingPage",
-    "SettingsPage",
-]
+from importlib import import_module
+
+# Страницы импортируются по первому обращению (from travel_planner.pages
+# import BudgetPage), чтобы импорт одной страницы не тянул остальные.
+_PAGE_MODULES = {
+    "DashboardPage": "dashboard_page",
+    "ItineraryPage": "itinerary_page",
+    "TripsPage": "trips_page",
+    "BudgetPage": "budget_page",
+    "PackingPage": "packing_page",
+    "SettingsPage": "settings_page",
+}
+
+__all__ = list(_PAGE_MODULES)
+
+
+def __getattr__(name):
+    module = _PAGE_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
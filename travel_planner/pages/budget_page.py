@@ -1,12 +1,10 @@
 from __future__ import annotations
 from uuid import uuid4
-from typing import List
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QLabel,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QPushButton,
     QHBoxLayout,
     QSizePolicy,
@@ -14,21 +12,21 @@ from PyQt6.QtWidgets import (
     QAbstractItemView,
     QDialog,
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import pyqtSignal
 
+from ..changes import Change
 from ..models import AppState, BudgetItem
+from ..item_models import BudgetTableModel
 from ..utils import money, date_range_str
-from ..dialogs import BudgetItemDialog
 
 
 class BudgetPage(QWidget):
-    dataChanged = pyqtSignal()
+    dataChanged = pyqtSignal(object)
+    SUBSCRIBES = Change.TRIP_HEADER | Change.ACTIVE_TRIP | Change.BUDGET
 
     def __init__(self, state: AppState, parent=None):
         super().__init__(parent)
         self.state = state
-        self._loading = False
-        self.row_to_id: List[str] = []
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(24, 24, 24, 24)
@@ -42,15 +40,17 @@ class BudgetPage(QWidget):
         self.trip_info_lbl.setProperty("role", "headerSecondary")
         layout.addWidget(self.trip_info_lbl)
 
-        self.table = QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(["Category", "Description", "Cost (€)", "Paid"])
+        self.model = BudgetTableModel(self)
+        self.model.itemEdited.connect(self.on_item_edited)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.table.horizontalHeader().setStretchLastSection(False)
         self.table.horizontalHeader().setSectionResizeMode(0, self.table.horizontalHeader().ResizeMode.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(1, self.table.horizontalHeader().ResizeMode.Stretch)
         self.table.setMinimumHeight(240)
-        self.table.itemChanged.connect(self.on_item_changed)
 
         layout.addWidget(self.table)
 
@@ -84,7 +84,6 @@ class BudgetPage(QWidget):
 
     def refresh(self):
         trip = self._current_trip()
-        self._loading = True
 
         if trip is None:
             self.trip_info_lbl.setText("No active trip selected")
@@ -93,33 +92,10 @@ class BudgetPage(QWidget):
                 f"{trip.title} — {trip.destination} | {date_range_str(trip.start_date, trip.end_date)}"
             )
 
-        # Содержимое таблицы
-        self.table.clearContents()
-        self.row_to_id.clear()
+        # Модель читает trip.budget_items напрямую, представление
+        # запрашивает только видимые строки.
+        self.model.set_trip(trip)
 
-        if trip is None:
-            self.table.setRowCount(0)
-        else:
-            self.table.setRowCount(len(trip.budget_items))
-            for row, bi in enumerate(trip.budget_items):
-                self.row_to_id.append(bi.id)
-
-                it_cat = QTableWidgetItem(bi.category)
-                it_desc = QTableWidgetItem(bi.description)
-                it_cost = QTableWidgetItem(f"{bi.cost:.2f}")
-                it_cost.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-
-                it_paid = QTableWidgetItem("Paid" if bi.paid else "")
-                it_paid.setFlags(it_paid.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                it_paid.setCheckState(Qt.CheckState.Checked if bi.paid else Qt.CheckState.Unchecked)
-                it_paid.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                self.table.setItem(row, 0, it_cat)
-                self.table.setItem(row, 1, it_desc)
-                self.table.setItem(row, 2, it_cost)
-                self.table.setItem(row, 3, it_paid)
-
-        self._loading = False
         self.update_summary_labels()
         self.update_enabled_state()
 
@@ -142,6 +118,8 @@ class BudgetPage(QWidget):
         trip = self._current_trip()
         if trip is None:
             return
+        from ..dialogs import BudgetItemDialog
+
         dlg = BudgetItemDialog(self)
         if dlg.exec() == QDialog.DialogCode.Accepted:
             data = dlg.get_data()
@@ -152,50 +130,21 @@ class BudgetPage(QWidget):
                 cost=float(data["cost"]),
                 paid=bool(data["paid"]),
             )
-            trip.budget_items.append(new_item)
-            self.dataChanged.emit()
-            self.refresh()
+            self.model.append_item(new_item)
+            self.update_summary_labels()
+            self.dataChanged.emit(Change.BUDGET)
 
     def on_remove_selected(self):
         trip = self._current_trip()
         if trip is None:
             return
-        sel_ranges = self.table.selectedRanges()
-        if not sel_ranges:
-            return
-        row_to_remove = sel_ranges[0].topRow()
-        if 0 <= row_to_remove < len(self.row_to_id):
-            bid = self.row_to_id[row_to_remove]
-            trip.budget_items = [bi for bi in trip.budget_items if bi.id != bid]
-            self.dataChanged.emit()
-            self.refresh()
-
-    def on_item_changed(self, item: QTableWidgetItem):
-        if self._loading:
+        selected = self.table.selectionModel().selectedRows()
+        if not selected:
             return
-        trip = self._current_trip()
-        if trip is None:
-            return
-        row = item.row()
-        col = item.column()
-        if row < 0 or row >= len(self.row_to_id):
-            return
-        bid = self.row_to_id[row]
-        bi = next((x for x in trip.budget_items if x.id == bid), None)
-        if bi is None:
-            return
-
-        if col == 0:
-            bi.category = item.text().strip()
-        elif col == 1:
-            bi.description = item.text().strip()
-        elif col == 2:
-            try:
-                bi.cost = float(item.text())
-            except ValueError:
-                pass
-        elif col == 3:
-            bi.paid = (item.checkState() == Qt.CheckState.Checked)
+        if self.model.remove_row(selected[0].row()) is not None:
+            self.update_summary_labels()
+            self.dataChanged.emit(Change.BUDGET)
 
+    def on_item_edited(self, item_id: str, column: int):
         self.update_summary_labels()
-        self.dataChanged.emit()
+        self.dataChanged.emit(Change.BUDGET)
@@ -1,18 +1,23 @@
 from __future__ import annotations
-from datetime import date as _Date
+from datetime import datetime
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QLabel,
     QFrame,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 
-from ..models import AppState
-from ..utils import date_range_str, money, human_date, get_upcoming_activity
+from ..changes import Change
+from ..models import AppState, activity_passes_at
+from ..utils import date_range_str, money, human_date
+
+# Дальние активности перепроверяются не реже этого интервала.
+ROLLOVER_MAX_MS = 6 * 60 * 60 * 1000
 
 
 class DashboardPage(QWidget):
+    SUBSCRIBES = Change.TRIP_HEADER | Change.ACTIVE_TRIP | Change.BUDGET | Change.ACTIVITIES
 
     def __init__(self, state: AppState, parent=None):
         super().__init__(parent)
@@ -66,6 +71,13 @@ class DashboardPage(QWidget):
 
         self.layout.addWidget(self.next_activity_card)
 
+        # Когда текущая "следующая" активность проходит, таймер обновляет
+        # только карточку активности, без полного refresh().
+        self.clock = datetime.now
+        self.rollover_timer = QTimer(self)
+        self.rollover_timer.setSingleShot(True)
+        self.rollover_timer.timeout.connect(self.update_next_activity)
+
         self.refresh()
 
     def refresh(self):
@@ -75,7 +87,7 @@ class DashboardPage(QWidget):
             self.trip_info_lbl.setText("Select or create a trip.")
             self.budget_info_lbl.setText("")
             self.notes_lbl.setText("")
-            self.next_activity_info_lbl.setText("No activities scheduled.")
+            self.update_next_activity()
             return
 
         self.trip_title_lbl.setText(f"{trip.title} — {trip.destination}")
@@ -93,11 +105,26 @@ class DashboardPage(QWidget):
         else:
             self.notes_lbl.setText("Notes: —")
 
-        upcoming = get_upcoming_activity(trip, _Date.today())
-        if upcoming:
-            self.next_activity_info_lbl.setText(
-                f"{human_date(upcoming.day)} {upcoming.time} — {upcoming.title} ({upcoming.location})"
-                + (f". {upcoming.notes}" if upcoming.notes else "")
-            )
-        else:
+        self.update_next_activity()
+
+    def update_next_activity(self):
+        self.rollover_timer.stop()
+        trip = self.state.get_active_trip()
+        if trip is None:
+            self.next_activity_info_lbl.setText("No activities scheduled.")
+            return
+
+        now = self.clock()
+        upcoming = trip.upcoming_activity(now)
+        if upcoming is None:
             self.next_activity_info_lbl.setText("No upcoming activity.")
+            return
+
+        self.next_activity_info_lbl.setText(
+            f"{human_date(upcoming.day)} {upcoming.time} — {upcoming.title} ({upcoming.location})"
+            + (f". {upcoming.notes}" if upcoming.notes else "")
+        )
+        passes_at = activity_passes_at(upcoming)
+        if passes_at > now:
+            delay_ms = int((passes_at - now).total_seconds() * 1000)
+            self.rollover_timer.start(min(delay_ms, ROLLOVER_MAX_MS))
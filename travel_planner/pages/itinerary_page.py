@@ -1,34 +1,38 @@
 from __future__ import annotations
+from typing import Optional
 from uuid import uuid4
-from typing import Dict, List
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QLabel,
-    QScrollArea,
+    QListView,
     QFrame,
     QHBoxLayout,
     QPushButton,
     QSizePolicy,
     QSpacerItem,
     QDialog,
-    QApplication,
+    QAbstractItemView,
 )
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QPalette
 
+from ..changes import Change
 from ..models import AppState, ActivityItem
-from ..utils import date_range_str, human_date, activity_sort_key
-from ..dialogs import ActivityItemDialog
+from ..item_models import ItineraryListModel
+from ..utils import date_range_str
+from ..style import current_theme
+from ..widgets.itinerary_delegate import ItineraryDelegate
 
 
 class ItineraryPage(QWidget):
-    dataChanged = pyqtSignal()
+    dataChanged = pyqtSignal(object)
+    SUBSCRIBES = Change.TRIP_HEADER | Change.ACTIVE_TRIP | Change.ACTIVITIES | Change.THEME
 
     def __init__(self, state: AppState, parent=None):
         super().__init__(parent)
         self.state = state
-        self.day_cards: List[QFrame] = []
+        self.setObjectName("ItineraryPage")
+        self._theme: Optional[str] = None
 
         page_layout = QVBoxLayout(self)
         page_layout.setContentsMargins(20, 20, 20, 20)
@@ -43,20 +47,28 @@ class ItineraryPage(QWidget):
         self.trip_info_lbl.setWordWrap(True)
         page_layout.addWidget(self.trip_info_lbl)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShape(QFrame.Shape.NoFrame)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-
-        self.scroll_content = QWidget()
-        self.scroll_area.setWidget(self.scroll_content)
-
-        self.scroll_layout = QVBoxLayout(self.scroll_content)
-        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
-        self.scroll_layout.setSpacing(14)
-
-        page_layout.addWidget(self.scroll_area)
+        self.placeholder_lbl = QLabel("No activities to show")
+        self.placeholder_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.placeholder_lbl.setContentsMargins(8, 8, 8, 8)
+        page_layout.addWidget(self.placeholder_lbl)
+
+        # Дни и активности рисует делегат; QListView раскладывает и
+        # рисует только видимые строки.
+        self.model = ItineraryListModel(self)
+        self.delegate = ItineraryDelegate(self)
+
+        self.list_view = QListView()
+        self.list_view.setObjectName("ItineraryList")
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.setFrameShape(QFrame.Shape.NoFrame)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.list_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.list_view.setBatchSize(200)
+        self.list_view.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        page_layout.addWidget(self.list_view, 1)
 
         btn_row = QHBoxLayout()
         btn_row.setSpacing(8)
@@ -69,8 +81,6 @@ class ItineraryPage(QWidget):
         btn_row.addItem(QSpacerItem(0, 0, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum))
         page_layout.addLayout(btn_row)
 
-        page_layout.addStretch(1)
-
         self.apply_theme_styles()
 
         self.refresh()
@@ -79,51 +89,17 @@ class ItineraryPage(QWidget):
         return self.state.get_active_trip()
 
     def apply_theme_styles(self):
-        app = QApplication.instance()
-        palette = app.palette() if app else QPalette()
-        window_color = palette.color(QPalette.ColorRole.Window)
-        is_dark = window_color.lightness() < 128
-
-        if is_dark:
-            self.setStyleSheet("""
-                QFrame#DayCard {
-                    border: 1px solid #3a3f45;
-                    border-radius: 6px;
-                    background: #1e1f22;
-                }
-                QFrame#ActivityCard {
-                    border: 1px solid #2b2f33;
-                    border-radius: 6px;
-                    background: #252627;
-                }
-                QLabel[role="cardTitle"] { font-weight: 600; font-size: 13px; color: #e6eefc; }
-                QLabel[role="activityTime"] { color: #7fb4ff; font-weight: 600; }
-                QLabel[role="activityTitle"] { font-size: 12px; color: #ffffff; }
-                QLabel[role="activityMeta"] { color: #aab3c0; font-size: 11px; }
-                QLabel[role="headerPrimary"] { font-size: 18px; font-weight: 700; color: #ffffff; }
-                QLabel[role="headerSecondary"] { font-size: 13px; color: #d0d6dd; }
-            """)
-        else:
-            self.setStyleSheet("""
-                QFrame#DayCard {
-                    border: 1px solid #d0d7e6;
-                    border-radius: 6px;
-                    background: #ffffff;
-                }
-                QFrame#ActivityCard {
-                    border: 1px solid #e6eefc;
-                    border-radius: 6px;
-                    background: #f8fbff;
-                }
-                QLabel[role="cardTitle"] { font-weight: 600; font-size: 13px; color: #1b2a4a; }
-                QLabel[role="activityTime"] { color: #2a5cb6; font-weight: 600; }
-                QLabel[role="activityTitle"] { font-size: 12px; color: #0b1b33; }
-                QLabel[role="activityMeta"] { color: #5b6b82; font-size: 11px; }
-                QLabel[role="headerPrimary"] { font-size: 18px; font-weight: 700; color: #0b1b33; }
-                QLabel[role="headerSecondary"] { font-size: 13px; color: #334155; }
-            """)
+        # Цвета заголовков и фона списка задаёт таблица стилей приложения;
+        # здесь только палитра делегата, и только когда тема сменилась.
+        theme = current_theme()
+        if theme == self._theme:
+            return
+        self._theme = theme
+        self.delegate.set_theme(theme)
+        self.list_view.viewport().update()
 
     def refresh(self):
+        self.apply_theme_styles()
         trip = self._current_trip()
 
         if trip is None:
@@ -133,87 +109,9 @@ class ItineraryPage(QWidget):
                 f"{trip.title} — {trip.destination} | {date_range_str(trip.start_date, trip.end_date)}"
             )
 
-        for card in self.day_cards:
-            card.setParent(None)
-        self.day_cards.clear()
-
-        while self.scroll_layout.count():
-            item = self.scroll_layout.takeAt(0)
-            if item and item.widget():
-                item.widget().setParent(None)
-
-        if trip is None:
-            placeholder = QLabel("No activities to show")
-            placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            placeholder.setContentsMargins(8, 8, 8, 8)
-            self.scroll_layout.addWidget(placeholder)
-            self.update_enabled_state()
-            return
-
-        day_map: Dict[object, List[ActivityItem]] = {}
-        for act in trip.activities:
-            day_map.setdefault(act.day, []).append(act)
-
-        for d in sorted(day_map.keys(), key=lambda dt: dt.toordinal()):
-            acts = sorted(day_map[d], key=activity_sort_key)
-
-            day_card = QFrame()
-            day_card.setObjectName("DayCard")
-            day_card.setProperty("role", "dayCard")
-            dc_layout = QVBoxLayout(day_card)
-            dc_layout.setContentsMargins(12, 12, 12, 12)
-            dc_layout.setSpacing(10)
-
-            day_label = QLabel(human_date(d))
-            day_label.setProperty("role", "cardTitle")
-            day_label.setMinimumHeight(20)
-            dc_layout.addWidget(day_label)
-
-            for a in acts:
-                activity_frame = QFrame()
-                activity_frame.setObjectName("ActivityCard")
-                activity_layout = QVBoxLayout(activity_frame)
-                activity_layout.setContentsMargins(10, 8, 10, 8)
-                activity_layout.setSpacing(6)
-
-                top_row = QHBoxLayout()
-                top_row.setSpacing(8)
-
-                time_lbl = QLabel(str(a.time))
-                time_lbl.setProperty("role", "activityTime")
-                time_lbl.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
-                top_row.addWidget(time_lbl, 0, Qt.AlignmentFlag.AlignLeft)
-
-                title_lbl = QLabel(a.title)
-                title_lbl.setProperty("role", "activityTitle")
-                title_lbl.setWordWrap(True)
-                title_lbl.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-                top_row.addWidget(title_lbl, 1)
-
-                activity_layout.addLayout(top_row)
-
-                meta_texts = []
-                if a.location:
-                    meta_texts.append(a.location)
-                if a.notes:
-                    meta_texts.append(a.notes)
-
-                if meta_texts:
-                    meta_lbl = QLabel(" · ".join(meta_texts))
-                    meta_lbl.setProperty("role", "activityMeta")
-                    meta_lbl.setWordWrap(True)
-                    meta_lbl.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-                    activity_layout.addWidget(meta_lbl)
-
-                activity_frame.setMinimumHeight(48)
-                activity_frame.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
-
-                dc_layout.addWidget(activity_frame)
-
-            self.scroll_layout.addWidget(day_card)
-            self.day_cards.append(day_card)
-
-        self.scroll_layout.addStretch(1)
+        self.placeholder_lbl.setVisible(trip is None)
+        self.list_view.setVisible(trip is not None)
+        self.model.set_trip(trip)
 
         self.update_enabled_state()
 
@@ -225,6 +123,8 @@ class ItineraryPage(QWidget):
         trip = self._current_trip()
         if trip is None:
             return
+        from ..dialogs import ActivityItemDialog
+
         dlg = ActivityItemDialog(self)
         if dlg.exec() == QDialog.DialogCode.Accepted:
             data = dlg.get_data()
@@ -238,5 +138,5 @@ class ItineraryPage(QWidget):
                     notes=data["notes"],
                 )
                 trip.activities.append(new_act)
-                self.dataChanged.emit()
-                self.refresh()
\ No newline at end of file
+                self.dataChanged.emit(Change.ACTIVITIES)
+                self.refresh()
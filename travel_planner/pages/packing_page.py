@@ -1,14 +1,13 @@
 from __future__ import annotations
 from uuid import uuid4
-from typing import List
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QLabel,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QPushButton,
     QHBoxLayout,
+    QComboBox,
     QSizePolicy,
     QSpacerItem,
     QAbstractItemView,
@@ -16,19 +15,23 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 
+from ..changes import Change
 from ..models import AppState, PackingItem
-from ..dialogs import PackingItemDialog
+from ..item_models import PackingTableModel, PackingFilterProxyModel
 from ..utils import date_range_str
 
+ALL_CATEGORIES = "All categories"
+ALL_PLACES = "All places"
+PACKED_FILTERS = {"All items": None, "Packed": True, "Not packed": False}
+
 
 class PackingPage(QWidget):
-    dataChanged = pyqtSignal()
+    dataChanged = pyqtSignal(object)
+    SUBSCRIBES = Change.TRIP_HEADER | Change.ACTIVE_TRIP | Change.PACKING
 
     def __init__(self, state: AppState, parent=None):
         super().__init__(parent)
         self.state = state
-        self._loading = False
-        self.row_to_id: List[str] = []
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(24, 24, 24, 24)
@@ -42,15 +45,42 @@ class PackingPage(QWidget):
         self.trip_info_lbl.setProperty("role", "headerSecondary")
         layout.addWidget(self.trip_info_lbl)
 
-        self.table = QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["Item", "Category", "Qty", "Place", "Packed"])
+        filter_row = QHBoxLayout()
+        filter_row.setSpacing(8)
+
+        self.category_filter = QComboBox()
+        self.category_filter.addItem(ALL_CATEGORIES)
+        self.category_filter.currentIndexChanged.connect(self.apply_filters)
+        filter_row.addWidget(self.category_filter)
+
+        self.place_filter = QComboBox()
+        self.place_filter.addItem(ALL_PLACES)
+        self.place_filter.currentIndexChanged.connect(self.apply_filters)
+        filter_row.addWidget(self.place_filter)
+
+        self.packed_filter = QComboBox()
+        self.packed_filter.addItems(list(PACKED_FILTERS))
+        self.packed_filter.currentIndexChanged.connect(self.apply_filters)
+        filter_row.addWidget(self.packed_filter)
+
+        filter_row.addItem(QSpacerItem(0, 0, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum))
+        layout.addLayout(filter_row)
+
+        self.model = PackingTableModel(self)
+        self.model.itemEdited.connect(self.on_item_edited)
+        self.proxy = PackingFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.table.horizontalHeader().setStretchLastSection(False)
         self.table.horizontalHeader().setSectionResizeMode(0, self.table.horizontalHeader().ResizeMode.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(1, self.table.horizontalHeader().ResizeMode.Stretch)
         self.table.setMinimumHeight(240)
-        self.table.itemChanged.connect(self.on_item_changed)
 
         layout.addWidget(self.table)
 
@@ -79,7 +109,6 @@ class PackingPage(QWidget):
 
     def refresh(self):
         trip = self._current_trip()
-        self._loading = True
 
         if trip is None:
             self.trip_info_lbl.setText("No active trip selected")
@@ -88,39 +117,42 @@ class PackingPage(QWidget):
                 f"{trip.title} — {trip.destination} | {date_range_str(trip.start_date, trip.end_date)}"
             )
 
-        self.table.clearContents()
-        self.row_to_id.clear()
-
-        if trip is None:
-            self.table.setRowCount(0)
-        else:
-            self.table.setRowCount(len(trip.packing_items))
-            for row, pi in enumerate(trip.packing_items):
-                self.row_to_id.append(pi.id)
-
-                it_item = QTableWidgetItem(pi.item_name)
-                it_cat = QTableWidgetItem(pi.category)
-
-                it_qty = QTableWidgetItem(str(pi.quantity))
-                it_qty.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-
-                it_place = QTableWidgetItem(pi.place)
-                it_place.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                it_packed = QTableWidgetItem("Packed" if pi.packed else "")
-                it_packed.setFlags(it_packed.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                it_packed.setCheckState(Qt.CheckState.Checked if pi.packed else Qt.CheckState.Unchecked)
-                it_packed.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                self.table.setItem(row, 0, it_item)
-                self.table.setItem(row, 1, it_cat)
-                self.table.setItem(row, 2, it_qty)
-                self.table.setItem(row, 3, it_place)
-                self.table.setItem(row, 4, it_packed)
-
-        self._loading = False
+        self.model.set_trip(trip)
+        self.update_filter_options()
         self.update_enabled_state()
 
+    def update_filter_options(self):
+        # Категории и места - свободный текст, пункты фильтров берутся из данных.
+        trip = self._current_trip()
+        items = trip.packing_items if trip else []
+        changed = self._set_filter_items(self.category_filter, ALL_CATEGORIES, {pi.category for pi in items})
+        changed |= self._set_filter_items(self.place_filter, ALL_PLACES, {pi.place for pi in items})
+        if changed:
+            self.apply_filters()
+
+    @staticmethod
+    def _set_filter_items(combo: QComboBox, all_label: str, values) -> bool:
+        wanted = [all_label] + sorted(v for v in values if v)
+        if wanted == [combo.itemText(i) for i in range(combo.count())]:
+            return False
+        current = combo.currentText()
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems(wanted)
+        idx = combo.findText(current)
+        combo.setCurrentIndex(idx if idx != -1 else 0)
+        combo.blockSignals(False)
+        return True
+
+    def apply_filters(self):
+        category = self.category_filter.currentText()
+        place = self.place_filter.currentText()
+        self.proxy.set_filters(
+            category=None if category in ("", ALL_CATEGORIES) else category,
+            place=None if place in ("", ALL_PLACES) else place,
+            packed=PACKED_FILTERS.get(self.packed_filter.currentText()),
+        )
+
     def update_enabled_state(self):
         has_trip = self._current_trip() is not None
         self.table.setEnabled(has_trip)
@@ -131,6 +163,8 @@ class PackingPage(QWidget):
         trip = self._current_trip()
         if trip is None:
             return
+        from ..dialogs import PackingItemDialog
+
         dlg = PackingItemDialog(self)
         if dlg.exec() == QDialog.DialogCode.Accepted:
             data = dlg.get_data()
@@ -142,51 +176,24 @@ class PackingPage(QWidget):
                 place=data["place"],
                 packed=bool(data["packed"]),
             )
-            trip.packing_items.append(new_item)
-            self.dataChanged.emit()
-            self.refresh()
+            self.model.append_item(new_item)
+            self.update_filter_options()
+            self.dataChanged.emit(Change.PACKING)
 
     def on_remove_selected(self):
         trip = self._current_trip()
         if trip is None:
             return
-        sel_ranges = self.table.selectedRanges()
-        if not sel_ranges:
-            return
-        row_to_remove = sel_ranges[0].topRow()
-        if 0 <= row_to_remove < len(self.row_to_id):
-            pid = self.row_to_id[row_to_remove]
-            trip.packing_items = [pi for pi in trip.packing_items if pi.id != pid]
-            self.dataChanged.emit()
-            self.refresh()
-
-    def on_item_changed(self, item: QTableWidgetItem):
-        if self._loading:
+        selected = self.table.selectionModel().selectedRows()
+        if not selected:
             return
-        trip = self._current_trip()
-        if trip is None:
-            return
-        row = item.row()
-        col = item.column()
-        if row < 0 or row >= len(self.row_to_id):
-            return
-        pid = self.row_to_id[row]
-        pi = next((x for x in trip.packing_items if x.id == pid), None)
-        if pi is None:
-            return
-
-        if col == 0:
-            pi.item_name = item.text().strip()
-        elif col == 1:
-            pi.category = item.text().strip()
-        elif col == 2:
-            try:
-                pi.quantity = int(item.text())
-            except ValueError:
-                pass
-        elif col == 3:
-            pi.place = item.text().strip()
-        elif col == 4:
-            pi.packed = (item.checkState() == Qt.CheckState.Checked)
-
-        self.dataChanged.emit()
+        source_row = self.proxy.mapToSource(selected[0]).row()
+        if self.model.remove_row(source_row) is not None:
+            self.update_filter_options()
+            self.dataChanged.emit(Change.PACKING)
+
+    def on_item_edited(self, item_id: str, column: int):
+        # Пункты фильтров меняет только правка категории или места.
+        if column in (PackingTableModel.COL_CATEGORY, PackingTableModel.COL_PLACE):
+            self.update_filter_options()
+        self.dataChanged.emit(Change.PACKING)
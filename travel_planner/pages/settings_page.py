@@ -11,6 +11,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import pyqtSignal
 
+from ..changes import Change
 from ..models import AppState
 from ..style import available_themes
 
@@ -18,6 +19,7 @@ from ..style import available_themes
 class SettingsPage(QWidget):
     themeChanged = pyqtSignal(str)
     requestSave = pyqtSignal()
+    SUBSCRIBES = Change.THEME
 
     def __init__(self, state: AppState, parent=None):
         super().__init__(parent)
@@ -68,6 +70,11 @@ class SettingsPage(QWidget):
 
         layout.addStretch(1)
 
+    def refresh(self):
+        idx = self.theme_combo.findText(self.state.theme)
+        if idx != -1:
+            self.theme_combo.setCurrentIndex(idx)
+
     def _emit_theme_change(self):
         chosen = self.theme_combo.currentText()
         self.state.theme = chosen
@@ -1,28 +1,33 @@
 from __future__ import annotations
+from typing import Iterable, Optional
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QLabel,
-    QScrollArea,
+    QLineEdit,
+    QListView,
     QFrame,
-    QSizePolicy,
-    QSpacerItem,
+    QAbstractItemView,
 )
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import QEvent, QObject, Qt, pyqtSignal
 
+from ..changes import Change
+from ..item_models import TripListModel
 from ..models import AppState
-from ..widgets.trip_card import TripCardWidget
+from ..style import current_theme
+from ..widgets.trip_card_delegate import ACTION_KEYS, TripCardDelegate
 
 
 class TripsPage(QWidget):
     editTripRequested = pyqtSignal(str)
     deleteTripRequested = pyqtSignal(str)
     makeActiveTripRequested = pyqtSignal(str)
+    SUBSCRIBES = Change.TRIP_HEADER | Change.ACTIVE_TRIP | Change.BUDGET | Change.THEME
 
     def __init__(self, state: AppState, parent=None):
         super().__init__(parent)
         self.state = state
-        self.card_widgets: list[TripCardWidget] = []
+        self._theme: Optional[str] = None
 
         page_layout = QVBoxLayout(self)
         page_layout.setContentsMargins(24, 24, 24, 24)
@@ -32,37 +37,76 @@ class TripsPage(QWidget):
         header_lbl.setProperty("role", "headerPrimary")
         page_layout.addWidget(header_lbl)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShape(QFrame.Shape.NoFrame)
-
-        self.scroll_content = QWidget()
-        self.scroll_area.setWidget(self.scroll_content)
-
-        self.scroll_layout = QVBoxLayout(self.scroll_content)
-        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
-        self.scroll_layout.setSpacing(12)
-
-        page_layout.addWidget(self.scroll_area)
-
-        page_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
-
-        self.refresh()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search by title or destination")
+        self.search_edit.setClearButtonEnabled(True)
+        page_layout.addWidget(self.search_edit)
+
+        # Карточки рисует делегат, а строки модель отдаёт порциями, так что
+        # виджетов на поездку нет и бюджет считается только для видимых.
+        self.model = TripListModel(state, self)
+        self.delegate = TripCardDelegate(self)
+        self.delegate.editRequested.connect(self.editTripRequested.emit)
+        self.delegate.deleteRequested.connect(self.deleteTripRequested.emit)
+        self.delegate.selectRequested.connect(self.makeActiveTripRequested.emit)
+
+        self.list_view = QListView()
+        self.list_view.setObjectName("TripList")
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.setFrameShape(QFrame.Shape.NoFrame)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.installEventFilter(self)
+        page_layout.addWidget(self.list_view, 1)
+
+        self.empty_lbl = QLabel("No trips match the search")
+        self.empty_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.empty_lbl.setVisible(False)
+        page_layout.addWidget(self.empty_lbl)
+
+        self.search_edit.textChanged.connect(self.on_search_changed)
+
+        self.apply_theme_styles()
+
+        # Первое заполнение делает MainWindow при показе страницы.
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        # Кнопки карточек нарисованы, поэтому клавиши обрабатываются здесь:
+        # стрелки выбирают карточку, Enter - Set Active, F2 - Edit, Delete - Delete.
+        if (
+            obj is self.list_view
+            and event.type() == QEvent.Type.KeyPress
+            and event.modifiers() in (Qt.KeyboardModifier.NoModifier, Qt.KeyboardModifier.KeypadModifier)
+        ):
+            action = ACTION_KEYS.get(event.key())
+            if action is not None:
+                return self.delegate.trigger(action, self.list_view.currentIndex())
+        return super().eventFilter(obj, event)
+
+    def apply_theme_styles(self):
+        theme = current_theme()
+        if theme == self._theme:
+            return
+        self._theme = theme
+        self.delegate.set_theme(theme)
+        self.list_view.viewport().update()
 
     def refresh(self):
-        for cw in self.card_widgets:
-            cw.setParent(None)
-        self.card_widgets.clear()
-
-        active_id = self.state.active_trip_id
+        self.refresh_trips(None)
 
-        for trip in self.state.trips:
-            card = TripCardWidget(trip, is_active=(trip.id == active_id), parent=self.scroll_content)
-            card.editRequested.connect(self.editTripRequested.emit)
-            card.deleteRequested.connect(self.deleteTripRequested.emit)
-            card.selectRequested.connect(self.makeActiveTripRequested.emit)
+    def refresh_trips(self, trip_ids: Optional[Iterable[str]]):
+        # ChangeBus передаёт сюда поездки, изменённые с прошлого обновления.
+        self.apply_theme_styles()
+        self.model.refresh(trip_ids)
+        self.update_empty_state()
 
-            self.scroll_layout.addWidget(card)
-            self.card_widgets.append(card)
+    def on_search_changed(self, text: str):
+        self.model.set_filter(text)
+        self.update_empty_state()
 
-        self.scroll_layout.addStretch(1)
+    def update_empty_state(self):
+        has_filter = bool(self.model.filter_text().strip())
+        self.empty_lbl.setVisible(has_filter and self.model.match_count() == 0)
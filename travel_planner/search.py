@@ -0,0 +1,115 @@
+from __future__ import annotations
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from .models import Trip
+
+# Длиннее этого префиксы не индексируются: такие запросы добираются
+# проверкой по сохранённому тексту.
+MAX_PREFIX = 12
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def search_words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.casefold())
+
+
+class TripSearchIndex:
+    # Префиксный индекс слов названия и направления: запрос не просматривает
+    # поездки, а пересекает готовые множества id.
+
+    def __init__(self):
+        self._prefixes: Dict[str, Set[str]] = {}
+        self._words: Dict[str, List[str]] = {}
+        self._texts: Dict[str, str] = {}
+        self._ids: List[str] = []
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        # Растёт при любом изменении, влияющем на результаты поиска.
+        self.revision = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def ids(self) -> List[str]:
+        return self._ids
+
+    def update(self, trips: Iterable[Trip]) -> None:
+        ids: List[str] = []
+        seen: Set[str] = set()
+        for trip in trips:
+            ids.append(trip.id)
+            seen.add(trip.id)
+            self._index_text(trip)
+
+        for trip_id in [tid for tid in self._texts if tid not in seen]:
+            self._discard(trip_id)
+            self.revision += 1
+
+        if ids != self._ids:
+            self._ids = ids
+            self._order = {tid: i for i, tid in enumerate(ids)}
+            self._next_order = len(ids)
+            self.revision += 1
+
+    def update_ids(self, trip_ids: Iterable[str], get_trip: Callable[[str], Optional[Trip]]) -> None:
+        # Обновляет только перечисленные поездки: пропавшие удаляются, новые
+        # встают в конец (так их добавляют AppState.add_trip и загрузчик).
+        for trip_id in trip_ids:
+            trip = get_trip(trip_id)
+            if trip is None:
+                if self._order.pop(trip_id, None) is not None:
+                    self._ids.remove(trip_id)
+                    self._discard(trip_id)
+                    self.revision += 1
+                continue
+            if trip_id not in self._order:
+                self._order[trip_id] = self._next_order
+                self._next_order += 1
+                self._ids.append(trip_id)
+                self.revision += 1
+            self._index_text(trip)
+
+    def search(self, query: str) -> Optional[List[str]]:
+        tokens = search_words(query)
+        if not tokens:
+            return None
+
+        candidates: Optional[Set[str]] = None
+        for token in sorted(set(tokens), key=len, reverse=True):
+            found = self._prefixes.get(token[:MAX_PREFIX], set())
+            if len(token) > MAX_PREFIX:
+                found = {tid for tid in found if any(w.startswith(token) for w in self._words[tid])}
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return []
+        return sorted(candidates, key=self._order.__getitem__)
+
+    def _index_text(self, trip: Trip) -> None:
+        text = f"{trip.title}\n{trip.destination}"
+        if self._texts.get(trip.id) != text:
+            self._discard(trip.id)
+            self._add(trip.id, text)
+            self.revision += 1
+
+    def _add(self, trip_id: str, text: str) -> None:
+        words = search_words(text)
+        self._texts[trip_id] = text
+        self._words[trip_id] = words
+        for word in words:
+            for n in range(1, min(len(word), MAX_PREFIX) + 1):
+                self._prefixes.setdefault(word[:n], set()).add(trip_id)
+
+    def _discard(self, trip_id: str) -> None:
+        words = self._words.pop(trip_id, None)
+        self._texts.pop(trip_id, None)
+        if not words:
+            return
+        for word in words:
+            for n in range(1, min(len(word), MAX_PREFIX) + 1):
+                bucket = self._prefixes.get(word[:n])
+                if bucket is not None:
+                    bucket.discard(trip_id)
+                    if not bucket:
+                        del self._prefixes[word[:n]]
@@ -0,0 +1,311 @@
+from __future__ import annotations
+from contextlib import closing
+from pathlib import Path
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Union
+
+from .codec import read_json
+from .models import AppState, ActivityItem, BudgetItem, PackingItem, Trip, create_sample_state
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS app_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS trips (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    accommodation TEXT NOT NULL,
+    notes TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS activities (
+    trip_id TEXT NOT NULL REFERENCES trips(id) ON DELETE CASCADE,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    time TEXT NOT NULL,
+    title TEXT NOT NULL,
+    location TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    PRIMARY KEY (trip_id, id)
+);
+CREATE INDEX IF NOT EXISTS activities_trip_position ON activities(trip_id, position);
+CREATE INDEX IF NOT EXISTS activities_trip_day ON activities(trip_id, day);
+CREATE TABLE IF NOT EXISTS budget_items (
+    trip_id TEXT NOT NULL REFERENCES trips(id) ON DELETE CASCADE,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    cost REAL NOT NULL,
+    paid INTEGER NOT NULL,
+    PRIMARY KEY (trip_id, id)
+);
+CREATE INDEX IF NOT EXISTS budget_items_trip_position ON budget_items(trip_id, position);
+CREATE INDEX IF NOT EXISTS budget_items_trip_category ON budget_items(trip_id, category);
+CREATE TABLE IF NOT EXISTS packing_items (
+    trip_id TEXT NOT NULL REFERENCES trips(id) ON DELETE CASCADE,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    item_name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    place TEXT NOT NULL,
+    packed INTEGER NOT NULL,
+    PRIMARY KEY (trip_id, id)
+);
+CREATE INDEX IF NOT EXISTS packing_items_trip_position ON packing_items(trip_id, position);
+"""
+
+# Колонки каждой таблицы в порядке to_dict() соответствующей модели (без trip_id/position).
+ACTIVITY_COLUMNS = ("id", "day", "time", "title", "location", "notes")
+BUDGET_COLUMNS = ("id", "category", "description", "cost", "paid")
+PACKING_COLUMNS = ("id", "item_name", "category", "quantity", "place", "packed")
+TRIP_COLUMNS = ("id", "title", "destination", "start_date", "end_date", "accommodation", "notes")
+
+ITEM_TABLES: Dict[str, tuple] = {
+    "activities": ("activities", ACTIVITY_COLUMNS),
+    "budget_items": ("budget_items", BUDGET_COLUMNS),
+    "packing_items": ("packing_items", PACKING_COLUMNS),
+}
+
+BOOL_COLUMNS = {"paid", "packed"}
+
+
+def is_sqlite_path(p: Union[str, Path]) -> bool:
+    return Path(p).suffix.lower() in SQLITE_SUFFIXES
+
+
+def _item_table(item: Union[ActivityItem, BudgetItem, PackingItem]) -> str:
+    if isinstance(item, ActivityItem):
+        return "activities"
+    if isinstance(item, BudgetItem):
+        return "budget_items"
+    if isinstance(item, PackingItem):
+        return "packing_items"
+    raise TypeError(f"Unsupported item: {type(item).__name__}")
+
+
+def _insert_sql(table: str, columns: Iterable[str]) -> str:
+    cols = ("trip_id", "position") + tuple(columns)
+    return f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+
+
+class SqliteStore:
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+    def load(self) -> AppState:
+        if not self.exists():
+            return create_sample_state()
+        return AppState.from_dict(self.load_data())
+
+    def load_data(self) -> Dict[str, Any]:
+        with closing(self.connect()) as conn:
+            meta = dict(conn.execute("SELECT key, value FROM app_state"))
+            trips: List[Dict[str, Any]] = []
+            by_id: Dict[str, Dict[str, Any]] = {}
+            for row in conn.execute(f"SELECT {', '.join(TRIP_COLUMNS)} FROM trips ORDER BY position"):
+                t = dict(zip(TRIP_COLUMNS, row))
+                for key in ITEM_TABLES:
+                    t[key] = []
+                trips.append(t)
+                by_id[t["id"]] = t
+
+            for key, (table, columns) in ITEM_TABLES.items():
+                sql = f"SELECT trip_id, {', '.join(columns)} FROM {table} ORDER BY trip_id, position"
+                for row in conn.execute(sql):
+                    item = dict(zip(columns, row[1:]))
+                    for col in BOOL_COLUMNS.intersection(item):
+                        item[col] = bool(item[col])
+                    by_id[row[0]][key].append(item)
+
+        return {
+            "trips": trips,
+            "active_trip_id": json.loads(meta["active_trip_id"]) if "active_trip_id" in meta else None,
+            "theme": meta.get("theme", "dark"),
+        }
+
+    def save(self, state: AppState) -> None:
+        self.save_data(state.to_dict())
+
+    def save_data(self, data: Dict[str, Any]) -> None:
+        # Полная перезапись одной транзакцией с пакетными вставками.
+        with closing(self.connect()) as conn, conn:
+            for table, _ in ITEM_TABLES.values():
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM trips")
+            conn.execute("DELETE FROM app_state")
+            conn.executemany(
+                f"INSERT INTO trips (position, {', '.join(TRIP_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(TRIP_COLUMNS) + 1))})",
+                (
+                    (pos,) + tuple(t[c] for c in TRIP_COLUMNS)
+                    for pos, t in enumerate(data.get("trips", []))
+                ),
+            )
+            for key, (table, columns) in ITEM_TABLES.items():
+                conn.executemany(
+                    _insert_sql(table, columns),
+                    (
+                        (t["id"], pos) + tuple(item[c] for c in columns)
+                        for t in data.get("trips", [])
+                        for pos, item in enumerate(t.get(key, []))
+                    ),
+                )
+            self._write_meta(conn, data.get("active_trip_id"), data.get("theme", "dark"))
+
+    def put_meta(self, state: AppState) -> None:
+        with closing(self.connect()) as conn, conn:
+            self._write_meta(conn, state.active_trip_id, state.theme)
+
+    def upsert_trip(self, trip: Trip) -> None:
+        values = (
+            trip.id,
+            trip.title,
+            trip.destination,
+            trip.start_date.isoformat(),
+            trip.end_date.isoformat(),
+            trip.accommodation,
+            trip.notes,
+        )
+        with closing(self.connect()) as conn, conn:
+            self._upsert_trip_row(conn, values)
+
+    def delete_trip(self, trip_id: str) -> None:
+        with closing(self.connect()) as conn, conn:
+            conn.execute("DELETE FROM trips WHERE id = ?", (trip_id,))
+
+    def upsert_item(self, trip_id: str, item: Union[ActivityItem, BudgetItem, PackingItem]) -> None:
+        with closing(self.connect()) as conn, conn:
+            self._upsert_item_row(conn, _item_table(item), trip_id, item.to_dict())
+
+    def delete_item(self, trip_id: str, kind: str, item_id: str) -> None:
+        table, _ = ITEM_TABLES[kind]
+        with closing(self.connect()) as conn, conn:
+            conn.execute(f"DELETE FROM {table} WHERE trip_id = ? AND id = ?", (trip_id, item_id))
+
+    def apply_records(self, records: List[Dict[str, Any]]) -> None:
+        # Записи в формате журнала (journal.change_records) - одной транзакцией,
+        # по строке на запись.
+        from .journal import ITEM_KINDS
+
+        with closing(self.connect()) as conn, conn:
+            for record in records:
+                kind = record["kind"]
+                delete = record["op"] == "del"
+                if kind == "meta":
+                    self._write_meta(conn, record["data"]["active_trip_id"], record["data"]["theme"])
+                elif kind == "trip":
+                    if delete:
+                        conn.execute("DELETE FROM trips WHERE id = ?", (record["id"],))
+                    else:
+                        self._upsert_trip_row(conn, tuple(record["data"][c] for c in TRIP_COLUMNS))
+                elif delete:
+                    table, _ = ITEM_TABLES[ITEM_KINDS[kind]]
+                    conn.execute(f"DELETE FROM {table} WHERE trip_id = ? AND id = ?", (record["trip"], record["id"]))
+                else:
+                    self._upsert_item_row(conn, ITEM_KINDS[kind], record["trip"], record["data"])
+
+    @staticmethod
+    def _upsert_trip_row(conn: sqlite3.Connection, values: tuple) -> None:
+        # Новая поездка встаёт в конец, у существующей позиция не меняется.
+        conn.execute(
+            f"INSERT INTO trips (position, {', '.join(TRIP_COLUMNS)}) "
+            f"VALUES ((SELECT COALESCE(MAX(position), -1) + 1 FROM trips), {', '.join('?' * len(TRIP_COLUMNS))}) "
+            f"ON CONFLICT(id) DO UPDATE SET "
+            + ", ".join(f"{c} = excluded.{c}" for c in TRIP_COLUMNS[1:]),
+            values,
+        )
+
+    @staticmethod
+    def _upsert_item_row(conn: sqlite3.Connection, key: str, trip_id: str, data: Dict[str, Any]) -> None:
+        table, columns = ITEM_TABLES[key]
+        conn.execute(
+            f"INSERT INTO {table} (trip_id, position, {', '.join(columns)}) "
+            f"VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM {table} WHERE trip_id = ?), "
+            f"{', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(trip_id, id) DO UPDATE SET "
+            + ", ".join(f"{c} = excluded.{c}" for c in columns[1:]),
+            (trip_id, trip_id) + tuple(data[c] for c in columns),
+        )
+
+    @staticmethod
+    def _write_meta(conn: sqlite3.Connection, active_trip_id: Any, theme: str) -> None:
+        conn.executemany(
+            "INSERT INTO app_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [("active_trip_id", json.dumps(active_trip_id)), ("theme", theme)],
+        )
+
+
+class SqliteSync:
+    # Автосохранение в SQLite: snapshot() в GUI-потоке берёт из ChangeLog
+    # состояния только затронутые поездки и элементы, write() в фоновом
+    # потоке меняет только их строки. Полная перезапись - по request_compaction()
+    # или после замены всего списка поездок.
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.store = SqliteStore(db_path)
+        self._full = False
+
+    def track(self, state: AppState) -> None:
+        state.track_changes()
+        # Базы ещё нет - первая запись полная.
+        self._full = not self.store.exists()
+
+    def request_compaction(self) -> None:
+        self._full = True
+
+    def snapshot(self, state: AppState) -> Union[List[Dict[str, Any]], tuple]:
+        from .binary_snapshot import state_records
+        from .journal import change_records
+
+        changes = state.take_changes()
+        if self._full or changes.everything:
+            self._full = False
+            # Плоские кортежи; дерево dict для save_data() строит write().
+            return state_records(state)
+        return change_records(state, changes)
+
+    def write(self, snapshot: Union[List[Dict[str, Any]], tuple]) -> None:
+        if isinstance(snapshot, tuple):
+            from .binary_snapshot import state_data
+
+            self.store.save_data(state_data(snapshot))
+        elif snapshot:
+            self.store.apply_records(snapshot)
+
+    def close(self) -> None:
+        pass
+
+
+def import_json(json_path: Union[str, Path], db_path: Union[str, Path]) -> None:
+    raw = read_json(json_path)
+    # Через модели, чтобы в базу попали уже нормализованные значения.
+    SqliteStore(db_path).save(AppState.from_dict(raw))
+
+
+def export_json(db_path: Union[str, Path], json_path: Union[str, Path]) -> None:
+    from .storage import save_state
+
+    save_state(SqliteStore(db_path).load(), json_path)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+from time import perf_counter
+from typing import Callable, List, Optional, Tuple
+
+from PyQt6.QtCore import QCoreApplication, QEvent, QObject
+
+
+class StartupTimer:
+    # Отметки этапов запуска (импорт, загрузка, окно, первая отрисовка),
+    # чтобы отслеживать регрессии холодного старта: python main.py --startup-timings.
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = perf_counter() if started_at is None else started_at
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, label: str) -> None:
+        self.marks.append((label, perf_counter()))
+
+    def durations(self) -> List[Tuple[str, float]]:
+        # (этап, мс) - время от предыдущей отметки.
+        result = []
+        prev = self.started_at
+        for label, at in self.marks:
+            result.append((label, (at - prev) * 1000))
+            prev = at
+        return result
+
+    def report(self) -> str:
+        lines = ["startup timings (ms):"]
+        for label, ms in self.durations():
+            lines.append(f"  {label:<20} {ms:>8.1f}")
+        total = (self.marks[-1][1] - self.started_at) * 1000 if self.marks else 0.0
+        lines.append(f"  {'total':<20} {total:>8.1f}")
+        return "\n".join(lines)
+
+
+class FirstPaintWatcher(QObject):
+    # Фильтр событий приложения: вызывает callback на первом Paint любого
+    # виджета и сразу снимает себя.
+
+    def __init__(self, callback: Callable[[], None], parent=None):
+        super().__init__(parent)
+        self._callback = callback
+        QCoreApplication.instance().installEventFilter(self)
+
+    def eventFilter(self, obj, event) -> bool:
+        if event.type() == QEvent.Type.Paint and self._callback is not None:
+            callback, self._callback = self._callback, None
+            QCoreApplication.instance().removeEventFilter(self)
+            callback()
+        return False
@@ -0,0 +1,110 @@
+from __future__ import annotations
+from pathlib import Path
+from threading import Event, Thread
+from time import monotonic
+from typing import Any, Optional, Union
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .storage import iter_trips, load_state, prefers_streaming
+
+# Как часто поток загрузки отдаёт окну накопленные поездки (потоковый режим).
+BATCH_MS = 50
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class StateLoader(QObject):
+    # Загрузка AppState в фоновом потоке. Крупный JSON читается потоково и
+    # поездки приходят порциями (tripsLoaded с уже известными ключами
+    # верхнего уровня), иначе состояние приходит целиком (stateLoaded;
+    # так же приходит замена после повреждённого файла). Затем finished
+    # или failed. Публичные сигналы испускаются в GUI-потоке; события
+    # отменённой или перезапущенной загрузки отбрасываются.
+    tripsLoaded = pyqtSignal(list, dict)
+    stateLoaded = pyqtSignal(object)
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    # Из рабочего потока: (номер запуска, вид события, данные).
+    _event = pyqtSignal(int, str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._cancel = Event()
+        # Поток-демон: незавершённый разбор не задерживает выход из приложения.
+        self._thread: Optional[Thread] = None
+        self._event.connect(self._deliver)
+
+    def start(self, path: Union[str, Path], lazy: bool = False, stream: Optional[bool] = None) -> None:
+        self.cancel()
+        self._generation += 1
+        self._cancel = Event()
+        if stream is None:
+            stream = prefers_streaming(path)
+        self._thread = Thread(
+            target=self._run,
+            args=(self._generation, Path(path), lazy, stream, self._cancel),
+            name="state-loader",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        self._generation += 1
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, generation: int, path: Path, lazy: bool, stream: bool, cancel: Event) -> None:
+        try:
+            if stream:
+                self._stream(generation, path, lazy, cancel)
+            else:
+                state = load_state(path, lazy=lazy)
+                self._emit(generation, cancel, "state", state)
+            self._emit(generation, cancel, "done", None)
+        except _Cancelled:
+            pass
+        except Exception as e:
+            self._event.emit(generation, "error", str(e) or type(e).__name__)
+
+    def _stream(self, generation: int, path: Path, lazy: bool, cancel: Event) -> None:
+        meta = {}
+        batch = []
+        deadline = monotonic() + BATCH_MS / 1000
+        try:
+            for trip in iter_trips(path, meta, lazy=lazy):
+                batch.append(trip)
+                if monotonic() >= deadline:
+                    self._emit(generation, cancel, "trips", (batch, dict(meta)))
+                    batch = []
+                    deadline = monotonic() + BATCH_MS / 1000
+        except (ValueError, KeyError, TypeError):
+            # Основной файл повреждён: как и load_state(), берём его или
+            # резервное поколение целиком вместо частично прочитанного списка.
+            self._emit(generation, cancel, "state", load_state(path, lazy=lazy))
+            return
+        self._emit(generation, cancel, "trips", (batch, dict(meta)))
+
+    def _emit(self, generation: int, cancel: Event, kind: str, payload: Any) -> None:
+        if cancel.is_set():
+            raise _Cancelled()
+        self._event.emit(generation, kind, payload)
+
+    def _deliver(self, generation: int, kind: str, payload: Any) -> None:
+        if generation != self._generation:
+            return
+        if kind == "trips":
+            self.tripsLoaded.emit(*payload)
+        elif kind == "state":
+            self.stateLoaded.emit(payload)
+        elif kind == "done":
+            self.finished.emit()
+        else:
+            self.failed.emit(payload)
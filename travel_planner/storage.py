@@ -1,25 +1,294 @@
 from __future__ import annotations
 from pathlib import Path
-import json
-from typing import Union
+import os
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
 
-from .models import AppState, create_sample_state
+from . import binary_snapshot
+from .codec import JsonCodec, get_codec, read_json
+from .json_stream import iter_members
+from .models import AppState, Trip, create_sample_state
+from .sqlite_storage import SqliteStore, is_sqlite_path
 
+BACKUP_GENERATIONS = 3
+WRITE_BUFFER_SIZE = 1 << 20
+# Файлы JSON от этого размера фоновая загрузка читает по поездке: между
+# поездками GIL отпускается и GUI-поток не ждёт один длинный разбор.
+STREAM_LOAD_MIN_BYTES = 1 << 20
 
-def get_default_path() -> Path:
-    return Path.cwd() / "travel_data.json"
+# Журнал пишет изменения рядом с тем же JSON-снимком (travel_data.json.journal).
+DEFAULT_FILE_NAMES = {
+    "json": "travel_data.json",
+    "journal": "travel_data.json",
+    "sqlite": "travel_data.db",
+}
 
 
-def load_state(file_path: Union[str, Path, None] = None) -> AppState:
+def get_default_path(backend: str = "json") -> Path:
+    return Path.cwd() / DEFAULT_FILE_NAMES[backend]
+
+
+def backup_path(p: Path, generation: int) -> Path:
+    return p.with_name(f"{p.name}.{generation}")
+
+
+def journal_path_for(snapshot_path: Path) -> Path:
+    return snapshot_path.with_name(f"{snapshot_path.name}.journal")
+
+
+def has_journal(p: Path) -> bool:
+    journal = journal_path_for(p)
+    return journal.exists() and journal.stat().st_size > 0
+
+
+def state_generations(p: Path, backups: int = BACKUP_GENERATIONS) -> List[Path]:
+    return [p] + [backup_path(p, i) for i in range(1, backups + 1)]
+
+
+def load_state(
+    file_path: Union[str, Path, None] = None,
+    backups: int = BACKUP_GENERATIONS,
+    lazy: bool = False,
+    codec: Optional[JsonCodec] = None,
+    stream: bool = False,
+) -> AppState:
     p = Path(file_path) if file_path else get_default_path()
-    if not p.exists():
+    if is_sqlite_path(p):
+        return SqliteStore(p).load()
+    if has_journal(p):
+        # Снимок без записей журнала устарел; двоичный снимок тоже.
+        from .journal import JournalStore
+
+        return JournalStore(p, backups=backups, codec=codec).load(lazy=lazy)
+    if not stream:
+        # Двоичный снимок годится, только если он записан для этой же версии JSON.
+        state = binary_snapshot.read_binary_snapshot(p, lazy=lazy)
+        if state is not None:
+            return state
+    candidates = [c for c in state_generations(p, backups) if c.exists()]
+    if not candidates:
         return create_sample_state()
+
+    # Основной файл может быть обрезан при сбое - пробуем резервные поколения
+    # от самого свежего к самому старому.
+    last_error: Exception | None = None
+    for candidate in candidates:
+        try:
+            if stream:
+                return _stream_state(candidate, lazy)
+            return AppState.from_dict(read_json(candidate, codec), lazy=lazy)
+        except (ValueError, KeyError, TypeError) as e:
+            last_error = e
+    raise last_error
+
+
+def _stream_state(p: Path, lazy: bool = False) -> AppState:
+    meta: Dict[str, Any] = {}
+    trips = list(iter_trips(p, meta, lazy=lazy))
+    return AppState(trips=trips, active_trip_id=meta.get("active_trip_id"), theme=meta.get("theme", "dark"))
+
+
+def iter_trips(
+    file_path: Union[str, Path, None] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    lazy: bool = False,
+) -> Iterator[Trip]:
+    # Поездки по одной, без разбора всего файла в дерево dict: в памяти
+    # одновременно только текст текущей поездки и уже готовые модели.
+    # Остальные ключи верхнего уровня (active_trip_id, theme) попадают в
+    # meta по мере чтения; save_state() пишет их перед списком поездок.
+    p = Path(file_path) if file_path else get_default_path()
+    if is_sqlite_path(p):
+        state = SqliteStore(p).load()
+        if meta is not None:
+            meta.update(active_trip_id=state.active_trip_id, theme=state.theme)
+        yield from state.trips
+        return
     with p.open("r", encoding="utf-8") as f:
-        raw = json.load(f)
-    return AppState.from_dict(raw)
+        for key, value in iter_members(f, "trips"):
+            if key == "trips":
+                yield Trip.from_dict(value, lazy=lazy)
+            elif meta is not None:
+                meta[key] = value
+
+
+def prefers_streaming(file_path: Union[str, Path]) -> bool:
+    p = Path(file_path)
+    if is_sqlite_path(p) or not p.exists() or has_journal(p) or binary_snapshot.has_valid_header(p):
+        return False
+    return p.stat().st_size >= STREAM_LOAD_MIN_BYTES
+
+
+def save_state(
+    state: AppState,
+    file_path: Union[str, Path, None] = None,
+    backups: int = BACKUP_GENERATIONS,
+    pretty: bool = False,
+    codec: Optional[JsonCodec] = None,
+    snapshot: bool = True,
+) -> None:
+    p = Path(file_path) if file_path else get_default_path()
+    if is_sqlite_path(p):
+        SqliteStore(p).save(state)
+        return
+    atomic_write_chunks(p, iter_state_chunks(state, codec, pretty), backups)
+    truncate_journal(p)
+    if snapshot:
+        write_binary_snapshot(p, binary_snapshot.state_records(state))
+
+
+def truncate_journal(p: Path) -> None:
+    # Полный снимок уже содержит все записи журнала; если их оставить, при
+    # следующей загрузке старые записи легли бы поверх новых данных.
+    journal = journal_path_for(p)
+    if journal.exists():
+        with journal.open("wb"):
+            pass
 
 
-def save_state(state: AppState, file_path: Union[str, Path, None] = None) -> None:
+def write_binary_snapshot(p: Path, records: tuple) -> None:
+    # Пишется после JSON и привязывается к его размеру, mtime и inode.
+    data = binary_snapshot.encode(records, binary_snapshot.json_stamp(p))
+    atomic_write_bytes(binary_snapshot.snapshot_path(p), data, backups=0)
+
+
+def iter_state_chunks(
+    state: AppState,
+    codec: Optional[JsonCodec] = None,
+    pretty: bool = False,
+) -> Iterator[bytes]:
+    # Документ кодируется по одной поездке: в памяти одновременно только
+    # dict текущей поездки, а не всё дерево state.to_dict().
+    codec = codec or get_codec()
+    if pretty:
+        yield codec.dumps(state.to_dict(), pretty=True)
+        return
+    # Короткие поля идут первыми, чтобы iter_trips() знал их до первой поездки.
+    yield (
+        b'{"active_trip_id":' + codec.dumps(state.active_trip_id)
+        + b',"theme":' + codec.dumps(state.theme) + b',"trips":['
+    )
+    for i, trip in enumerate(state.trips):
+        if i:
+            yield b","
+        yield codec.dumps(trip.to_dict())
+    yield b"]}"
+
+
+def iter_record_chunks(records: tuple, codec: Optional[JsonCodec] = None) -> Iterator[bytes]:
+    # Тот же документ, что и iter_state_chunks(), но из кортежей
+    # binary_snapshot.state_records(): годится для фонового потока.
+    codec = codec or get_codec()
+    active_trip_id, theme, trips = records
+    yield b'{"active_trip_id":' + codec.dumps(active_trip_id) + b',"theme":' + codec.dumps(theme) + b',"trips":['
+    for i, record in enumerate(trips):
+        if i:
+            yield b","
+        yield codec.dumps(binary_snapshot.trip_dict(record))
+    yield b"]}"
+
+
+class JsonSnapshot(NamedTuple):
+    records: tuple
+    write_binary: bool
+
+
+def state_snapshot(
+    state: AppState,
+    file_path: Union[str, Path, None] = None,
+    snapshot: bool = True,
+) -> Union[Dict[str, Any], JsonSnapshot]:
+    # Согласованный снимок для записи из другого потока: для SQLite - дерево
+    # dict, для JSON - плоские неизменяемые кортежи по поездкам. Кодирование
+    # JSON и двоичного снимка делает write_snapshot() в потоке записи.
+    p = Path(file_path) if file_path else get_default_path()
+    if is_sqlite_path(p):
+        return state.to_dict()
+    return JsonSnapshot(binary_snapshot.state_records(state), snapshot)
+
+
+def write_snapshot(
+    snapshot: Union[Dict[str, Any], JsonSnapshot],
+    file_path: Union[str, Path, None] = None,
+    backups: int = BACKUP_GENERATIONS,
+) -> None:
+    if isinstance(snapshot, dict):
+        write_state_data(snapshot, file_path, backups)
+        return
+    p = Path(file_path) if file_path else get_default_path()
+    atomic_write_chunks(p, iter_record_chunks(snapshot.records), backups)
+    truncate_journal(p)
+    if snapshot.write_binary:
+        write_binary_snapshot(p, snapshot.records)
+
+
+def write_state_data(
+    data: Dict[str, Any],
+    file_path: Union[str, Path, None] = None,
+    backups: int = BACKUP_GENERATIONS,
+    pretty: bool = False,
+    codec: Optional[JsonCodec] = None,
+) -> None:
     p = Path(file_path) if file_path else get_default_path()
-    with p.open("w", encoding="utf-8") as f:
-        json.dump(state.to_dict(), f, ensure_ascii=False, indent=4)
+    if is_sqlite_path(p):
+        SqliteStore(p).save_data(data)
+        return
+    atomic_write_bytes(p, (codec or get_codec()).dumps(data, pretty=pretty), backups)
+    truncate_journal(p)
+
+
+def atomic_write_bytes(p: Path, payload: bytes, backups: int = BACKUP_GENERATIONS) -> None:
+    atomic_write_chunks(p, (payload,), backups)
+
+
+def atomic_write_chunks(p: Path, chunks: Iterable[bytes], backups: int = BACKUP_GENERATIONS) -> None:
+    import tempfile  # только для записи; чтение обходится без него
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{p.name}.", suffix=".tmp", dir=p.parent)
+    try:
+        with os.fdopen(fd, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        if p.exists() and backups > 0:
+            _rotate_backups(p, backups)
+        os.replace(tmp_name, p)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(p.parent)
+
+
+def _rotate_backups(p: Path, backups: int) -> None:
+    for i in range(backups - 1, 0, -1):
+        older = backup_path(p, i)
+        if older.exists():
+            os.replace(older, backup_path(p, i + 1))
+    # Основной файл не переименовывается, а связывается (или копируется) в
+    # .1: до os.replace() нового файла на его место он всё время существует.
+    first = backup_path(p, 1)
+    staged = p.with_name(f".{first.name}.tmp")
+    try:
+        os.unlink(staged)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(p, staged)
+    except OSError:
+        import shutil
+
+        shutil.copy2(p, staged)
+    os.replace(staged, first)
+
+
+def _fsync_dir(directory: Path) -> None:
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -1,82 +1,135 @@
-DARK_STYLE = """
+from __future__ import annotations
+from functools import lru_cache
+from string import Template
+from typing import Dict, List, Optional
+
+from PyQt6.QtGui import QColor, QPalette
+
+DEFAULT_THEME = "dark"
+
+# Цвета темы: из них собираются и таблица стилей, и QPalette, поэтому
+# виджеты без правил QSS (диалоги, меню, подсказки, делегаты) получают
+# те же цвета.
+THEME_COLORS: Dict[str, Dict[str, str]] = {
+    "dark": {
+        "window": "#1e1f22",
+        "text": "#f5f6f8",
+        "text_strong": "#ffffff",
+        "text_muted": "#b5b8bf",
+        "surface": "#2b2d31",
+        "border": "#3a3d42",
+        "hover": "#3a3d42",
+        "ghost_hover": "#4a4e56",
+        "selection": "#4a4e56",
+        "card_active": "#2f3035",
+        "accent": "#FF8A3D",
+        "accent_hover": "#ff9a5a",
+        "accent_text": "#ffffff",
+        "page_title": "#ffffff",
+        "page_subtitle": "#d0d6dd",
+        "text_disabled": "#7d8088",
+        "focus": "#7fb4ff",
+    },
+    "light": {
+        "window": "#f5f5f7",
+        "text": "#1e1f22",
+        "text_strong": "#1e1f22",
+        "text_muted": "#5a5d6a",
+        "surface": "#ffffff",
+        "border": "#d8d9de",
+        "hover": "#e7e8ec",
+        "ghost_hover": "#d8d9de",
+        "selection": "#e7e8ec",
+        "card_active": "#fff8f2",
+        "accent": "#FF8A3D",
+        "accent_hover": "#ff9a5a",
+        "accent_text": "#ffffff",
+        "page_title": "#0b1b33",
+        "page_subtitle": "#334155",
+        "text_disabled": "#9a9ca5",
+        "focus": "#2a5cb6",
+    },
+}
+
+_STYLE_TEMPLATE = Template("""
 QWidget {
-    background-color: #1e1f22;
-    color: #f5f6f8;
+    background-color: $window;
+    color: $text;
     font-family: 'Segoe UI', 'Roboto', sans-serif;
     font-size: 14px;
 }
 
 QFrame#Sidebar {
-    background-color: #2b2d31;
-    border-right: 1px solid #3a3d42;
+    background-color: $surface;
+    border-right: 1px solid $border;
 }
 
 QLabel[role="title"] {
-    color: #ffffff;
+    color: $text_strong;
     font-size: 18px;
     font-weight: 600;
 }
 
 QLabel[role="headerPrimary"] {
-    color: #ffffff;
+    color: $text_strong;
     font-size: 16px;
     font-weight: 600;
 }
 
 QLabel[role="headerSecondary"] {
-    color: #b5b8bf;
+    color: $text_muted;
     font-size: 13px;
 }
 
 QFrame#HeaderBar {
-    background-color: #2b2d31;
-    border-bottom: 1px solid #3a3d42;
+    background-color: $surface;
+    border-bottom: 1px solid $border;
 }
 
 QPushButton {
     border: none;
     background-color: transparent;
-    color: #f5f6f8;
+    color: $text;
 }
 
 QPushButton[role="nav"] {
     text-align: left;
     background-color: transparent;
-    color: #b5b8bf;
+    color: $text_muted;
     padding: 10px 14px;
     border-radius: 8px;
     font-size: 14px;
     font-weight: 500;
 }
 QPushButton[role="nav"]:hover {
-    background-color: #3a3d42;
-    color: #ffffff;
+    background-color: $hover;
+    color: $text_strong;
 }
 QPushButton[role="nav"][active="true"] {
-    background-color: #3a3d42;
-    color: #ffffff;
+    background-color: $hover;
+    color: $text_strong;
 }
 
 QPushButton[role="primary"] {
-    background-color: #FF8A3D;
-    color: #ffffff;
+    background-color: $accent;
+    color: $accent_text;
     padding: 10px 12px;
     border-radius: 8px;
     font-weight: 600;
 }
 QPushButton[role="primary"]:hover {
-    background-color: #ff9a5a;
+    background-color: $accent_hover;
 }
 
 QPushButton[role="ghost"] {
-    background-color: #3a3d42;
-    color: #ffffff;
+    background-color: $hover;
+    color: $text_strong;
     padding: 6px 10px;
     border-radius: 6px;
     font-weight: 500;
 }
 QPushButton[role="ghost"]:hover {
-    background-color: #4a4e56;
+    background-color: $ghost_hover;
 }
 
 QLineEdit,
@@ -86,35 +139,35 @@ QTimeEdit,
 QComboBox,
 QSpinBox,
 QDoubleSpinBox {
-    background-color: #2b2d31;
-    border: 1px solid #3a3d42;
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 6px;
     padding: 6px 8px;
-    color: #f5f6f8;
-    selection-background-color: #FF8A3D;
+    color: $text;
+    selection-background-color: $accent;
 }
 
 QTextEdit {
     min-height: 60px;
 }
 
-QTableWidget {
-    background-color: #2b2d31;
-    border: 1px solid #3a3d42;
+QTableView {
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 12px;
-    gridline-color: #3a3d42;
-    color: #f5f6f8;
-    selection-background-color: #4a4e56;
-    selection-color: #ffffff;
+    gridline-color: $border;
+    color: $text;
+    selection-background-color: $selection;
+    selection-color: $text_strong;
 }
 
 QHeaderView::section {
-    background-color: #2b2d31;
-    color: #b5b8bf;
+    background-color: $surface;
+    color: $text_muted;
     font-weight: 500;
     padding: 6px 8px;
     border: none;
-    border-bottom: 1px solid #3a3d42;
+    border-bottom: 1px solid $border;
 }
 
 QScrollArea {
@@ -123,184 +176,115 @@ QScrollArea {
 }
 
 QFrame#Card {
-    background-color: #2b2d31;
-    border: 1px solid #3a3d42;
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 12px;
 }
 
 QFrame#CardActive {
-    background-color: #2f3035;
-    border: 1px solid #FF8A3D;
+    background-color: $card_active;
+    border: 1px solid $accent;
     border-radius: 12px;
 }
 
 QLabel[role="cardTitle"] {
-    color: #ffffff;
+    color: $text_strong;
     font-size: 16px;
     font-weight: 600;
 }
 
 QLabel[role="cardSubtitle"] {
-    color: #b5b8bf;
+    color: $text_muted;
     font-size: 13px;
 }
-"""
 
-LIGHT_STYLE = """
-QWidget {
-    background-color: #f5f5f7;
-    color: #1e1f22;
-    font-family: 'Segoe UI', 'Roboto', sans-serif;
-    font-size: 14px;
-}
-
-QFrame#Sidebar {
-    background-color: #ffffff;
-    border-right: 1px solid #d8d9de;
+QListView#ItineraryList,
+QListView#TripList {
+    background: transparent;
+    border: none;
 }
 
-QLabel[role="title"] {
-    color: #1e1f22;
+QWidget#ItineraryPage QLabel[role="headerPrimary"] {
+    color: $page_title;
     font-size: 18px;
-    font-weight: 600;
-}
-
-QLabel[role="headerPrimary"] {
-    color: #1e1f22;
-    font-size: 16px;
-    font-weight: 600;
+    font-weight: 700;
 }
 
-QLabel[role="headerSecondary"] {
-    color: #5a5d6a;
+QWidget#ItineraryPage QLabel[role="headerSecondary"] {
+    color: $page_subtitle;
     font-size: 13px;
 }
+""")
 
-QFrame#HeaderBar {
-    background-color: #ffffff;
-    border-bottom: 1px solid #d8d9de;
+# Таблицы стилей собираются один раз при импорте; смена темы только
+# выбирает готовую строку.
+STYLESHEETS: Dict[str, str] = {
+    name: _STYLE_TEMPLATE.substitute(colors) for name, colors in THEME_COLORS.items()
 }
+DARK_STYLE = STYLESHEETS["dark"]
+LIGHT_STYLE = STYLESHEETS["light"]
 
-QPushButton {
-    border: none;
-    background-color: transparent;
-    color: #1e1f22;
-}
 
-QPushButton[role="nav"] {
-    text-align: left;
-    background-color: transparent;
-    color: #5a5d6a;
-    padding: 10px 14px;
-    border-radius: 8px;
-    font-size: 14px;
-    font-weight: 500;
-}
-QPushButton[role="nav"]:hover {
-    background-color: #e7e8ec;
-    color: #1e1f22;
-}
-QPushButton[role="nav"][active="true"] {
-    background-color: #e7e8ec;
-    color: #1e1f22;
-}
+def theme_key(theme: Optional[str]) -> str:
+    # Неизвестные названия, как и раньше, дают тёмную тему.
+    return "light" if (theme or "").lower() == "light" else DEFAULT_THEME
 
-QPushButton[role="primary"] {
-    background-color: #FF8A3D;
-    color: #ffffff;
-    padding: 10px 12px;
-    border-radius: 8px;
-    font-weight: 600;
-}
-QPushButton[role="primary"]:hover {
-    background-color: #ff9a5a;
-}
 
-QPushButton[role="ghost"] {
-    background-color: #e7e8ec;
-    color: #1e1f22;
-    padding: 6px 10px;
-    border-radius: 6px;
-    font-weight: 500;
-}
-QPushButton[role="ghost"]:hover {
-    background-color: #d8d9de;
-}
+def theme_colors(theme: Optional[str]) -> Dict[str, str]:
+    return THEME_COLORS[theme_key(theme)]
 
-QLineEdit,
-QTextEdit,
-QDateEdit,
-QTimeEdit,
-QComboBox,
-QSpinBox,
-QDoubleSpinBox {
-    background-color: #ffffff;
-    border: 1px solid #d8d9de;
-    border-radius: 6px;
-    padding: 6px 8px;
-    color: #1e1f22;
-    selection-background-color: #FF8A3D;
-}
-
-QTextEdit {
-    min-height: 60px;
-}
 
-QTableWidget {
-    background-color: #ffffff;
-    border: 1px solid #d8d9de;
-    border-radius: 12px;
-    gridline-color: #d8d9de;
-    color: #1e1f22;
-    selection-background-color: #e7e8ec;
-    selection-color: #1e1f22;
-}
-
-QHeaderView::section {
-    background-color: #ffffff;
-    color: #5a5d6a;
-    font-weight: 500;
-    padding: 6px 8px;
-    border: none;
-    border-bottom: 1px solid #d8d9de;
-}
+def theme_stylesheet(theme: Optional[str]) -> str:
+    return STYLESHEETS[theme_key(theme)]
 
-QScrollArea {
-    background-color: transparent;
-    border: none;
-}
 
-QFrame#Card {
-    background-color: #ffffff;
-    border: 1px solid #d8d9de;
-    border-radius: 12px;
-}
+@lru_cache(maxsize=None)
+def theme_palette(theme: str) -> QPalette:
+    c = {k: QColor(v) for k, v in THEME_COLORS[theme_key(theme)].items()}
+    palette = QPalette()
+    roles = QPalette.ColorRole
+    for role, color in (
+        (roles.Window, c["window"]),
+        (roles.WindowText, c["text"]),
+        (roles.Base, c["surface"]),
+        (roles.AlternateBase, c["card_active"]),
+        (roles.Text, c["text"]),
+        (roles.PlaceholderText, c["text_muted"]),
+        (roles.Button, c["surface"]),
+        (roles.ButtonText, c["text"]),
+        (roles.BrightText, c["text_strong"]),
+        (roles.Highlight, c["accent"]),
+        (roles.HighlightedText, c["accent_text"]),
+        (roles.ToolTipBase, c["surface"]),
+        (roles.ToolTipText, c["text"]),
+        (roles.Mid, c["border"]),
+        (roles.Midlight, c["hover"]),
+    ):
+        palette.setColor(role, color)
+    return palette
 
-QFrame#CardActive {
-    background-color: #fff8f2;
-    border: 1px solid #FF8A3D;
-    border-radius: 12px;
-}
 
-QLabel[role="cardTitle"] {
-    color: #1e1f22;
-    font-size: 16px;
-    font-weight: 600;
-}
+def current_theme(qapp=None) -> str:
+    if qapp is None:
+        from PyQt6.QtWidgets import QApplication
 
-QLabel[role="cardSubtitle"] {
-    color: #5a5d6a;
-    font-size: 13px;
-}
-"""
+        qapp = QApplication.instance()
+    value = qapp.property("theme") if qapp is not None else None
+    return theme_key(value)
 
 
-def apply_theme(qapp, theme: str) -> None:
-    if theme.lower() == "light":
-        qapp.setStyleSheet(LIGHT_STYLE)
-    else:
-        qapp.setStyleSheet(DARK_STYLE)
+def apply_theme(qapp, theme: str) -> bool:
+    # Замена таблицы стилей приложения заново полирует каждый виджет, даже
+    # если строка та же самая, поэтому повторное применение текущей темы
+    # пропускается. Возвращает True, если тема действительно сменилась.
+    key = theme_key(theme)
+    if qapp.property("theme") == key:
+        return False
+    qapp.setPalette(theme_palette(key))
+    qapp.setStyleSheet(STYLESHEETS[key])
+    qapp.setProperty("theme", key)
+    return True
 
 
-def available_themes() -> list[str]:
-    return ["dark", "light"]
+def available_themes() -> List[str]:
+    return list(THEME_COLORS)
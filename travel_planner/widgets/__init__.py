@@ -1,4 +1,16 @@
-from .sidebar import SidebarWidget
-from .trip_card import TripCardWidget
+from importlib import import_module
 
-__all__ = ["SidebarWidget", "TripCardWidget"]
+# Как и в pages: виджеты импортируются по первому обращению.
+_WIDGET_MODULES = {
+    "SidebarWidget": "sidebar",
+    "TripCardDelegate": "trip_card_delegate",
+}
+
+__all__ = list(_WIDGET_MODULES)
+
+
+def __getattr__(name):
+    module = _WIDGET_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
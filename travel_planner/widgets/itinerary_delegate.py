@@ -0,0 +1,135 @@
+from __future__ import annotations
+from typing import Dict
+
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+from PyQt6.QtCore import Qt, QModelIndex, QRect, QRectF, QSize
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPainterPath, QPen
+
+from ..item_models import EntryRole, ENTRY_DAY
+from ..style import DEFAULT_THEME, theme_colors
+from ..utils import human_date
+
+# Роли делегата -> ключи style.THEME_COLORS.
+COLOR_ROLES: Dict[str, str] = {
+    "day_border": "border",
+    "day_bg": "surface",
+    "activity_border": "border",
+    "activity_bg": "window",
+    "card_title": "text_strong",
+    "activity_time": "focus",
+    "activity_title": "text_strong",
+    "activity_meta": "text_muted",
+}
+
+
+class ItineraryDelegate(QStyledItemDelegate):
+    # Рисует карточки дней и активностей так же, как прежние QFrame
+    # DayCard/ActivityCard, но без единого виджета на строку.
+
+    RADIUS = 6
+    CARD_PADDING = 12
+    DAY_SPACING = 14
+    HEADER_HEIGHT = 42
+    ACTIVITY_HEIGHT = 48
+    ACTIVITY_META_HEIGHT = 58
+    ACTIVITY_SPACING = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.set_theme(DEFAULT_THEME)
+
+    def set_colors(self, colors: Dict[str, str]) -> None:
+        self.colors = {k: QColor(v) for k, v in colors.items()}
+
+    def set_theme(self, theme: str) -> None:
+        colors = theme_colors(theme)
+        self.set_colors({role: colors[key] for role, key in COLOR_ROLES.items()})
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        kind, payload, is_last = index.data(EntryRole)
+        if kind == ENTRY_DAY:
+            height = self.HEADER_HEIGHT
+        else:
+            height = self.ACTIVITY_META_HEIGHT if (payload.location or payload.notes) else self.ACTIVITY_HEIGHT
+            height += self.ACTIVITY_SPACING
+            if is_last:
+                height += self.CARD_PADDING - self.ACTIVITY_SPACING + self.DAY_SPACING
+        return QSize(option.rect.width(), height)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        kind, payload, is_last = index.data(EntryRole)
+        rect = option.rect
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        self._paint_day_segment(painter, rect, kind == ENTRY_DAY, is_last)
+        if kind == ENTRY_DAY:
+            self._paint_day_header(painter, option, rect, payload)
+        else:
+            self._paint_activity(painter, option, rect, payload, is_last)
+
+        painter.restore()
+
+    def _paint_day_segment(self, painter: QPainter, rect: QRect, is_first: bool, is_last: bool) -> None:
+        # Карточка дня тянется через несколько строк: рисуем скруглённый
+        # прямоугольник шире строки и обрезаем его по её границам.
+        r = self.RADIUS
+        top = rect.top() + 0.5 if is_first else rect.top() - 2 * r
+        bottom = rect.bottom() - self.DAY_SPACING + 0.5 if is_last else rect.bottom() + 2 * r
+        card = QRectF(rect.left() + 0.5, top, rect.width() - 1, bottom - top)
+
+        painter.setClipRect(rect)
+        painter.setPen(QPen(self.colors["day_border"], 1))
+        painter.setBrush(self.colors["day_bg"])
+        painter.drawRoundedRect(card, r, r)
+        painter.setClipping(False)
+
+    def _paint_day_header(self, painter: QPainter, option: QStyleOptionViewItem, rect: QRect, day) -> None:
+        font = QFont(option.font)
+        font.setPixelSize(13)
+        font.setWeight(QFont.Weight.DemiBold)
+        painter.setFont(font)
+        painter.setPen(self.colors["card_title"])
+        text_rect = rect.adjusted(self.CARD_PADDING, self.CARD_PADDING, -self.CARD_PADDING, 0)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, human_date(day))
+
+    def _paint_activity(self, painter: QPainter, option: QStyleOptionViewItem, rect: QRect, act, is_last: bool) -> None:
+        bottom_gap = self.CARD_PADDING + self.DAY_SPACING if is_last else self.ACTIVITY_SPACING
+        card = QRectF(rect.adjusted(self.CARD_PADDING, 0, -self.CARD_PADDING, -bottom_gap)).adjusted(0.5, 0.5, -0.5, -0.5)
+
+        painter.setPen(QPen(self.colors["activity_border"], 1))
+        painter.setBrush(self.colors["activity_bg"])
+        path = QPainterPath()
+        path.addRoundedRect(card, self.RADIUS, self.RADIUS)
+        painter.drawPath(path)
+
+        inner = card.toRect().adjusted(10, 8, -10, -8)
+
+        time_font = QFont(option.font)
+        time_font.setWeight(QFont.Weight.DemiBold)
+        painter.setFont(time_font)
+        painter.setPen(self.colors["activity_time"])
+        time_text = str(act.time)
+        time_width = QFontMetrics(time_font).horizontalAdvance(time_text)
+        line_height = QFontMetrics(time_font).height()
+        painter.drawText(QRect(inner.left(), inner.top(), time_width, line_height),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, time_text)
+
+        title_font = QFont(option.font)
+        title_font.setPixelSize(12)
+        painter.setFont(title_font)
+        painter.setPen(self.colors["activity_title"])
+        title_left = inner.left() + time_width + 8
+        title_rect = QRect(title_left, inner.top(), inner.right() - title_left, line_height)
+        title = QFontMetrics(title_font).elidedText(act.title, Qt.TextElideMode.ElideRight, title_rect.width())
+        painter.drawText(title_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+
+        meta_texts = [t for t in (act.location, act.notes) if t]
+        if meta_texts:
+            meta_font = QFont(option.font)
+            meta_font.setPixelSize(11)
+            painter.setFont(meta_font)
+            painter.setPen(self.colors["activity_meta"])
+            meta_rect = QRect(inner.left(), inner.top() + line_height + 6, inner.width(), inner.bottom() - inner.top() - line_height - 6)
+            meta = QFontMetrics(meta_font).elidedText(" · ".join(meta_texts), Qt.TextElideMode.ElideRight, meta_rect.width())
+            painter.drawText(meta_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, meta)
@@ -20,6 +20,7 @@ class SidebarWidget(QFrame):
         self.setMaximumWidth(220)
 
         self.nav_buttons = {}
+        self.active_page = None
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(16, 16, 16, 16)
@@ -54,8 +55,16 @@ class SidebarWidget(QFrame):
         self.nav_buttons[page_key] = btn
 
     def set_active_page(self, page_key: str):
-        for key, btn in self.nav_buttons.items():
-            btn.setProperty("active", "true" if key == page_key else "false")
+        # Перерисовываются только кнопки, у которых сменилось состояние:
+        # повторная полировка дорога при таблице стилей на всё приложение.
+        if page_key == self.active_page:
+            return
+        previous = self.nav_buttons.get(self.active_page)
+        self.active_page = page_key
+        for btn, active in ((previous, False), (self.nav_buttons.get(page_key), True)):
+            if btn is None:
+                continue
+            btn.setProperty("active", "true" if active else "false")
             btn.style().unpolish(btn)
             btn.style().polish(btn)
             btn.update()
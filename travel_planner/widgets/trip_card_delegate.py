@@ -0,0 +1,189 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+from PyQt6.QtCore import Qt, QEvent, QModelIndex, QRect, QRectF, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+
+from ..item_models import EntryRole
+from ..style import DEFAULT_THEME, theme_colors
+from ..utils import date_range_str, money
+
+# Роли делегата -> ключи style.THEME_COLORS.
+COLOR_ROLES: Dict[str, str] = {
+    "card_bg": "surface",
+    "card_border": "border",
+    "active_bg": "card_active",
+    "active_border": "accent",
+    "title": "text_strong",
+    "subtitle": "text_muted",
+    "button_bg": "hover",
+    "button_text": "text_strong",
+    "button_disabled": "text_disabled",
+    "focus": "focus",
+}
+
+ACTION_SELECT = "select"
+ACTION_EDIT = "edit"
+ACTION_DELETE = "delete"
+
+# Клавиши для текущей карточки - замена Tab/Enter по прежним QPushButton.
+ACTION_KEYS: Dict[int, str] = {
+    Qt.Key.Key_Return: ACTION_SELECT,
+    Qt.Key.Key_Enter: ACTION_SELECT,
+    Qt.Key.Key_F2: ACTION_EDIT,
+    Qt.Key.Key_Delete: ACTION_DELETE,
+}
+
+
+class TripCardDelegate(QStyledItemDelegate):
+    # Рисует карточку поездки как прежний TripCardWidget: три строки текста
+    # и кнопки Set Active / Edit / Delete, нажатия ловит editorEvent,
+    # клавиши (ACTION_KEYS) передаёт в trigger() страница.
+    editRequested = pyqtSignal(str)
+    deleteRequested = pyqtSignal(str)
+    selectRequested = pyqtSignal(str)
+
+    RADIUS = 12
+    PADDING = 16
+    LINE_SPACING = 8
+    CARD_SPACING = 12
+    TITLE_HEIGHT = 22
+    TEXT_HEIGHT = 18
+    BUTTON_HEIGHT = 30
+    BUTTON_PADDING = 10
+    BUTTON_SPACING = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.set_theme(DEFAULT_THEME)
+
+    def set_colors(self, colors: Dict[str, str]) -> None:
+        self.colors = {k: QColor(v) for k, v in colors.items()}
+
+    def set_theme(self, theme: str) -> None:
+        colors = theme_colors(theme)
+        self.set_colors({role: colors[key] for role, key in COLOR_ROLES.items()})
+
+    def card_height(self) -> int:
+        return (
+            2 * self.PADDING
+            + self.TITLE_HEIGHT
+            + 2 * self.TEXT_HEIGHT
+            + self.BUTTON_HEIGHT
+            + 3 * self.LINE_SPACING
+        )
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(option.rect.width(), self.card_height() + self.CARD_SPACING)
+
+    def _card_rect(self, rect: QRect) -> QRect:
+        return QRect(rect.left(), rect.top(), rect.width(), self.card_height())
+
+    def button_rects(self, option: QStyleOptionViewItem, is_active: bool) -> List[Tuple[str, str, QRect]]:
+        font = self._button_font(option)
+        metrics = QFontMetrics(font)
+        card = self._card_rect(option.rect)
+        top = card.bottom() + 1 - self.PADDING - self.BUTTON_HEIGHT
+        left = card.left() + self.PADDING
+        result = []
+        for action, text in (
+            (ACTION_SELECT, "Active" if is_active else "Set Active"),
+            (ACTION_EDIT, "Edit"),
+            (ACTION_DELETE, "Delete"),
+        ):
+            width = metrics.horizontalAdvance(text) + 2 * self.BUTTON_PADDING
+            result.append((action, text, QRect(left, top, width, self.BUTTON_HEIGHT)))
+            left += width + self.BUTTON_SPACING
+        return result
+
+    def _button_font(self, option: QStyleOptionViewItem) -> QFont:
+        font = QFont(option.font)
+        font.setPixelSize(14)
+        font.setWeight(QFont.Weight.Medium)
+        return font
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        trip, is_active = index.data(EntryRole)
+        card = QRectF(self._card_rect(option.rect)).adjusted(0.5, 0.5, -0.5, -0.5)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        painter.setPen(QPen(self.colors["active_border" if is_active else "card_border"], 1))
+        painter.setBrush(self.colors["active_bg" if is_active else "card_bg"])
+        painter.drawRoundedRect(card, self.RADIUS, self.RADIUS)
+        if option.state & QStyle.StateFlag.State_HasFocus:
+            # Текущая карточка при работе с клавиатуры.
+            painter.setPen(QPen(self.colors["focus"], 2))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRoundedRect(card.adjusted(2, 2, -2, -2), self.RADIUS - 2, self.RADIUS - 2)
+
+        inner = card.toRect().adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        flags = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+        title_font = QFont(option.font)
+        title_font.setPixelSize(16)
+        title_font.setWeight(QFont.Weight.DemiBold)
+        painter.setFont(title_font)
+        painter.setPen(self.colors["title"])
+        active_marker = " (Active)" if is_active else ""
+        title_rect = QRect(inner.left(), inner.top(), inner.width(), self.TITLE_HEIGHT)
+        title = QFontMetrics(title_font).elidedText(
+            f"{trip.title}{active_marker} — {trip.destination}", Qt.TextElideMode.ElideRight, title_rect.width()
+        )
+        painter.drawText(title_rect, flags, title)
+
+        text_font = QFont(option.font)
+        text_font.setPixelSize(13)
+        painter.setFont(text_font)
+        painter.setPen(self.colors["subtitle"])
+        metrics = QFontMetrics(text_font)
+        subtitle = date_range_str(trip.start_date, trip.end_date) + (
+            f" | Stay: {trip.accommodation}" if trip.accommodation else ""
+        )
+        budget = (
+            f"Budget: {money(trip.total_budget())} | Paid: {money(trip.total_paid())}"
+            f" | Remaining: {money(trip.total_remaining())}"
+        )
+        top = title_rect.bottom() + 1 + self.LINE_SPACING
+        for text in (subtitle, budget):
+            line_rect = QRect(inner.left(), top, inner.width(), self.TEXT_HEIGHT)
+            painter.drawText(line_rect, flags, metrics.elidedText(text, Qt.TextElideMode.ElideRight, line_rect.width()))
+            top += self.TEXT_HEIGHT + self.LINE_SPACING
+
+        painter.setFont(self._button_font(option))
+        for action, text, rect in self.button_rects(option, is_active):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self.colors["button_bg"])
+            painter.drawRoundedRect(QRectF(rect), 6, 6)
+            disabled = action == ACTION_SELECT and is_active
+            painter.setPen(self.colors["button_disabled" if disabled else "button_text"])
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        if event.type() != QEvent.Type.MouseButtonRelease or event.button() != Qt.MouseButton.LeftButton:
+            return False
+        entry = index.data(EntryRole)
+        if entry is None:
+            return False
+        pos = event.position().toPoint()
+        for action, _, rect in self.button_rects(option, entry[1]):
+            if rect.contains(pos):
+                return self.trigger(action, index)
+        return False
+
+    def trigger(self, action: str, index: QModelIndex) -> bool:
+        entry = index.data(EntryRole) if index.isValid() else None
+        if entry is None:
+            return False
+        trip, is_active = entry
+        if action == ACTION_SELECT:
+            if not is_active:
+                self.selectRequested.emit(trip.id)
+        elif action == ACTION_EDIT:
+            self.editRequested.emit(trip.id)
+        else:
+            self.deleteRequested.emit(trip.id)
+        return True